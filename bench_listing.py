@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark for course listing extraction
+Compares the find_all/selector fallback chain that scrape_questions_listing used to run
+with the single-pass classifier of listing_extractor, on saved and generated listing pages
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import List, Tuple
+sys.path.append('.')
+
+from bs4 import Tag
+
+from parsing import make_soup, resolve_backend
+from listing_extractor import extract_question_lines, find_content_area, select_question_elements, site_key
+
+ASSETS_DIR = "attached_assets"
+LISTING_URL = "https://www.gcertificationcourse.com/hubspot-benchmark-course-answers/"
+SITE_URL = "https://www.gcertificationcourse.com"
+
+
+def legacy_question_elements(content_area, listing_url: str) -> List:
+    """The listing extraction of scrape_questions_listing before the single-pass classifier"""
+    listing_host, listing_path = site_key(listing_url)
+    question_elements = []
+    for li in content_area.find_all('li'):
+        a_tag = li.find('a')
+        if not a_tag:
+            continue
+        host, path = site_key(a_tag.get('href', ''))
+        if host == listing_host and path != listing_path:
+            question_elements.append(li)
+
+    if not question_elements:
+        question_elements = extract_question_lines(content_area)
+
+    if question_elements:
+        return question_elements
+
+    for selector in ['div[class*="question"]', 'p:contains("?")', 'h1:contains("?")', 'h2:contains("?")',
+                     'h3:contains("?")', 'h4:contains("?")', 'strong:contains("?")',
+                     'div[class*="qa"]', 'div[class*="faq"]']:
+        if ':contains(' in selector:
+            tag = selector.split(':')[0]
+            question_elements.extend(elem for elem in content_area.find_all(tag) if '?' in elem.get_text())
+        else:
+            question_elements.extend(content_area.select(selector))
+        if question_elements:
+            break
+    return question_elements
+
+
+def wordpress_page(content: str, menu_items: int = 40) -> str:
+    """Wrap listing content in WordPress chrome: a navigation menu, the entry and a sidebar"""
+    menu = ''.join(f'<li class="menu-item"><a href="{SITE_URL}/category-{i}/">Category {i}</a>'
+                   f'<ul class="sub-menu"><li><a href="{SITE_URL}/category-{i}/page/2/">More</a></li></ul></li>'
+                   for i in range(menu_items))
+    sidebar = ''.join(f'<li><a href="{SITE_URL}/recent-post-{i}/">Recent post {i}</a></li>' for i in range(10))
+    return (f'<html><body><header><nav><ul class="menu">{menu}</ul></nav></header>'
+            f'<main><article><div class="entry-content">{content}</div></article></main>'
+            f'<aside><ul>{sidebar}</ul></aside></body></html>')
+
+
+def generated_pages(sizes: List[int]) -> List[Tuple[str, bytes]]:
+    """Listing pages for every strategy: question links, plain text lines and question headings"""
+    pages = []
+    for size in sizes:
+        links = ''.join(f'<li><a href="{SITE_URL}/question-{i}/">Which practice fits benchmark scenario {i}?</a></li>'
+                        for i in range(size))
+        lines = '<br>\n'.join(f'Which practice fits benchmark scenario {i}?' for i in range(size))
+        headings = ''.join(f'<h3>Select the practice that fits benchmark scenario {i}?</h3>'
+                           f'<p>Explanation of scenario {i}.</p>' for i in range(size))
+        pages.append((f'links-{size}', wordpress_page(f'<ul>{links}</ul>').encode('utf-8')))
+        pages.append((f'text-{size}', wordpress_page(f'<p>{lines}</p>').encode('utf-8')))
+        pages.append((f'headings-{size}', wordpress_page(headings).encode('utf-8')))
+    return pages
+
+
+def load_saved_pages(paths: List[str]) -> List[Tuple[str, bytes]]:
+    """Load saved HTML pages, directories are read recursively (fixture .body files included)"""
+    pages = []
+    for path in paths:
+        files = [path] if os.path.isfile(path) else sorted(
+            os.path.join(root, filename) for root, _, filenames in os.walk(path) for filename in filenames
+            if filename.endswith(('.html', '.htm', '.txt', '.body'))
+        )
+        for filepath in files:
+            with open(filepath, 'rb') as f:
+                pages.append((os.path.basename(filepath)[:40], f.read()))
+    return pages
+
+
+def describe(elements: List) -> List[str]:
+    return [str(element) if isinstance(element, Tag) else element['text'] for element in elements]
+
+
+def bench(extract, content_area, iterations: int) -> float:
+    """Average milliseconds per extraction"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extract(content_area, LISTING_URL)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark course listing extraction")
+    parser.add_argument('--pages', nargs='+', default=[ASSETS_DIR],
+                        help='Saved HTML pages or directories, e.g. a --record fixture directory')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500], help='Questions per generated listing')
+    parser.add_argument('--iterations', type=int, default=20, help='Extractions per page')
+    parser.add_argument('--parser', default='auto', help='HTML parser backend')
+    args = parser.parse_args()
+
+    backend = resolve_backend(args.parser)
+    pages = load_saved_pages(args.pages) + generated_pages(args.sizes)
+    print(f"Benchmarking {len(pages)} listing pages with {backend}, {args.iterations} iterations")
+    print(f"{'page':<42}{'strategy':<16}{'found':>7}{'chain ms':>10}{'single ms':>11}  same result")
+    print("-" * 98)
+
+    for name, content in pages:
+        soup = make_soup(content, backend)
+        content_area = find_content_area(soup) or soup
+
+        strategy, elements = select_question_elements(content_area, LISTING_URL)
+        same = describe(elements) == describe(legacy_question_elements(content_area, LISTING_URL))
+        chain_ms = bench(legacy_question_elements, content_area, args.iterations)
+        single_ms = bench(select_question_elements, content_area, args.iterations)
+        print(f"{name:<42}{strategy or '-':<16}{len(elements):>7}{chain_ms:>10.2f}{single_ms:>11.2f}  "
+              f"{'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
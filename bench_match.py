@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark for question matching
+Replays the exam question HTML saved in answerissues.txt and attached_assets/ against the
+schemas in extension/schemas/ and reports lookup latency and hit rate per match strategy
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+from typing import Dict, List
+sys.path.append('.')
+
+from config import EXTENSION_CONFIG, SCHEMA_CONFIG
+from parsing import make_soup, resolve_backend
+from question_matcher import ExtensionMatcher, MatchIndex
+from schema_manifest import is_schema_filename
+
+SAMPLE_FILES = ["answerissues.txt"]
+ASSETS_DIR = "attached_assets"
+STRATEGIES = ('exact', 'partial', 'keyword')
+
+
+def load_schemas(schema_dir: str) -> List[Dict]:
+    """Load every schema file with questions from a directory"""
+    schemas = []
+    for filename in sorted(os.listdir(schema_dir)):
+        # Only JSON schemas, the manifest dotfile is skipped
+        if not is_schema_filename(filename) or not filename.endswith('.json'):
+            continue
+        with open(os.path.join(schema_dir, filename), 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        if schema.get('questions'):
+            schemas.append(schema)
+    return schemas
+
+
+def extract_questions(content: str) -> List[str]:
+    """
+    Extract the question texts from saved exam or answer page HTML
+
+    Exam pages show the question in an <h2> right before the answer list,
+    saved answer pages put it in the entry title.
+    """
+    soup = make_soup(content, resolve_backend('auto'))
+    questions = []
+
+    for heading in soup.find_all('h2'):
+        answer_list = heading.find_next_sibling()
+        if answer_list and answer_list.find(attrs={'data-test-id': 'question-answer-list'}):
+            questions.append(heading.get_text(strip=True))
+
+    for title in soup.select('h1.entry-title'):
+        questions.append(title.get_text(strip=True))
+
+    return [q for q in questions if q]
+
+
+def load_exam_questions(paths: List[str]) -> List[str]:
+    """Load the question texts from every saved HTML file, directories are expanded"""
+    questions = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+        elif os.path.exists(path):
+            files = [path]
+        else:
+            continue
+
+        for filepath in files:
+            with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+                questions.extend(extract_questions(f.read()))
+    return questions
+
+
+def sample_schema_questions(schemas: List[Dict], count: int, seed: int = 0) -> List[str]:
+    """
+    Sample schema questions with a one character typo each
+
+    The saved exam pages only hold a handful of questions, the typo keeps the
+    sample off the exact-match fast path so partial matching is measured too.
+    """
+    rng = random.Random(seed)
+    texts = [q['question'] for schema in schemas for q in schema['questions'] if q.get('question')]
+    sample = []
+    for text in rng.sample(texts, min(count, len(texts))):
+        position = rng.randrange(len(text))
+        sample.append(text[:position] + 'x' + text[position + 1:])
+    return sample
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def bench(lookup, questions: List[str], repeat: int) -> Dict:
+    """Time every lookup and count the strategy that produced each match"""
+    latencies = []
+    hits = dict.fromkeys(STRATEGIES + ('miss',), 0)
+    matches = []
+
+    for _ in range(repeat):
+        for question in questions:
+            start = time.perf_counter()
+            match = lookup(question)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits[match['match_type'] if match else 'miss'] += 1
+            if len(matches) < len(questions):
+                matches.append(match['qa']['question'] if match else None)
+
+    latencies.sort()
+    return {
+        'lookups': len(latencies),
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+        'hits': hits,
+        'matches': matches
+    }
+
+
+class IndexedMatcher:
+    def __init__(self, schemas: List[Dict], threshold: float):
+        """Match index lookup over several schemas, the first schema with a match wins"""
+        self.threshold = threshold
+        self.indexes = [MatchIndex.from_schema(schema) for schema in schemas]
+
+    def lookup(self, question_text: str):
+        for index in self.indexes:
+            match = index.lookup(question_text, self.threshold)
+            if match:
+                return match
+        return None
+
+
+def run_benchmark(schema_dir: str = None, sample_paths: List[str] = None, repeat: int = 5,
+                  schema_sample: int = 100, threshold: float = None, case_sensitive: bool = None) -> Dict:
+    """
+    Run the matching benchmark
+
+    Args:
+        schema_dir: Directory with schema files
+        sample_paths: Saved HTML files or directories to replay
+        repeat: Passes over the replayed questions
+        schema_sample: Number of typo'd schema questions added to the replay
+        threshold: Partial match threshold, defaults to EXTENSION_CONFIG
+        case_sensitive: Case sensitive matching, defaults to EXTENSION_CONFIG
+
+    Returns:
+        Dictionary with the workload and a result per matcher
+    """
+    schema_dir = schema_dir or SCHEMA_CONFIG['output_directory']
+    sample_paths = sample_paths or SAMPLE_FILES + [ASSETS_DIR]
+    if threshold is None:
+        threshold = EXTENSION_CONFIG['partial_matching_threshold']
+    if case_sensitive is None:
+        case_sensitive = EXTENSION_CONFIG['case_sensitive_matching']
+
+    schemas = load_schemas(schema_dir)
+    replayed = load_exam_questions(sample_paths)
+    questions = replayed + sample_schema_questions(schemas, schema_sample)
+
+    matchers = {'scan': ExtensionMatcher(schemas, threshold, case_sensitive).lookup}
+    # The match index is built from lowercased text only
+    if not case_sensitive:
+        matchers['index'] = IndexedMatcher(schemas, threshold).lookup
+
+    results = {name: bench(lookup, questions, repeat) for name, lookup in matchers.items()}
+
+    return {
+        'schemas': len(schemas),
+        'schema_questions': sum(len(s['questions']) for s in schemas),
+        'replayed_questions': len(replayed),
+        'sampled_questions': len(questions) - len(replayed),
+        'threshold': threshold,
+        'case_sensitive': case_sensitive,
+        'results': results
+    }
+
+
+def print_report(report: Dict):
+    """Print latency percentiles and hit rates per matcher"""
+    print(f"{report['schemas']} schemas, {report['schema_questions']} schema questions")
+    print(f"Replaying {report['replayed_questions']} saved exam questions and "
+          f"{report['sampled_questions']} sampled schema questions "
+          f"(threshold {report['threshold']}, case sensitive: {report['case_sensitive']})")
+
+    header = f"{'matcher':<10}{'lookups':>9}{'p50 ms':>10}{'p99 ms':>10}"
+    for strategy in STRATEGIES + ('miss',):
+        header += f"{strategy:>10}"
+    print(header)
+    print("-" * len(header))
+
+    for name, result in report['results'].items():
+        line = f"{name:<10}{result['lookups']:>9}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+        for strategy in STRATEGIES + ('miss',):
+            line += f"{result['hits'][strategy] / result['lookups']:>10.1%}"
+        print(line)
+
+    results = list(report['results'].values())
+    if len(results) > 1:
+        baseline = results[0]['matches']
+        for name, result in list(report['results'].items())[1:]:
+            agree = sum(1 for a, b in zip(baseline, result['matches']) if a == b)
+            print(f"{name} returns the same question as scan for {agree}/{len(baseline)} lookups")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark question matching")
+    parser.add_argument('--schema-dir', help='Directory containing schema files')
+    parser.add_argument('--samples', nargs='+', help='Saved HTML files or directories to replay')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the replayed questions')
+    parser.add_argument('--schema-sample', type=int, default=100, help="Typo'd schema questions to add")
+    parser.add_argument('--threshold', type=float, help='Partial match threshold')
+    parser.add_argument('--case-sensitive', action='store_true', default=None, help='Match case sensitively')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print_report(run_benchmark(args.schema_dir, args.samples, args.repeat, args.schema_sample,
+                               args.threshold, args.case_sensitive))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for question page parsing
+Compares parser backends and the restricted <article> parse over the saved pages in attached_assets/
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tracemalloc
+sys.path.append('.')
+
+from parsing import QUESTION_PAGE_STRAINER, available_backends, make_soup
+from scraper import WebScraper
+
+ASSETS_DIR = "attached_assets"
+
+
+def load_question_pages(assets_dir: str) -> list:
+    """Load the saved WordPress question pages (the ones containing an <article>)"""
+    pages = []
+    for filename in sorted(os.listdir(assets_dir)):
+        with open(os.path.join(assets_dir, filename), 'rb') as f:
+            content = f.read()
+        if b'<article' in content:
+            pages.append((filename, content))
+    return pages
+
+
+def bench(pages: list, parser: str, restricted: bool, iterations: int, scraper: WebScraper) -> dict:
+    """Parse every page `iterations` times and extract the answer, measuring time and peak memory"""
+    parse_only = QUESTION_PAGE_STRAINER if restricted else None
+    answers = []
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for _, content in pages:
+            soup = make_soup(content, parser, parse_only)
+            answers.append(scraper._extract_answer_from_page(soup, {}, '')['structured_content'])
+    elapsed = time.perf_counter() - start
+
+    # Measure peak memory of a single pass separately so timing is not skewed by tracemalloc
+    tracemalloc.start()
+    for _, content in pages:
+        soup = make_soup(content, parser, parse_only)
+        del soup
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'per_page_ms': elapsed / (iterations * len(pages)) * 1000,
+        'peak_kb': peak / 1024,
+        'answers': answers[:len(pages)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark question page parsing")
+    parser.add_argument('--iterations', type=int, default=50, help='Passes over the saved pages')
+    parser.add_argument('--assets-dir', default=ASSETS_DIR, help='Directory with saved HTML pages')
+    args = parser.parse_args()
+
+    # The extraction logs every answer it finds, which would dominate the timings
+    logging.disable(logging.INFO)
+
+    pages = load_question_pages(args.assets_dir)
+    if not pages:
+        print(f"No saved question pages found in {args.assets_dir}")
+        return
+
+    scraper = WebScraper("https://www.gcertificationcourse.com", delay=0)
+    print(f"Benchmarking {len(pages)} saved question pages, {args.iterations} iterations")
+    print(f"{'backend':<14}{'mode':<12}{'ms/page':>10}{'peak KB':>12}  answers match")
+    print("-" * 62)
+
+    baseline = None
+    for backend in available_backends():
+        for restricted in (False, True):
+            result = bench(pages, backend, restricted, args.iterations, scraper)
+            if baseline is None:
+                baseline = result['answers']
+            mode = 'article' if restricted else 'full'
+            match = 'yes' if result['answers'] == baseline else 'NO'
+            print(f"{backend:<14}{mode:<12}{result['per_page_ms']:>10.2f}{result['peak_kb']:>12.0f}  {match}")
+
+
+if __name__ == "__main__":
+    main()
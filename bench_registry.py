@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for resolving exam URLs against the schema registry
+Compares the linear substring scan done by loadSchemas() in content.js with the
+exam-id map and compiled fallback regex of RegistryLookup, for growing registry sizes
+"""
+
+import sys
+import time
+import random
+import argparse
+from typing import Dict, List, Optional
+sys.path.append('.')
+
+from registry_manager import RegistryLookup, extract_exam_id_from_url, generate_url_pattern
+
+EXAM_URL = "https://app.hubspot.com/academy/171726/tracks/{exam_id}/exam"
+
+
+def build_entries(size: int, fallback_share: float = 0.05, seed: int = 0) -> List[Dict]:
+    """Build a synthetic registry, a share of the entries only has a non-ID URL pattern"""
+    rng = random.Random(seed)
+    entries = []
+    for position in range(size):
+        if rng.random() < fallback_share:
+            exam_url = f"https://exams{position}.example.com/certification/exam"
+        else:
+            exam_url = EXAM_URL.format(exam_id=9000000 + position)
+        entries.append({
+            "name": f"Course {position}",
+            "exam_url_pattern": generate_url_pattern(exam_url),
+            "schema_file": f"schemas/course_{position}_schema.json",
+            "exam_id": extract_exam_id_from_url(exam_url),
+            "exam_url": exam_url
+        })
+    return entries
+
+
+def linear_scan(entries: List[Dict], url: str) -> Optional[Dict]:
+    """The registry lookup of loadSchemas(): first entry whose pattern is a substring of the URL"""
+    for entry in entries:
+        if entry["exam_url_pattern"] in url:
+            return entry
+    return None
+
+
+def bench(resolve, urls: List[str], repeat: int) -> float:
+    """Average microseconds per resolved URL"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for url in urls:
+            resolve(url)
+    return (time.perf_counter() - start) / (repeat * len(urls)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exam URL resolution against the schema registry")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000], help='Registry sizes')
+    parser.add_argument('--lookups', type=int, default=500, help='Exam URLs resolved per pass')
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the exam URLs')
+    args = parser.parse_args()
+
+    print(f"{'entries':>8}{'scan us':>12}{'lookup us':>12}{'build ms':>12}  same result")
+    print("-" * 58)
+
+    rng = random.Random(1)
+    for size in args.sizes:
+        entries = build_entries(size)
+        # Mostly registered exams, plus some unknown ones that have to miss
+        urls = [rng.choice(entries)["exam_url"] for _ in range(args.lookups)]
+        urls += [EXAM_URL.format(exam_id=1000 + i) for i in range(args.lookups // 10)]
+
+        start = time.perf_counter()
+        lookup = RegistryLookup(entries)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan_us = bench(lambda url: linear_scan(entries, url), urls, args.repeat)
+        lookup_us = bench(lookup.resolve, urls, args.repeat)
+        same = all(linear_scan(entries, url) is lookup.resolve(url) for url in urls)
+        print(f"{size:>8}{scan_us:>12.2f}{lookup_us:>12.2f}{build_ms:>12.2f}  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+End-to-end scrape benchmark against a local stand-in site
+Serves a WordPress-like course listing and N answer pages (article -> li -> strong) from a local
+HTTP server and runs scrape_course against it, reporting wall time, requests/sec, peak RSS and
+CPU per stage for every course size
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+sys.path.append('.')
+
+EXAM_URL = "https://app.hubspot.com/academy/171726/tracks/{exam_id}/exam"
+LISTING_PATH = "/bench-course-answers/"
+
+FILLER = ("<p>Learn how inbound marketing attracts, engages and delights customers. "
+          "Every practice question links to a page explaining the correct answer.</p>\n")
+
+
+def question_text(position: int) -> str:
+    return f"Which of the following practices best describes benchmark scenario number {position}?"
+
+
+def build_listing_page(base_url: str, size: int) -> bytes:
+    """Course listing page: a WordPress entry-content list linking every question page"""
+    items = ''.join(
+        f'<li><a href="{base_url}/question-{position}/">{question_text(position)}</a></li>\n'
+        for position in range(size)
+    )
+    return (f'<html><body><main><article><div class="entry-content">'
+            f'<h2>HubSpot Benchmark Course Answers</h2><ul>\n{items}</ul>'
+            f'</div></article></main></body></html>').encode('utf-8')
+
+
+def build_answer_page(position: int, page_kb: int) -> bytes:
+    """Answer page shaped like the saved pages in attached_assets/, padded to roughly page_kb"""
+    options = ''.join(
+        f'<li><strong>Correct option {position}</strong></li>' if option == position % 4
+        else f'<li>Distractor option {option}</li>'
+        for option in range(4)
+    )
+    article = (f'<article class="post-{position} post type-post status-publish">'
+               f'<h1 class="entry-title">{question_text(position)}</h1>'
+               f'<div class="entry-content"><p><strong>Question:</strong> {question_text(position)}</p>'
+               f'<ul>{options}</ul></div></article>')
+    filler = FILLER * max(0, (page_kb * 1024 - len(article)) // len(FILLER))
+    return f'<html><head><title>Q{position}</title></head><body>{filler}{article}</body></html>'.encode('utf-8')
+
+
+class StandInSite:
+    def __init__(self, size: int, page_kb: int = 18, latency: float = 0.02, error_rate: float = 0.0,
+                 seed: int = 0):
+        """
+        Local HTTP server imitating a course listing and its answer pages
+
+        Args:
+            size: Number of questions on the listing
+            page_kb: Approximate size of every answer page
+            latency: Seconds every response is delayed by
+            error_rate: Share of requests answered with a retryable 503
+            seed: Seed for the injected errors
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'bytes': 0}
+
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                site.handle(self)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+        self.pages = {LISTING_PATH: build_listing_page(self.base_url, size)}
+        for position in range(size):
+            self.pages[f"/question-{position}/"] = build_answer_page(position, page_kb)
+
+        self.listing_url = self.base_url + LISTING_PATH
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        with self._lock:
+            self.stats['requests'] += 1
+            failed = self._random.random() < self.error_rate
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        body = self.pages.get(request.path)
+        if failed or body is None:
+            with self._lock:
+                self.stats['errors'] += 1
+            request.send_response(503 if failed else 404)
+            request.send_header('Retry-After', '0')
+            request.send_header('Content-Length', '0')
+            request.end_headers()
+            return
+
+        with self._lock:
+            self.stats['bytes'] += len(body)
+        request.send_response(200)
+        request.send_header('Content-Type', 'text/html; charset=UTF-8')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+
+def run_scrape(listing_url: str, size: int, concurrency: int, low_memory: bool = False) -> Dict:
+    """
+    Scrape the stand-in course once, in a fresh process so peak RSS belongs to this run
+
+    Args:
+        listing_url: Listing URL of the stand-in site
+        size: Number of questions on the listing
+        concurrency: Answer pages fetched in parallel
+        low_memory: Scrape in low memory mode
+
+    Returns:
+        Dictionary with wall and CPU time, peak RSS, question counts and stage timings
+    """
+    # The scraper logs every page, answer and injected 503 retry, which would dominate the timings
+    logging.disable(logging.WARNING)
+
+    import main
+    from config import DEFAULT_SCRAPING_CONFIG, SCHEMA_CONFIG
+    from memory_usage import peak_rss_bytes
+    from registry_manager import SchemaRegistry
+    from schema_builder import is_failed_answer
+    from stage_timer import stage, stage_timer
+
+    DEFAULT_SCRAPING_CONFIG.update(delay_between_requests=0, cache_enabled=False, concurrency=concurrency,
+                                   retry_backoff_base=0.01, retry_budget=max(50, size), low_memory=low_memory)
+    SCHEMA_CONFIG['question_store_enabled'] = False
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        registry = SchemaRegistry(os.path.join(output_dir, 'schema_registry.json'))
+
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        schema_file = main.scrape_course(listing_url, f"Bench Course {size}", output_dir=output_dir,
+                                         exam_url=EXAM_URL.format(exam_id=9000000 + size),
+                                         overwrite=True, registry=registry)
+        with stage('registry_flush'):
+            registry.flush()
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+
+        with open(schema_file, 'r', encoding='utf-8') as f:
+            questions = json.load(f)['questions']
+
+    return {
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'peak_rss_mb': peak_rss_bytes() / 1048576,
+        'questions': len(questions),
+        'answered': sum(1 for question in questions if not is_failed_answer(question['answer'])),
+        'stages': stage_timer.get_stats()
+    }
+
+
+def run_benchmark(sizes: List[int], page_kb: int = 18, latency: float = 0.02, error_rate: float = 0.0,
+                  concurrency: int = 8, low_memory: bool = False) -> List[Dict]:
+    """
+    Run the end-to-end scrape for every course size
+
+    Args:
+        sizes: Numbers of questions per course
+        page_kb: Approximate size of every answer page
+        latency: Seconds every response is delayed by
+        error_rate: Share of requests answered with a retryable 503
+        concurrency: Answer pages fetched in parallel
+        low_memory: Scrape in low memory mode
+
+    Returns:
+        One result dictionary per size
+    """
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        with StandInSite(size, page_kb, latency, error_rate) as site:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_scrape, site.listing_url, size, concurrency, low_memory).result()
+            result.update(size=size, **{f'server_{key}': value for key, value in site.stats.items()})
+        result['requests_per_second'] = result['server_requests'] / result['wall_seconds']
+        results.append(result)
+    return results
+
+
+def print_report(results: List[Dict]):
+    """Print the per-size summary and the CPU time of every stage"""
+    print(f"{'questions':>10}{'answered':>10}{'wall s':>9}{'cpu s':>8}{'req/s':>9}{'errors':>8}"
+          f"{'MB served':>11}{'peak RSS MB':>13}")
+    print("-" * 78)
+    for result in results:
+        print(f"{result['size']:>10}{result['answered']:>10}{result['wall_seconds']:>9.2f}"
+              f"{result['cpu_seconds']:>8.2f}{result['requests_per_second']:>9.1f}{result['server_errors']:>8}"
+              f"{result['server_bytes'] / 1048576:>11.1f}{result['peak_rss_mb']:>13.1f}")
+
+    stage_names = sorted({name for result in results for name in result['stages']},
+                         key=lambda name: -results[-1]['stages'].get(name, {}).get('cpu_seconds', 0))
+    print("\nCPU seconds per stage (nested stages overlap)")
+    print(f"{'stage':<20}" + ''.join(f"{result['size']:>10}" for result in results))
+    print("-" * (20 + 10 * len(results)))
+    for name in stage_names:
+        print(f"{name:<20}" + ''.join(
+            f"{result['stages'][name]['cpu_seconds']:>10.3f}" if name in result['stages'] else f"{'-':>10}"
+            for result in results
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end course scrapes against a local stand-in site")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='Questions per course')
+    parser.add_argument('--page-kb', type=int, default=18, help='Approximate size of every answer page')
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds every response is delayed by')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='Share of requests answered with a 503')
+    parser.add_argument('--concurrency', type=int, default=8, help='Answer pages fetched in parallel')
+    parser.add_argument('--low-memory', action='store_true', help='Scrape in low memory mode')
+    parser.add_argument('--output', help='Also write the results as JSON, for comparing runs')
+    args = parser.parse_args()
+
+    print(f"Scraping stand-in courses of {', '.join(map(str, args.sizes))} questions "
+          f"({args.page_kb} KB pages, {args.latency * 1000:.0f} ms latency, {args.error_rate:.0%} errors, "
+          f"concurrency {args.concurrency}{', low memory' if args.low_memory else ''})")
+    results = run_benchmark(args.sizes, args.page_kb, args.latency, args.error_rate, args.concurrency,
+                            args.low_memory)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Incremental JSONL checkpoints for resumable course scrapes
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCheckpoint:
+    def __init__(self, path: str):
+        """
+        Initialize a checkpoint file
+
+        Args:
+            path: Path of the JSONL checkpoint file, one completed Q&A per line
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def record_key(record: Dict) -> Tuple[str, str]:
+        """
+        Get the key identifying a Q&A record
+
+        Text-only questions all point back to the listing page, so the
+        question text is part of the key alongside the source URL.
+        """
+        return (record.get('question_source_url', ''), record.get('question', ''))
+
+    def load(self) -> Dict[Tuple[str, str], Dict]:
+        """
+        Load the completed Q&A records from the checkpoint
+
+        Returns:
+            Dictionary of completed records keyed by record_key()
+        """
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash mid-write leaves a truncated last line, just refetch that one
+                    logger.warning(f"Ignoring corrupt checkpoint line {line_number} in {self.path}")
+                    continue
+                completed[self.record_key(record)] = record
+
+        logger.info(f"Loaded {len(completed)} completed questions from checkpoint {self.path}")
+        return completed
+
+    def append(self, record: Dict):
+        """
+        Append a completed Q&A record and flush it to disk
+
+        Args:
+            record: Complete Q&A dictionary
+        """
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self):
+        """Remove the checkpoint file"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
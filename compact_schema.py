@@ -0,0 +1,150 @@
+"""
+Compact binary schema format
+A small fixed header, the schema metadata as minified JSON, an offset table and one
+minified JSON record per question, so metadata and single questions can be read
+without parsing the whole file
+"""
+
+import os
+import json
+import struct
+import logging
+import tempfile
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+COMPACT_EXTENSION = '.qsc'
+MAGIC = b'QSCH'
+FORMAT_VERSION = 1
+
+# magic, format version, question count, metadata length
+PREAMBLE = struct.Struct('<4sHIQ')
+# record offset from the start of the record area, record length
+OFFSET_ENTRY = struct.Struct('<QI')
+
+
+def is_compact_schema(filepath: str) -> bool:
+    """Check whether a file is a compact schema by its magic bytes"""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_compact_schema(schema: Dict, filepath: str):
+    """
+    Write a schema in the compact format
+
+    The file is written to a temporary file and renamed into place so
+    readers never see a partial schema.
+
+    Args:
+        schema: Schema dictionary
+        filepath: Output path
+    """
+    questions = schema.get('questions', [])
+    metadata = {key: value for key, value in schema.items() if key != 'questions'}
+    metadata_bytes = json.dumps(metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    records = [
+        json.dumps(question, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        for question in questions
+    ]
+
+    directory = os.path.dirname(filepath) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix=COMPACT_EXTENSION + '.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(records), len(metadata_bytes)))
+            f.write(metadata_bytes)
+            offset = 0
+            for record in records:
+                f.write(OFFSET_ENTRY.pack(offset, len(record)))
+                offset += len(record)
+            for record in records:
+                f.write(record)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class CompactSchema:
+    def __init__(self, filepath: str):
+        """
+        Lazy reader for a compact schema file
+
+        Opening reads only the preamble and the metadata, the offset table is
+        read on first question access and questions are read one at a time.
+
+        Args:
+            filepath: Path to the compact schema
+        """
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        self._offsets = None
+
+        try:
+            magic, version, self.question_count, metadata_length = PREAMBLE.unpack(self._file.read(PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"Not a compact schema: {filepath}")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported compact schema version {version}: {filepath}")
+            self.metadata = json.loads(self._file.read(metadata_length).decode('utf-8'))
+        except BaseException:
+            self._file.close()
+            raise
+
+        self._table_start = PREAMBLE.size + metadata_length
+        self._records_start = self._table_start + self.question_count * OFFSET_ENTRY.size
+
+    def __len__(self) -> int:
+        return self.question_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _load_offsets(self):
+        if self._offsets is None:
+            self._file.seek(self._table_start)
+            table = self._file.read(self.question_count * OFFSET_ENTRY.size)
+            self._offsets = list(OFFSET_ENTRY.iter_unpack(table))
+
+    def question(self, position: int) -> Dict:
+        """
+        Read a single question
+
+        Args:
+            position: Position of the question in the schema
+
+        Returns:
+            Question dictionary
+        """
+        if not 0 <= position < self.question_count:
+            raise IndexError(f"Question {position} out of range for {self.question_count} questions")
+
+        self._load_offsets()
+        offset, length = self._offsets[position]
+        self._file.seek(self._records_start + offset)
+        return json.loads(self._file.read(length).decode('utf-8'))
+
+    def __iter__(self) -> Iterator[Dict]:
+        # Records are stored back to back, one sequential read covers them all
+        self._load_offsets()
+        self._file.seek(self._records_start)
+        for _, length in self._offsets:
+            yield json.loads(self._file.read(length).decode('utf-8'))
+
+    def to_dict(self) -> Dict:
+        """Load the whole schema as a regular schema dictionary"""
+        schema = dict(self.metadata)
+        schema['questions'] = list(self)
+        return schema
+
+    def close(self):
+        self._file.close()
@@ -4,9 +4,34 @@ Configuration settings for the web scraper and Chrome extension system
 
 # Default scraping settings
 DEFAULT_SCRAPING_CONFIG = {
-    'delay_between_requests': 1.0,  # seconds
+    'delay_between_requests': 1.0,  # seconds, minimum gap between requests to the same host
+    'burst': 1,  # requests allowed back to back per host before throttling
+    'concurrency': 1,  # answer pages fetched in parallel per course
+    'course_workers': 1,  # courses scraped in parallel by scrape-batch and rescrape-all
+    'cache_enabled': True,  # keep responses on disk and revalidate them with conditional GETs
+    'cache_dir': '.scrape_cache',
+    'cache_ttl': 0,  # seconds a cached page is reused without contacting the server, 0 always revalidates
+    'cache_max_bytes': 200 * 1024 * 1024,  # least recently validated pages are evicted past this size
+    'html_parser': 'html.parser',  # BeautifulSoup backend: html.parser, lxml, html5lib, or auto (lxml if installed)
+    'restricted_parse': True,  # only build the <article> subtree of question pages
+    'incremental_ttl_days': 30,  # stored answers older than this are re-fetched on an accumulative scrape
+    'pool_connections': 10,  # per-host connection pools kept by the HTTP session
+    'pool_maxsize': 10,  # keep-alive connections per host, raised to the worker count if lower
+    'http2': False,  # use HTTP/2 through httpx[http2] when installed
     'request_timeout': 30,  # seconds
-    'max_retries': 3,
+    'max_retries': 3,  # per request, for connection errors, timeouts and 429/5xx responses
+    'retry_backoff_base': 1.0,  # seconds, doubled on every retry with full jitter
+    'retry_backoff_max': 60.0,  # cap for a single backoff or Retry-After wait
+    'retry_budget': 50,  # total retries allowed per course scrape
+    'low_memory': False,  # decompose parse trees right after extraction, drop raw HTML
+    'keep_raw_html': False,  # in low memory mode, keep raw HTML truncated, zlib-compressed and base64-encoded
+    'sitemap_site_url': 'https://www.gcertificationcourse.com',  # site whose sitemaps the discover command reads
+    'url_catalog_enabled': True,  # skip question pages whose sitemap lastmod predates their scrape
+    'url_catalog_path': 'url_catalog.json',
+    'listing_url_pattern': r'-answers/?$',  # sitemap URLs that are course listing pages
+    'fixture_record_dir': None,  # record every response into this fixture directory
+    'fixture_replay_dir': None,  # serve recorded fixtures instead of contacting the site
+    'replay_latency': 0.0,  # seconds waited before every replayed response
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
@@ -53,6 +78,12 @@ SCHEMA_CONFIG = {
     'output_directory': 'extension/schemas',
     'schema_version': '1.0',
     'backup_enabled': True,
+    'storage_format': 'json',  # 'compact' writes .qsc files, the extension can only load JSON
+    'question_store_enabled': False,  # also keep every saved schema in the SQLite question store
+    'question_store_path': 'questions.db',
+    'match_index_enabled': True,  # write index/<schema>.index.json next to every saved schema
+    'dedup_threshold': 0.8,  # shingle similarity at which two questions count as duplicates
+    'dedup_directories': ['extension/schemas', 'schemas'],
     'max_question_length': 1000,
     'max_answer_length': 5000,
     'min_keywords': 3,
@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 
 import sys
+import argparse
 sys.path.append('.')
 
 from scraper import WebScraper
+from http_session import ScraperSession
+from http_fixtures import add_fixture_arguments
+
+# Record the pages once, then replay them offline and without request delays
+parser = argparse.ArgumentParser(description='Debug question link extraction on a course listing page')
+add_fixture_arguments(parser)
+args = parser.parse_args()
 
 # Test URL extraction with more debug
-scraper = WebScraper("https://www.gcertificationcourse.com", delay=0.5)
+scraper = WebScraper("https://www.gcertificationcourse.com", delay=0 if args.replay else 0.5,
+                     session=ScraperSession(record_dir=args.record, replay_dir=args.replay,
+                                             replay_latency=args.replay_latency or 0.0))
 
 # Get page content to debug
 soup = scraper.get_page_content("https://www.gcertificationcourse.com/hubspot-growth-driven-design-answers/")
@@ -0,0 +1,248 @@
+"""
+Near-duplicate question detection across schemas
+Uses MinHash signatures with LSH banding so only questions sharing a band bucket
+are compared, instead of every question against every other one
+"""
+
+import zlib
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from question_matcher import normalize_text
+
+logger = logging.getLogger(__name__)
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """
+    Hashed character shingles of a normalized text
+
+    Args:
+        text: Normalized question text
+        size: Shingle length in characters
+
+    Returns:
+        Set of 32-bit shingle hashes
+    """
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+
+def jaccard(first: Set[int], second: Set[int]) -> float:
+    """Jaccard similarity of two shingle sets"""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        MinHash signatures over shingle sets
+
+        Each shingle is hashed once with SHAKE-128, whose output is read as
+        num_perm independent 32-bit hash values. The element-wise minimum then
+        runs in C instead of num_perm Python-level hash loops per shingle.
+
+        Args:
+            num_perm: Number of hash functions, the signature length
+            seed: Seed mixed into every hash
+        """
+        self.num_perm = num_perm
+        self.seed = seed.to_bytes(4, 'little')
+
+    def signature(self, shingle_set: Set[int]) -> Tuple[int, ...]:
+        """Get the MinHash signature of a shingle set"""
+        hashes = [
+            memoryview(hashlib.shake_128(self.seed + value.to_bytes(4, 'little')).digest(4 * self.num_perm)).cast('I')
+            for value in shingle_set
+        ]
+        return tuple(map(min, zip(*hashes)))
+
+
+class LSHIndex:
+    def __init__(self, bands: int = 32, rows: int = 4):
+        """
+        Locality sensitive hashing over MinHash signatures
+
+        Signatures are cut into bands, two items become candidates when any
+        band is identical. With b bands of r rows the probability of becoming
+        candidates rises steeply around a similarity of (1 / b) ** (1 / r).
+
+        Args:
+            bands: Number of bands
+            rows: Signature values per band, bands * rows must equal the signature length
+        """
+        self.bands = bands
+        self.rows = rows
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+
+    def add(self, key, signature: Tuple[int, ...]):
+        """Add an item's signature to the band buckets"""
+        for band in range(self.bands):
+            start = band * self.rows
+            self.buckets[band][signature[start:start + self.rows]].append(key)
+
+    def candidate_pairs(self) -> Set[Tuple]:
+        """Get every pair of items sharing at least one band bucket"""
+        pairs = set()
+        for buckets in self.buckets:
+            for keys in buckets.values():
+                for i in range(len(keys)):
+                    for j in range(i + 1, len(keys)):
+                        pairs.add((keys[i], keys[j]))
+        return pairs
+
+
+def find_duplicate_clusters(texts: Iterable[str], threshold: float = 0.8, num_perm: int = 128,
+                            bands: int = 32) -> List[List[int]]:
+    """
+    Group near-duplicate texts
+
+    Candidate pairs from LSH are confirmed with the exact Jaccard similarity of
+    their shingle sets and joined into clusters with union-find.
+
+    Args:
+        texts: Question texts
+        threshold: Minimum shingle Jaccard similarity for a duplicate
+        num_perm: MinHash signature length
+        bands: LSH bands, num_perm must be a multiple of it
+
+    Returns:
+        Clusters of text positions with more than one member, members in input order
+    """
+    hasher = MinHasher(num_perm)
+    lsh = LSHIndex(bands, num_perm // bands)
+    shingle_sets = []
+
+    for position, text in enumerate(texts):
+        shingle_set = shingles(normalize_text(text))
+        shingle_sets.append(shingle_set)
+        lsh.add(position, hasher.signature(shingle_set))
+
+    parent = list(range(len(shingle_sets)))
+
+    def find(position: int) -> int:
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    candidates = lsh.candidate_pairs()
+    confirmed = 0
+    for first, second in candidates:
+        if jaccard(shingle_sets[first], shingle_sets[second]) >= threshold:
+            confirmed += 1
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second:
+                parent[max(root_first, root_second)] = min(root_first, root_second)
+
+    logger.info(f"LSH produced {len(candidates)} candidate pairs for {len(shingle_sets)} questions, "
+                f"{confirmed} confirmed as duplicates")
+
+    clusters = defaultdict(list)
+    for position in range(len(shingle_sets)):
+        clusters[find(position)].append(position)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def normalize_answer(answer: Any) -> Tuple[str, ...]:
+    """
+    Comparable form of an answer
+
+    Args:
+        answer: Answer text or list of correct options
+
+    Returns:
+        Tuple of normalized options, a single answer is a one-option tuple and
+        the order of a list of options does not matter
+    """
+    options = answer if isinstance(answer, list) else [answer]
+    return tuple(sorted(normalize_text(str(option)) for option in options if option is not None))
+
+
+def split_clusters_by_answer(clusters: List[List[int]], answer_keys: List[Optional[Tuple]]) -> List[List[int]]:
+    """
+    Split near-duplicate clusters into groups of members with the same answer
+
+    Question texts like "Select the true statement." and "Select the true
+    statement(s)." are near-duplicates with different answers, only members
+    with equal answers may replace each other.
+
+    Args:
+        clusters: Clusters from find_duplicate_clusters
+        answer_keys: normalize_answer() of every text, None for members without
+                     a usable answer, which join the first answered group
+
+    Returns:
+        Groups with more than one member, members in input order
+    """
+    groups = []
+    for members in clusters:
+        by_answer = defaultdict(list)
+        unanswered = []
+        for position in members:
+            key = answer_keys[position]
+            if key is None:
+                unanswered.append(position)
+            else:
+                by_answer[key].append(position)
+
+        if not by_answer:
+            groups.append(members)
+            continue
+
+        split = list(by_answer.values())
+        split[0] = sorted(split[0] + unanswered)
+        groups.extend(group for group in split if len(group) > 1)
+    return groups
+
+
+def redundancy_report(file_questions: List[Tuple[str, int]], clusters: List[List[int]],
+                      kept: Set[int]) -> List[Dict]:
+    """
+    Work out how much every schema file contributes to the deduplicated corpus
+
+    Args:
+        file_questions: (schema file, question count) in corpus order, question
+                        positions run consecutively through the files
+        clusters: Duplicate clusters of corpus positions
+        kept: Corpus positions kept in the deduplicated corpus
+
+    Returns:
+        One entry per file with its unique and duplicate question counts, the
+        files covering its duplicates and whether the file is redundant, i.e.
+        contributes no question to the deduplicated corpus
+    """
+    owner = []
+    for file_position, (_, count) in enumerate(file_questions):
+        owner.extend([file_position] * count)
+
+    cluster_of = {position: members for members in clusters for position in members}
+    report = []
+    start = 0
+    for file_position, (filepath, count) in enumerate(file_questions):
+        positions = range(start, start + count)
+        start += count
+
+        covered_by = set()
+        duplicates = 0
+        for position in positions:
+            others = {owner[p] for p in cluster_of.get(position, ()) if owner[p] != file_position}
+            if others:
+                duplicates += 1
+                covered_by.update(others)
+
+        report.append({
+            'schema_file': filepath,
+            'questions': count,
+            'unique_questions': count - duplicates,
+            'duplicate_questions': duplicates,
+            'kept_questions': sum(1 for position in positions if position in kept),
+            'covered_by': sorted(file_questions[other][0] for other in covered_by),
+            'redundant': count > 0 and not any(position in kept for position in positions)
+        })
+
+    return report
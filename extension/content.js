@@ -159,6 +159,87 @@ Which of the following statements about theme modules is TRUE
         return matrix[str2.length][str1.length];
     }
     
+    // Match index helpers, kept in sync with question_matcher.py
+    function textHash(text) {
+        let hash = 0x811c9dc5;
+        for (let i = 0; i < text.length; i++) {
+            hash ^= text.charCodeAt(i);
+            hash = Math.imul(hash, 0x01000193) >>> 0;
+        }
+        return hash.toString(16).padStart(8, '0');
+    }
+    
+    function charNgrams(text, size) {
+        const padded = ` ${text} `;
+        const grams = new Map();
+        for (let i = 0; i < Math.max(1, padded.length - size + 1); i++) {
+            const gram = padded.substring(i, i + size);
+            grams.set(gram, (grams.get(gram) || 0) + 1);
+        }
+        return grams;
+    }
+    
+    // Largest edit distance at which calculateSimilarity stays at or above the threshold
+    function maxEditDistance(length, threshold) {
+        if (length === 0) return 0;
+        let distance = Math.max(0, Math.floor(length * (1 - threshold)));
+        while (distance < length && (length - distance - 1) / length >= threshold) distance++;
+        while (distance > 0 && (length - distance) / length < threshold) distance--;
+        return distance;
+    }
+    
+    function getMatchIndexUrl(schemaFile) {
+        return schemaFile
+            .replace(/^schemas\//, 'schemas/index/')
+            .replace(/\.json$/, '.index.json');
+    }
+    
+    async function loadMatchIndex(schema, schemaFile) {
+        try {
+            const indexResponse = await fetch(chrome.runtime.getURL(getMatchIndexUrl(schemaFile)));
+            if (!indexResponse.ok) return;
+            
+            const index = await indexResponse.json();
+            if (index.index_version === 2 && index.question_count === schema.questions.length) {
+                schema._matchIndex = index;
+                console.log(`⚡ [Q&A] Loaded match index for ${index.question_count} questions`);
+            }
+        } catch (error) {
+            console.log(`❓ [Q&A] No match index for ${schemaFile}, using full scan`);
+        }
+    }
+    
+    // Registry lookup through the tables written by registry_manager.py
+    function lookupRegistry(registry, url) {
+        const lookup = registry.lookup;
+        if (!lookup) return null;
+        
+        let schemaFile = null;
+        let isMatchingEntry = null;
+        const examMatch = url.match(/\/tracks\/(\d+)\/exam/);
+        if (examMatch && lookup.schema_files_by_exam_id[examMatch[1]]) {
+            schemaFile = lookup.schema_files_by_exam_id[examMatch[1]];
+            isMatchingEntry = schema => schema.exam_id === examMatch[1];
+        } else if (lookup.fallback_pattern) {
+            const patternMatch = url.match(new RegExp(lookup.fallback_pattern));
+            if (patternMatch) {
+                schemaFile = lookup.fallback_schema_files[patternMatch[0]];
+                isMatchingEntry = schema => !schema.exam_id && schema.exam_url_pattern === patternMatch[0];
+            }
+        }
+        if (!schemaFile) return null;
+        
+        // The tables can be stale after a hand edit of the schemas list, only trust them when the entry is still there
+        const entry = registry.schemas.find(schema => isMatchingEntry(schema) && schema.schema_file === schemaFile);
+        if (!entry) {
+            console.log(`⚠️ [Q&A] Registry lookup tables are out of date, checking every entry`);
+            return null;
+        }
+        
+        console.log(`🔍 [Q&A] Registry lookup for URL: ✅ MATCH`);
+        return entry;
+    }
+    
     // Schema management
     function loadSchemas() {
         return new Promise(async (resolve) => {
@@ -184,7 +265,7 @@ Which of the following statements about theme modules is TRUE
                 console.log(`📋 [Q&A] Registry loaded with ${registry.schemas.length} schema(s)`);
                 
                 // Find matching schema based on URL pattern
-                const matchingSchema = registry.schemas.find(schema => {
+                const matchingSchema = lookupRegistry(registry, currentUrl) || registry.schemas.find(schema => {
                     const pattern = schema.exam_url_pattern;
                     // console.log('pattern match:', pattern)
                     const isMatch = currentUrl.includes(pattern);
@@ -202,6 +283,7 @@ Which of the following statements about theme modules is TRUE
                     
                     if (schemaResponse.ok) {
                         const schema = await schemaResponse.json();
+                        await loadMatchIndex(schema, matchingSchema.schema_file);
                         loadedSchemas = [schema];
                         console.log(`✅ [Q&A] Successfully loaded schema:`);
                         console.log(`   📚 Course: ${schema.course_info.name}`);
@@ -230,38 +312,114 @@ Which of the following statements about theme modules is TRUE
         });
     }
     
+    function keywordMatch(qa, normalizedQuestion) {
+        const questionWords = normalizedQuestion.split(' ');
+        const matchingKeywords = qa.matching_keywords.filter(keyword => 
+            questionWords.some(word => word.includes(keyword) || keyword.includes(word))
+        );
+        
+        if (matchingKeywords.length >= Math.min(3, qa.matching_keywords.length * 0.5)) {
+            return { qa, matchType: 'keyword', similarity: matchingKeywords.length / qa.matching_keywords.length };
+        }
+        return null;
+    }
+    
+    // Exact, partial and keyword checks of one schema question, in this order
+    function matchQuestion(qa, normalizedSchemaQuestion, normalizedQuestion) {
+        // Exact match
+        if (normalizedQuestion === normalizedSchemaQuestion) {
+            return { qa, matchType: 'exact', similarity: 1.0 };
+        }
+        
+        // Partial match
+        const similarity = calculateSimilarity(normalizedQuestion, normalizedSchemaQuestion);
+        if (similarity >= CONFIG.partialMatchThreshold) {
+            return { qa, matchType: 'partial', similarity };
+        }
+        
+        // Keyword match
+        if (qa.matching_keywords && qa.matching_keywords.length) {
+            return keywordMatch(qa, normalizedQuestion);
+        }
+        
+        return null;
+    }
+    
+    // Every question that could pass one of the checks, or null when the n-gram
+    // filter cannot rule questions out. Mirrors MatchIndex.candidates() in question_matcher.py:
+    // texts within edit distance k share at least max(length) - size * k padded n-grams.
+    function findIndexCandidates(schema, normalizedQuestion) {
+        const index = schema._matchIndex;
+        const threshold = CONFIG.partialMatchThreshold;
+        if (!normalizedQuestion || threshold <= 0) return null;
+        
+        const size = index.ngram_size;
+        const length = normalizedQuestion.length;
+        let longest = length;
+        while (longest + 1 - length <= maxEditDistance(longest + 1, threshold)) longest++;
+        for (let other = length; other <= longest; other++) {
+            if (other - size * maxEditDistance(other, threshold) <= 0) return null;
+        }
+        
+        // Postings repeat a position once per occurrence, count at most as many as the question has
+        const overlap = new Map();
+        charNgrams(normalizedQuestion, size).forEach((count, gram) => {
+            let previous = null;
+            let run = 0;
+            for (const position of index.ngrams[gram] || []) {
+                run = position === previous ? run + 1 : 0;
+                previous = position;
+                if (run < count) overlap.set(position, (overlap.get(position) || 0) + 1);
+            }
+        });
+        
+        const candidates = new Set(index.exact[textHash(normalizedQuestion)] || []);
+        overlap.forEach((shared, position) => {
+            const other = index.normalized[position].length;
+            const distance = maxEditDistance(Math.max(length, other), threshold);
+            if (Math.abs(length - other) <= distance && shared >= Math.max(length, other) - size * distance) {
+                candidates.add(position);
+            }
+        });
+        
+        Object.keys(index.keywords).forEach(position => {
+            if (keywordMatch(schema.questions[position], normalizedQuestion)) candidates.add(Number(position));
+        });
+        
+        return candidates;
+    }
+    
+    function scanSchema(schema, normalizedQuestion) {
+        for (const qa of schema.questions) {
+            const match = matchQuestion(qa, normalizeText(qa.question), normalizedQuestion);
+            if (match) return match;
+        }
+        return null;
+    }
+    
+    // Same result as scanSchema, only the candidates get the Levenshtein check
+    function findIndexedMatch(schema, normalizedQuestion) {
+        const index = schema._matchIndex;
+        const candidates = findIndexCandidates(schema, normalizedQuestion);
+        if (!candidates) return scanSchema(schema, normalizedQuestion);
+        
+        for (const position of [...candidates].sort((a, b) => a - b)) {
+            const match = matchQuestion(schema.questions[position], index.normalized[position], normalizedQuestion);
+            if (match) return match;
+        }
+        return null;
+    }
+    
     function findMatchingQuestion(questionText) {
         const normalizedQuestion = normalizeText(questionText);
         
         for (const schema of loadedSchemas) {
             if (!schema.questions) continue;
             
-            for (const qa of schema.questions) {
-                const normalizedSchemaQuestion = normalizeText(qa.question);
-                
-                // Exact match
-                if (normalizedQuestion === normalizedSchemaQuestion) {
-                    return { qa, matchType: 'exact', similarity: 1.0 };
-                }
-                
-                // Partial match
-                const similarity = calculateSimilarity(normalizedQuestion, normalizedSchemaQuestion);
-                if (similarity >= CONFIG.partialMatchThreshold) {
-                    return { qa, matchType: 'partial', similarity };
-                }
-                
-                // Keyword match
-                if (qa.matching_keywords) {
-                    const questionWords = normalizedQuestion.split(' ');
-                    const matchingKeywords = qa.matching_keywords.filter(keyword => 
-                        questionWords.some(word => word.includes(keyword) || keyword.includes(word))
-                    );
-                    
-                    if (matchingKeywords.length >= Math.min(3, qa.matching_keywords.length * 0.5)) {
-                        return { qa, matchType: 'keyword', similarity: matchingKeywords.length / qa.matching_keywords.length };
-                    }
-                }
-            }
+            const match = schema._matchIndex
+                ? findIndexedMatch(schema, normalizedQuestion)
+                : scanSchema(schema, normalizedQuestion);
+            if (match) return match;
         }
         
         return null;
@@ -0,0 +1,182 @@
+"""
+Record/replay transport for the scraper's HTTP session
+Recording saves every response that goes through the session into a fixture archive,
+replaying serves them back from disk so scrapes run offline and reproducibly
+"""
+
+import os
+import json
+import argparse
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Bodies are stored decoded, so the headers describing the wire encoding are dropped
+SKIPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive'}
+
+
+class MissingFixtureError(requests.RequestException):
+    """Raised when a replayed request was never recorded, never retried"""
+
+
+class FixtureArchive:
+    def __init__(self, fixture_dir: str):
+        """
+        Directory of recorded responses, one metadata file and one body file per request
+
+        Args:
+            fixture_dir: Directory holding the fixtures
+        """
+        self.fixture_dir = fixture_dir
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    def _paths(self, method: str, url: str):
+        """Get the metadata and body paths for a request"""
+        key = hashlib.sha1(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+        base = os.path.join(self.fixture_dir, key)
+        return base + '.json', base + '.body'
+
+    def _write(self, path: str, data: bytes):
+        fd, temp_path = tempfile.mkstemp(dir=self.fixture_dir, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def save(self, method: str, url: str, response: requests.Response):
+        """
+        Record a response
+
+        Args:
+            method: Request method
+            url: Requested URL
+            response: Response with its body already read
+        """
+        meta_path, body_path = self._paths(method, url)
+        entry = {
+            'method': method.upper(),
+            'url': url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': {key: value for key, value in response.headers.items()
+                        if key.lower() not in SKIPPED_HEADERS},
+            'elapsed': response.elapsed.total_seconds(),
+            'recorded_at': time.time()
+        }
+        # Body first, so a metadata file always has its body
+        self._write(body_path, response.content or b'')
+        self._write(meta_path, json.dumps(entry, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def load(self, method: str, url: str) -> Optional[Dict]:
+        """
+        Look up a recorded response
+
+        Args:
+            method: Request method
+            url: Requested URL
+
+        Returns:
+            Metadata dictionary with the body under 'content', or None if not recorded
+        """
+        meta_path, body_path = self._paths(method, url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['content'] = f.read()
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('url') != url:
+            return None
+        return entry
+
+
+class RecordingAdapter(BaseAdapter):
+    def __init__(self, adapter: BaseAdapter, archive: FixtureArchive):
+        """
+        Transport adapter passing requests through to another adapter and recording the responses
+
+        Args:
+            adapter: Adapter sending the requests, such as the session's pooled adapter
+            archive: Fixture archive the responses are written to
+        """
+        super().__init__()
+        self.adapter = adapter
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = self.adapter.send(request, **kwargs)
+
+        # A 304 only makes sense against the requester's cache, replay needs full bodies
+        if response.status_code != 304:
+            response.content
+            self.archive.save(request.method, request.url, response)
+            logger.debug(f"Recorded fixture: {request.method} {request.url}")
+
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, archive: FixtureArchive, latency: float = 0.0):
+        """
+        Transport adapter serving recorded responses without touching the network
+
+        Args:
+            archive: Fixture archive to serve from
+            latency: Seconds to wait before every response, simulating the network
+        """
+        super().__init__()
+        self.archive = archive
+        self.latency = latency
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        entry = self.archive.load(request.method, request.url)
+        if entry is None:
+            raise MissingFixtureError(f"No recorded fixture for {request.method} {request.url}", request=request)
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.reason = entry.get('reason')
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = entry['content']
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        pass
+
+
+def add_fixture_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the --record, --replay and --replay-latency options to a command line parser
+
+    Args:
+        parser: Parser of the command or script
+    """
+    fixture_group = parser.add_mutually_exclusive_group()
+    fixture_group.add_argument('--record', metavar='DIR', help='Record every HTTP response into a fixture directory')
+    fixture_group.add_argument('--replay', metavar='DIR', help='Serve HTTP responses from a fixture directory, offline')
+    parser.add_argument('--replay-latency', type=float, metavar='SECONDS', help='Simulated latency of replayed responses')
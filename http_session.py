@@ -0,0 +1,205 @@
+"""
+HTTP session used by the web scraper, with tuned connection pools and keep-alive statistics
+"""
+
+import logging
+import threading
+import importlib.util
+from typing import Dict
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from http_fixtures import FixtureArchive, RecordingAdapter, ReplayAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class ConnectionStats:
+    def __init__(self):
+        """Thread-safe counters for connections, requests and downloaded bytes"""
+        self._lock = threading.Lock()
+        self._counts = {
+            'connections_opened': 0,
+            'requests_sent': 0,
+            'http2_requests': 0,
+            'bytes_downloaded': 0
+        }
+
+    def increment(self, key: str, amount: int = 1):
+        """Increase a counter"""
+        with self._lock:
+            self._counts[key] += amount
+
+    def get_stats(self) -> Dict:
+        """
+        Get a snapshot of the counters
+
+        Connection reuse is only known for the HTTP/1.1 adapter, requests sent
+        over HTTP/2 are counted separately under 'http2_requests'.
+
+        Returns:
+            Dictionary with connections opened and reused, requests sent and bytes downloaded
+        """
+        with self._lock:
+            stats = dict(self._counts)
+        stats['connections_reused'] = max(0, stats['requests_sent'] - stats['connections_opened'])
+        return stats
+
+
+def _counting_pool_class(base, stats: ConnectionStats):
+    """Build a urllib3 connection pool class that counts newly opened connections"""
+    class CountingConnectionPool(base):
+        def _new_conn(self):
+            stats.increment('connections_opened')
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        """
+        HTTPAdapter that records every new connection and request
+
+        Args:
+            stats: Shared counters
+            **kwargs: HTTPAdapter arguments such as pool_connections and pool_maxsize
+        """
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self.stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self.stats)
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.increment('requests_sent')
+        return super().send(request, **kwargs)
+
+
+class HttpxAdapter(BaseAdapter):
+    def __init__(self, stats: ConnectionStats, pool_maxsize: int = 10):
+        """
+        Transport adapter sending requests through an HTTP/2 capable httpx client
+
+        Args:
+            stats: Shared counters, connections are not visible through httpx
+                   so requests are counted under 'http2_requests'
+            pool_maxsize: Maximum number of connections kept by the client
+        """
+        import httpx
+
+        super().__init__()
+        self.stats = stats
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        )
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        import httpx
+
+        self.stats.increment('http2_requests')
+        try:
+            upstream = self.client.request(
+                request.method,
+                request.url,
+                headers=dict(request.headers),
+                content=request.body,
+                timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+
+        # Build a requests response around the already decoded body
+        response = requests.Response()
+        response.status_code = upstream.status_code
+        response.reason = upstream.reason_phrase
+        response.headers = CaseInsensitiveDict(upstream.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(upstream.url)
+        response.request = request
+        response.connection = self
+        response._content = upstream.content
+        return response
+
+    def close(self):
+        self.client.close()
+
+
+class ScraperSession(requests.Session):
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, http2: bool = False,
+                 user_agent: str = DEFAULT_USER_AGENT, record_dir: str = None, replay_dir: str = None,
+                 replay_latency: float = 0.0):
+        """
+        Initialize a requests session with tuned pools and connection statistics
+
+        Args:
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept alive per host, should be at
+                          least the number of concurrent workers
+            http2: Send HTTPS requests over HTTP/2 through httpx when installed
+            user_agent: User-Agent header sent with every request
+            record_dir: Record every response into this fixture directory
+            replay_dir: Serve responses from this fixture directory instead of the network
+            replay_latency: Seconds to wait before every replayed response
+        """
+        super().__init__()
+        self.connection_stats = ConnectionStats()
+        self.headers.update({'User-Agent': user_agent})
+
+        adapter = CountingHTTPAdapter(
+            self.connection_stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+        if http2:
+            if importlib.util.find_spec('httpx') and importlib.util.find_spec('h2'):
+                self.mount('https://', HttpxAdapter(self.connection_stats, pool_maxsize))
+                logger.info("Using HTTP/2 transport (httpx)")
+            else:
+                logger.warning("HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1")
+
+        if replay_dir:
+            replay = ReplayAdapter(FixtureArchive(replay_dir), latency=replay_latency)
+            self.mount('http://', replay)
+            self.mount('https://', replay)
+            logger.info(f"Replaying responses from {replay_dir}")
+        elif record_dir:
+            archive = FixtureArchive(record_dir)
+            for prefix in ('http://', 'https://'):
+                self.mount(prefix, RecordingAdapter(self.adapters[prefix], archive))
+            logger.info(f"Recording responses to {record_dir}")
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+
+        # Count bytes on the wire when urllib3 exposes them, the decoded body otherwise
+        if not kwargs.get('stream'):
+            tell = getattr(response.raw, 'tell', None)
+            self.connection_stats.increment('bytes_downloaded', tell() if tell else len(response.content))
+
+        return response
+
+    def get_stats(self) -> Dict:
+        """
+        Get connection statistics for this session
+
+        Returns:
+            Dictionary with connections opened and reused, requests sent and bytes downloaded
+        """
+        return self.connection_stats.get_stats()
@@ -0,0 +1,154 @@
+"""
+Single-pass question extraction for course listing pages
+Classifies every candidate node of the content area in one tree walk, then picks the
+first strategy, in priority order, whose bucket is not empty
+"""
+
+import logging
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+from bs4 import Tag
+
+logger = logging.getLogger(__name__)
+
+# Strategies in priority order, after the question links and the plain text lines.
+# Tags whose text must contain a question mark, matched in this order
+QUESTION_MARK_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'strong')
+# Class substrings marking question containers, as in div[class*="..."]
+QUESTION_DIV_CLASSES = ('question',)
+TRAILING_DIV_CLASSES = ('qa', 'faq')
+
+STRATEGIES = (
+    ['question_links', 'text_lines']
+    + [f'div.{name}' for name in QUESTION_DIV_CLASSES]
+    + [f'{tag}?' for tag in QUESTION_MARK_TAGS]
+    + [f'div.{name}' for name in TRAILING_DIV_CLASSES]
+)
+
+# Human readable selector of every node strategy, for logging
+STRATEGY_SELECTORS = {
+    **{f'div.{name}': f'div[class*="{name}"]' for name in QUESTION_DIV_CLASSES + TRAILING_DIV_CLASSES},
+    **{f'{tag}?': f'{tag}:contains("?")' for tag in QUESTION_MARK_TAGS}
+}
+
+QUESTION_LINE_PREFIXES = ('What', 'Which', 'How', 'Why', 'True or false', 'Fill in the blank',
+                          'Imagine', 'When', 'Where', 'Who')
+
+
+def site_key(url: str) -> Tuple[str, str]:
+    """
+    Host and path of a URL, ignoring the scheme, a leading www. and a trailing slash
+
+    Listing URLs are given by hand or come from sitemaps, with or without www.
+    and over http or https, while the question links always use the site's own form.
+    """
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[len('www.'):]
+    return host, parsed.path.rstrip('/')
+
+
+def find_content_area(soup):
+    """Find the main content area of a listing page, None if the page has none"""
+    return (soup.find('div', class_='entry-content') or
+            soup.find('main') or
+            soup.find('article') or
+            soup.find('div', {'id': 'content'}))
+
+
+def classify_listing_nodes(content_area, listing_url: str) -> Dict[str, List]:
+    """
+    Sort the candidate nodes of a content area into per-strategy buckets in one walk
+
+    A <li> is a question link when its first <a> points to another page on
+    the listing's host. The first <a> of every <li> is found during the same
+    walk, by handing each <a> to the enclosing <li> elements that have none yet.
+    Question mark checks need the text of the node, so they are left to
+    select_question_elements and only run for the strategy that is reached.
+
+    Args:
+        content_area: Content area of the listing page
+        listing_url: URL of the listing page
+
+    Returns:
+        Dictionary of node lists in document order, keyed by strategy name
+    """
+    buckets = {name: [] for name in STRATEGIES if name != 'text_lines'}
+    list_items = []
+    first_links = {}
+
+    for node in content_area.descendants:
+        if not isinstance(node, Tag):
+            continue
+
+        name = node.name
+        if name == 'li':
+            list_items.append(node)
+        elif name == 'a':
+            for parent in node.parents:
+                if parent is content_area:
+                    break
+                if parent.name == 'li' and id(parent) not in first_links:
+                    first_links[id(parent)] = node
+        elif name == 'div':
+            classes = node.get('class')
+            if classes:
+                class_value = ' '.join(classes) if isinstance(classes, list) else classes
+                for class_name in QUESTION_DIV_CLASSES + TRAILING_DIV_CLASSES:
+                    if class_name in class_value:
+                        buckets[f'div.{class_name}'].append(node)
+
+        if name in QUESTION_MARK_TAGS:
+            buckets[f'{name}?'].append(node)
+
+    listing_host, listing_path = site_key(listing_url)
+    for li in list_items:
+        link = first_links.get(id(li))
+        if link is None:
+            continue
+        host, path = site_key(link.get('href', ''))
+        # Links to other pages on the listing's own site, not back to the listing
+        if host == listing_host and path != listing_path:
+            buckets['question_links'].append(li)
+
+    return buckets
+
+
+def extract_question_lines(content_area) -> List[Dict]:
+    """Fallback for listings without links: text lines that look like questions"""
+    questions = []
+    for line in content_area.get_text().split('\n'):
+        line = line.strip()
+        if line and '?' in line and 20 < len(line) < 500 and line.startswith(QUESTION_LINE_PREFIXES):
+            questions.append({'text': line, 'is_text_question': True})
+    return questions
+
+
+def select_question_elements(content_area, listing_url: str) -> Tuple[str, List]:
+    """
+    Pick the question elements of a listing page
+
+    Args:
+        content_area: Content area of the listing page, or the whole soup
+        listing_url: URL of the listing page
+
+    Returns:
+        Tuple of (strategy name, elements), elements are tags, or text question
+        dictionaries for the 'text_lines' strategy. The strategy is None if nothing matched.
+    """
+    buckets = classify_listing_nodes(content_area, listing_url)
+
+    for strategy in STRATEGIES:
+        if strategy == 'text_lines':
+            elements = extract_question_lines(content_area)
+        elif strategy.endswith('?'):
+            elements = [node for node in buckets[strategy] if '?' in node.get_text()]
+        else:
+            elements = buckets[strategy]
+
+        if elements:
+            return strategy, elements
+
+    return None, []
@@ -9,12 +9,25 @@ import sys
 import json
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 from typing import List, Dict
 
 from scraper import WebScraper
-from schema_builder import SchemaBuilder
-from registry_manager import add_schema_to_registry
+from request_scheduler import RequestScheduler
+from response_cache import ResponseCache
+from checkpoint import ScrapeCheckpoint
+from retry_policy import RetryPolicy
+from http_session import ScraperSession
+from http_fixtures import add_fixture_arguments
+from schema_builder import SchemaBuilder, is_failed_answer
+from schema_manifest import SchemaManifest, is_schema_filename
+from question_store import QuestionStore, schema_key
+from stage_timer import stage_timer
+from thread_profiler import ThreadProfiler
+from pipeline import CourseStream
+from registry_manager import SchemaRegistry, add_schema_to_registry
+from sitemap_discovery import SitemapDiscovery, UrlCatalog, course_name_from_listing_url
 from config import (
     DEFAULT_SCRAPING_CONFIG,
     SCHEMA_CONFIG,
@@ -54,7 +67,108 @@ def validate_url(url: str) -> bool:
     except:
         return False
 
-def scrape_course(url: str, course_name: str = None, output_dir: str = None, exam_url: str = None) -> str:
+def create_request_scheduler() -> RequestScheduler:
+    """
+    Create the per-host request scheduler from the scraping configuration
+    
+    Returns:
+        RequestScheduler instance
+    """
+    return RequestScheduler(
+        delay=DEFAULT_SCRAPING_CONFIG['delay_between_requests'],
+        burst=DEFAULT_SCRAPING_CONFIG['burst']
+    )
+
+def create_response_cache() -> ResponseCache:
+    """
+    Create the on-disk response cache from the scraping configuration
+    
+    Returns:
+        ResponseCache instance, or None if caching is disabled
+    """
+    if not DEFAULT_SCRAPING_CONFIG['cache_enabled']:
+        return None
+    
+    return ResponseCache(
+        cache_dir=DEFAULT_SCRAPING_CONFIG['cache_dir'],
+        ttl=DEFAULT_SCRAPING_CONFIG['cache_ttl'],
+        max_bytes=DEFAULT_SCRAPING_CONFIG['cache_max_bytes']
+    )
+
+def create_question_store() -> QuestionStore:
+    """
+    Open the SQLite question store scraped schemas are saved to
+    
+    Returns:
+        QuestionStore instance, or None if the store is disabled
+    """
+    if not SCHEMA_CONFIG['question_store_enabled']:
+        return None
+    
+    return QuestionStore(SCHEMA_CONFIG['question_store_path'])
+
+def create_url_catalog() -> UrlCatalog:
+    """
+    Open the sitemap URL catalog from the scraping configuration
+    
+    Returns:
+        UrlCatalog instance, or None if the catalog is disabled
+    """
+    if not DEFAULT_SCRAPING_CONFIG['url_catalog_enabled']:
+        return None
+    
+    return UrlCatalog(DEFAULT_SCRAPING_CONFIG['url_catalog_path'], DEFAULT_SCRAPING_CONFIG['listing_url_pattern'])
+
+def create_scraper(url: str, concurrency: int = None, scheduler: RequestScheduler = None,
+                   cache: ResponseCache = None, use_cache: bool = True) -> WebScraper:
+    """
+    Create a web scraper from the scraping configuration
+    
+    Args:
+        url: Base URL for the scraper
+        concurrency: Number of answer pages fetched in parallel
+        scheduler: Optional request scheduler shared with other scrapers
+        cache: Optional response cache shared with other scrapers
+        use_cache: Reuse and revalidate responses from the on-disk cache
+        
+    Returns:
+        WebScraper instance
+    """
+    concurrency = concurrency or DEFAULT_SCRAPING_CONFIG['concurrency']
+    
+    return WebScraper(
+        base_url=url,
+        delay=DEFAULT_SCRAPING_CONFIG['delay_between_requests'],
+        concurrency=concurrency,
+        scheduler=scheduler or create_request_scheduler(),
+        cache=cache or (create_response_cache() if use_cache else None),
+        parser=DEFAULT_SCRAPING_CONFIG['html_parser'],
+        restricted_parse=DEFAULT_SCRAPING_CONFIG['restricted_parse'],
+        low_memory=DEFAULT_SCRAPING_CONFIG['low_memory'],
+        keep_raw_html=DEFAULT_SCRAPING_CONFIG['keep_raw_html'],
+        timeout=DEFAULT_SCRAPING_CONFIG['request_timeout'],
+        retry_policy=RetryPolicy(
+            max_retries=DEFAULT_SCRAPING_CONFIG['max_retries'],
+            backoff_base=DEFAULT_SCRAPING_CONFIG['retry_backoff_base'],
+            backoff_max=DEFAULT_SCRAPING_CONFIG['retry_backoff_max'],
+            budget=DEFAULT_SCRAPING_CONFIG['retry_budget']
+        ),
+        session=ScraperSession(
+            pool_connections=DEFAULT_SCRAPING_CONFIG['pool_connections'],
+            pool_maxsize=max(DEFAULT_SCRAPING_CONFIG['pool_maxsize'], concurrency),
+            http2=DEFAULT_SCRAPING_CONFIG['http2'],
+            user_agent=DEFAULT_SCRAPING_CONFIG['user_agent'],
+            record_dir=DEFAULT_SCRAPING_CONFIG['fixture_record_dir'],
+            replay_dir=DEFAULT_SCRAPING_CONFIG['fixture_replay_dir'],
+            replay_latency=DEFAULT_SCRAPING_CONFIG['replay_latency']
+        )
+    )
+
+def scrape_course(url: str, course_name: str = None, output_dir: str = None, exam_url: str = None,
+                  concurrency: int = None, use_cache: bool = True, resume: bool = False,
+                  scheduler: RequestScheduler = None, cache: ResponseCache = None,
+                  overwrite: bool = False, stream: str = None, store: QuestionStore = None,
+                  registry: SchemaRegistry = None, catalog: UrlCatalog = None) -> str:
     """
     Scrape a single course and generate schema
     
@@ -62,6 +176,21 @@ def scrape_course(url: str, course_name: str = None, output_dir: str = None, exa
         url: Course listing URL
         course_name: Optional course name
         output_dir: Optional output directory
+        exam_url: Optional HubSpot exam URL for the registry
+        concurrency: Number of answer pages fetched in parallel
+        use_cache: Reuse and revalidate responses from the on-disk cache
+        resume: Skip questions completed by a previous interrupted run
+        scheduler: Optional request scheduler shared by parallel course scrapes
+        cache: Optional response cache shared by parallel course scrapes
+        overwrite: Rebuild the schema from scratch instead of only fetching
+                   new or stale questions and merging them into the existing one
+        stream: Write questions to disk as they are scraped, in 'json' or
+                'jsonl' format. Streaming always rebuilds the schema.
+        store: Optional question store shared by parallel course scrapes
+        registry: Optional schema registry to stage the registry update in,
+                  the caller writes it; updated right away if not given
+        catalog: Optional sitemap URL catalog shared by parallel course scrapes,
+                 questions whose page lastmod predates their scrape are not fetched
         
     Returns:
         Path to generated schema file
@@ -73,48 +202,107 @@ def scrape_course(url: str, course_name: str = None, output_dir: str = None, exa
         raise ValueError(f"Invalid URL provided: {url}")
     
     # Initialize scraper and schema builder
-    scraper = WebScraper(
-        base_url=url,
-        delay=DEFAULT_SCRAPING_CONFIG['delay_between_requests']
-    )
+    scraper = create_scraper(url, concurrency, scheduler, cache, use_cache)
     
     schema_builder = SchemaBuilder(
-        output_dir=output_dir or SCHEMA_CONFIG['output_directory']
+        output_dir=output_dir or SCHEMA_CONFIG['output_directory'],
+        write_match_index=SCHEMA_CONFIG['match_index_enabled'],
+        storage_format=SCHEMA_CONFIG['storage_format'],
+        store=store or create_question_store()
     )
     
+    # Completed questions are checkpointed next to the schema output so an
+    # interrupted scrape can be resumed instead of starting over
+    checkpoint = ScrapeCheckpoint(
+        schema_builder.get_checkpoint_path(course_name or url)
+    )
+    if not resume:
+        checkpoint.clear()
+    
+    # Accumulative update: only questions that are new or stale past the TTL
+    # are fetched, everything else is kept from the existing schema
+    existing_schema = None
+    skip_keys = set()
+    if not overwrite and not stream:
+        existing_path = schema_builder.get_schema_path(course_name or urlparse(url).netloc)
+        if os.path.exists(existing_path):
+            existing_schema = schema_builder.load_schema(existing_path)
+            ttl_days = DEFAULT_SCRAPING_CONFIG['incremental_ttl_days']
+            skip_keys = schema_builder.get_fresh_question_keys(existing_schema, ttl_days)
+            logger.info(f"Incremental scrape: {len(skip_keys)} questions in {existing_path} are up to date")
+            
+            # Older answers can still be kept when a sitemap read since their scrape, and
+            # within the TTL, shows their page did not change
+            catalog = catalog or create_url_catalog()
+            if catalog:
+                unchanged_urls = catalog.unchanged_question_urls(existing_schema, ttl_days)
+                unchanged = {schema_builder.question_key(question) for question in existing_schema['questions']
+                             if question.get('source_url') in unchanged_urls} - skip_keys
+                if unchanged:
+                    logger.info(f"Sitemap lastmod: {len(unchanged)} more questions unchanged since their scrape")
+                    skip_keys |= unchanged
+    
     try:
-        # Scrape the course
-        course_data = scraper.scrape_full_course(url, course_name)
-        
-        if not course_data.get('questions'):
-            logger.warning("No questions found in the scraped data")
-            return None
-        
-        # Build schema
-        schema = schema_builder.build_schema(course_data)
+        if stream:
+            # Questions are written one at a time as they are scraped
+            course_stream = CourseStream(scraper, schema_builder, url, course_name, stream, checkpoint)
+            for question in course_stream:
+                if is_failed_answer(question['answer']):
+                    logger.warning(f"Question {question['id']} has no answer: {question['source_url']}")
+            
+            if not course_stream.total_questions:
+                return None
+            
+            schema_file = course_stream.filepath
+            question_count = course_stream.count
+            course_name = course_stream.course_name
+        else:
+            # Scrape the course
+            course_data = scraper.scrape_full_course(
+                url, course_name, checkpoint=checkpoint,
+                skip_question=lambda question_data: schema_builder.listing_question_key(question_data) in skip_keys
+            )
+            
+            if not course_data.get('total_questions'):
+                logger.warning("No questions found in the scraped data")
+                return None
+            
+            # Build schema
+            schema = schema_builder.build_schema(course_data)
+            if existing_schema:
+                schema = schema_builder.merge_incremental(existing_schema, schema)
+            
+            # Save schema
+            schema_file = schema_builder.save_schema(schema, exam_url=exam_url)
+            question_count = len(schema['questions'])
+            course_name = course_data['course_name']
         
-        # Save schema
-        schema_file = schema_builder.save_schema(schema)
+        checkpoint.clear()
         
-        # Update registry for Chrome extension if exam URL provided
-        if exam_url and schema_file:
+        # Update registry for Chrome extension if exam URL provided,
+        # the extension can only load regular JSON schemas
+        if exam_url and schema_file and schema_file.endswith('.json'):
             try:
                 # Get relative path from extension directory
                 schema_filename = os.path.basename(schema_file)
                 relative_schema_path = f"schemas/{schema_filename}"
                 
-                add_schema_to_registry(
-                    course_name=course_data.get('course_name', 'Unknown Course'),
-                    exam_url=exam_url,
-                    schema_filename=relative_schema_path
-                )
+                if registry is not None:
+                    registry.upsert(course_name, exam_url, relative_schema_path, listing_url=url)
+                else:
+                    add_schema_to_registry(
+                        course_name=course_name,
+                        exam_url=exam_url,
+                        schema_filename=relative_schema_path,
+                        listing_url=url
+                    )
                 logger.info(f"Updated registry for exam: {exam_url}")
             except Exception as e:
                 logger.warning(f"Failed to update registry: {e}")
         
         logger.info(SUCCESS_MESSAGES['scraping_complete'].format(
-            count=len(course_data['questions']),
-            course=course_data['course_name']
+            count=question_count,
+            course=course_name
         ))
         
         return schema_file
@@ -123,43 +311,113 @@ def scrape_course(url: str, course_name: str = None, output_dir: str = None, exa
         logger.error(f"Error scraping course: {e}")
         raise
 
-def scrape_multiple_courses(urls: List[str], output_dir: str = None) -> List[str]:
+def run_course_jobs(jobs: List[Dict], workers: int = None, overwrite: bool = False,
+                    registry: SchemaRegistry = None, resume: bool = False) -> Dict:
+    """
+    Scrape several courses with a course-level worker pool
+    
+    All courses share one request scheduler and response cache, so the
+    per-host politeness budget holds no matter how many run at once.
+    
+    Args:
+        jobs: List of scrape_course keyword argument dictionaries
+        workers: Number of courses scraped at the same time
+        overwrite: Rebuild every schema from scratch
+        registry: Optional schema registry collecting the registry updates
+        resume: Skip questions completed by a previous interrupted run of each course
+        
+    Returns:
+        Report dictionary with 'succeeded' (label, schema file), 'empty' (labels)
+        and 'failed' (label, error) lists
+    """
+    workers = max(1, workers or DEFAULT_SCRAPING_CONFIG['course_workers'])
+    scheduler = create_request_scheduler()
+    cache = create_response_cache()
+    store = create_question_store()
+    catalog = create_url_catalog()
+    report = {'succeeded': [], 'empty': [], 'failed': []}
+    
+    def run(job: Dict) -> str:
+        return scrape_course(scheduler=scheduler, cache=cache, store=store, registry=registry,
+                             overwrite=overwrite, catalog=catalog, resume=resume, **job)
+    
+    print(f"Scraping {len(jobs)} courses with {workers} worker(s)")
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run, job): job for job in jobs}
+        
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            label = job.get('course_name') or job['url']
+            try:
+                schema_file = future.result()
+                if schema_file:
+                    report['succeeded'].append((label, schema_file))
+                    status = f"✅ {label}"
+                else:
+                    report['empty'].append(label)
+                    status = f"⚠️  {label}: no questions found"
+            except Exception as e:
+                logger.error(f"Failed to process {label}: {e}")
+                report['failed'].append((label, str(e)))
+                status = f"❌ {label}: {e}"
+            
+            print(f"[{done}/{len(jobs)}] {status} "
+                  f"({len(report['succeeded'])} ok, {len(report['empty'])} empty, {len(report['failed'])} failed)")
+    
+    scheduler.log_stats()
+    return report
+
+def print_course_report(report: Dict):
+    """
+    Print the final summary of a multi-course scrape
+    
+    Args:
+        report: Report dictionary returned by run_course_jobs
+    """
+    total = len(report['succeeded']) + len(report['empty']) + len(report['failed'])
+    print(f"\nCourse report: {len(report['succeeded'])} of {total} courses updated")
+    
+    if report['empty']:
+        print(f"No questions found ({len(report['empty'])}):")
+        for label in report['empty']:
+            print(f"  - {label}")
+    
+    if report['failed']:
+        print(f"Failed ({len(report['failed'])}):")
+        for label, error in report['failed']:
+            print(f"  - {label}: {error}")
+
+def scrape_multiple_courses(urls: List[str], output_dir: str = None, workers: int = None,
+                            resume: bool = False) -> List[str]:
     """
     Scrape multiple courses and generate individual schemas
     
     Args:
         urls: List of course URLs
         output_dir: Optional output directory
+        workers: Number of courses scraped at the same time
+        resume: Skip questions completed by a previous interrupted run
         
     Returns:
         List of generated schema file paths
     """
-    schema_files = []
+    jobs = [{'url': url, 'output_dir': output_dir} for url in urls]
+    report = run_course_jobs(jobs, workers, resume=resume)
+    print_course_report(report)
     
-    for i, url in enumerate(urls, 1):
-        try:
-            logger.info(f"Processing course {i}/{len(urls)}: {url}")
-            schema_file = scrape_course(url, output_dir=output_dir)
-            
-            if schema_file:
-                schema_files.append(schema_file)
-                logger.info(f"Successfully processed: {url}")
-            else:
-                logger.warning(f"No data extracted from: {url}")
-                
-        except Exception as e:
-            logger.error(f"Failed to process {url}: {e}")
-            continue
-    
-    return schema_files
+    # Keep the input order regardless of which course finished first
+    schema_by_url = dict(report['succeeded'])
+    return [schema_by_url[url] for url in urls if url in schema_by_url]
 
-def merge_schemas(schema_files: List[str], output_filename: str = None) -> str:
+def merge_schemas(schema_files: List[str], output_filename: str = None, dedup_threshold: float = None) -> str:
     """
     Merge multiple schema files into a single schema
     
     Args:
         schema_files: List of schema file paths
         output_filename: Optional output filename
+        dedup_threshold: Optional similarity threshold for dropping near-duplicate questions
         
     Returns:
         Path to merged schema file
@@ -169,11 +427,75 @@ def merge_schemas(schema_files: List[str], output_filename: str = None) -> str:
     if not output_filename:
         output_filename = "merged_schema.json"
     
-    merged_file = schema_builder.merge_schemas(schema_files, output_filename)
+    merged_file = schema_builder.merge_schemas(schema_files, output_filename, dedup_threshold)
     logger.info(f"Merged {len(schema_files)} schemas into {merged_file}")
     
     return merged_file
 
+def find_schema_files(schema_dirs: List[str]) -> List[str]:
+    """
+    Find every schema file in a list of directories
+    
+    Args:
+        schema_dirs: Directories to search
+        
+    Returns:
+        Sorted schema file paths per directory, in directory order
+    """
+    schema_files = []
+    for schema_dir in schema_dirs:
+        if not os.path.isdir(schema_dir):
+            logger.warning(f"Schema directory does not exist: {schema_dir}")
+            continue
+        schema_files.extend(
+            os.path.join(schema_dir, filename)
+            for filename in sorted(os.listdir(schema_dir))
+            if is_schema_filename(filename)
+        )
+    return schema_files
+
+def deduplicate_schemas(schema_dirs: List[str] = None, output_filename: str = None,
+                        threshold: float = None) -> Dict:
+    """
+    Merge every schema into one deduplicated corpus
+    
+    Args:
+        schema_dirs: Directories containing schema files
+        output_filename: Output filename for the deduplicated corpus
+        threshold: Similarity threshold for near-duplicate questions
+        
+    Returns:
+        Deduplication report of the merged corpus, with its path under 'output_file'
+    """
+    schema_files = find_schema_files(schema_dirs or SCHEMA_CONFIG['dedup_directories'])
+    merged_file = merge_schemas(
+        schema_files,
+        output_filename or "deduplicated_schema.json",
+        threshold if threshold is not None else SCHEMA_CONFIG['dedup_threshold']
+    )
+    
+    with open(merged_file, 'r', encoding='utf-8') as f:
+        report = json.load(f)['deduplication']
+    report['output_file'] = merged_file
+    return report
+
+def print_dedup_report(report: Dict):
+    """Print how many duplicates were removed and which schema files are redundant"""
+    print(f"\n{report['questions_before']} questions, {report['duplicates_removed']} near-duplicates removed "
+          f"in {report['duplicate_clusters']} clusters (threshold {report['threshold']})")
+    if report.get('conflicting_clusters'):
+        print(f"{report['conflicting_clusters']} clusters have differing answers, every distinct answer is kept")
+    print("-" * 80)
+    for entry in report['files']:
+        status = "REDUNDANT" if entry['redundant'] else f"keeps {entry['kept_questions']}"
+        print(f"{entry['schema_file']:<65} {entry['duplicate_questions']:>4}/{entry['questions']:<4} dup  {status}")
+    
+    if report['redundant_files']:
+        print(f"\n{len(report['redundant_files'])} redundant files, every question is kept from another file:")
+        for filepath in report['redundant_files']:
+            print(f"  {filepath}")
+    print(f"\nDeduplicated corpus saved to: {report['output_file']}")
+
 def list_schemas(schema_dir: str = None) -> List[Dict]:
     """
     List all available schema files with metadata
@@ -191,90 +513,248 @@ def list_schemas(schema_dir: str = None) -> List[Dict]:
         logger.warning(f"Schema directory does not exist: {schema_dir}")
         return []
     
-    schemas = []
+    # Only files changed since they were last recorded in the manifest are parsed
+    schema_builder = SchemaBuilder(output_dir=schema_dir)
+    return SchemaManifest(schema_dir).refresh(schema_builder.load_schema_metadata)
+
+def import_schemas_to_store(schema_paths: List[str], db_path: str = None) -> int:
+    """
+    Import existing schema files into the question store
     
-    for filename in os.listdir(schema_dir):
-        if filename.endswith('.json'):
-            filepath = os.path.join(schema_dir, filename)
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    schema = json.load(f)
-                
-                metadata = {
-                    'filename': filename,
-                    'filepath': filepath,
-                    'course_name': schema.get('course_info', {}).get('name', 'Unknown'),
-                    'question_count': len(schema.get('questions', [])),
-                    'created_date': schema.get('created_date', 'Unknown'),
-                    'file_size': os.path.getsize(filepath)
-                }
-                
-                schemas.append(metadata)
-                
-            except Exception as e:
-                logger.error(f"Error reading schema file {filepath}: {e}")
+    Courses are keyed by schema file path, exam IDs and URLs come from the
+    registry entry pointing at the file.
+    
+    Args:
+        schema_paths: Schema files or directories of schema files
+        db_path: Optional database path instead of the configured one
+        
+    Returns:
+        Number of imported schemas
+    """
+    store = QuestionStore(db_path or SCHEMA_CONFIG['question_store_path'])
+    schema_builder = SchemaBuilder()
+    registry = SchemaRegistry()
+    # Registry paths are relative to the extension directory holding the registry
+    registry_dir = os.path.dirname(registry.path)
+    registry_entries = {
+        schema_key(os.path.join(registry_dir, entry['schema_file'])): entry
+        for entry in registry.entries if entry.get('schema_file')
+    }
+    
+    schema_files = []
+    for path in schema_paths:
+        schema_files.extend(find_schema_files([path]) if os.path.isdir(path) else [path])
+    
+    imported = 0
+    for filepath in schema_files:
+        try:
+            schema = schema_builder.load_schema(filepath)
+            if 'questions' not in schema:
                 continue
+            entry = registry_entries.get(schema_key(filepath), {})
+            store.upsert_schema(schema, filepath, exam_url=entry.get('exam_url'), exam_id=entry.get('exam_id'))
+            imported += 1
+        except Exception as e:
+            logger.error(f"Error importing schema file {filepath}: {e}")
+            continue
     
-    return schemas
+    return imported
 
-def rescrape_all_from_registry() -> List[str]:
+def export_schema_from_store(course_name: str, output_dir: str = None, db_path: str = None) -> str:
+    """
+    Export a stored course as a schema file for the extension
+    
+    Args:
+        course_name: Schema file path of the stored course, or its file name or course name if
+            only one schema file has it
+        output_dir: Optional output directory
+        db_path: Optional database path instead of the configured one
+        
+    Returns:
+        Path to the exported schema file, or None if the course is not stored
+        
+    Raises:
+        ValueError: If several stored schema files share the file name or course name
+    """
+    store = QuestionStore(db_path or SCHEMA_CONFIG['question_store_path'])
+    course = store.get_course(course_name)
+    if course is None:
+        return None
+    
+    schema_builder = SchemaBuilder(
+        output_dir=output_dir or SCHEMA_CONFIG['output_directory'],
+        write_match_index=SCHEMA_CONFIG['match_index_enabled']
+    )
+    # Keep the stored file name, several schema files may share a course name
+    return schema_builder.save_schema(store.load_schema(course['schema_file']),
+                                      os.path.basename(course['schema_file']))
+
+def build_match_indexes(schema_dir: str = None) -> List[str]:
+    """
+    Build the match index sidecar for every schema in a directory
+    
+    Args:
+        schema_dir: Directory containing schema files
+        
+    Returns:
+        List of written index file paths
+    """
+    schema_dir = schema_dir or SCHEMA_CONFIG['output_directory']
+    schema_builder = SchemaBuilder(output_dir=schema_dir)
+    index_files = []
+    
+    for filename in sorted(os.listdir(schema_dir)):
+        # Only JSON schemas, the manifest dotfile is skipped
+        if not is_schema_filename(filename) or not filename.endswith('.json'):
+            continue
+        
+        filepath = os.path.join(schema_dir, filename)
+        try:
+            schema = schema_builder.load_schema(filepath)
+            if 'questions' not in schema:
+                continue
+            index_files.append(schema_builder.save_match_index(schema, filepath))
+        except Exception as e:
+            logger.error(f"Error indexing schema file {filepath}: {e}")
+            continue
+    
+    return index_files
+
+def rescrape_all_from_registry(workers: int = None, overwrite: bool = False, resume: bool = False) -> List[str]:
     """
     Rescrape all sites from the schema registry
     
+    Args:
+        workers: Number of courses scraped at the same time
+        overwrite: Rebuild every schema from scratch instead of merging new questions
+        resume: Skip questions completed by a previous interrupted run
+    
     Returns:
         List of updated schema file paths
     """
-    from registry_manager import load_registry
-    
     # Load the registry
-    registry = load_registry()
-    schemas = registry.get('schemas', [])
+    registry = SchemaRegistry()
+    schemas = list(registry.entries)
     
     if not schemas:
         logger.warning("No schemas found in registry")
         return []
     
     print(f"Found {len(schemas)} schemas in registry to rescrape")
-    updated_schemas = []
-    
-    for i, schema_entry in enumerate(schemas, 1):
-        try:
-            course_name = schema_entry.get('course_name', 'Unknown Course')
-            exam_url = schema_entry.get('exam_url', '')
-            listing_url = schema_entry.get('listing_url', '')
-            
-            # Use stored listing URL if available, otherwise try to reconstruct
-            if not listing_url:
-                if 'hubspot' in course_name.lower():
-                    # Convert course name to listing URL format
-                    course_slug = course_name.lower().replace(' ', '-').replace('hubspot-', '')
-                    listing_url = f"https://www.gcertificationcourse.com/hubspot-{course_slug}-answers/"
-                else:
-                    logger.warning(f"Cannot determine listing URL for: {course_name}")
-                    continue
-            
-            print(f"[{i}/{len(schemas)}] Rescaping: {course_name}")
-            print(f"  Listing URL: {listing_url}")
-            print(f"  Exam URL: {exam_url}")
-            
-            # Rescrape the course
-            schema_file = scrape_course(listing_url, course_name, exam_url=exam_url)
-            
-            if schema_file:
-                updated_schemas.append(schema_file)
-                print(f"  ✅ Updated: {schema_file}")
+    jobs = []
+    skipped = []
+    unchanged = []
+    catalog = create_url_catalog()
+    schema_builder = SchemaBuilder(output_dir=SCHEMA_CONFIG['output_directory'])
+    
+    for schema_entry in schemas:
+        course_name = schema_entry.get('course_name', 'Unknown Course')
+        exam_url = schema_entry.get('exam_url', '')
+        listing_url = schema_entry.get('listing_url', '')
+        
+        # Use stored listing URL if available, then the sitemap catalog, otherwise try to reconstruct
+        if not listing_url and catalog:
+            listing_url = catalog.find_listing_url(course_name)
+        
+        if not listing_url:
+            if 'hubspot' in course_name.lower():
+                # Convert course name to listing URL format
+                course_slug = course_name.lower().replace(' ', '-').replace('hubspot-', '')
+                listing_url = f"https://www.gcertificationcourse.com/hubspot-{course_slug}-answers/"
             else:
-                print(f"  ❌ Failed to update: {course_name}")
-                
-        except Exception as e:
-            logger.error(f"Error rescaping {course_name}: {e}")
-            print(f"  ❌ Error: {e}")
-            continue
+                logger.warning(f"Cannot determine listing URL for: {course_name}")
+                skipped.append((course_name, 'Cannot determine listing URL'))
+                continue
+        
+        # Courses whose listing and question pages all predate the last scrape,
+        # according to sitemaps read since then, are left alone without crawling
+        # their listing page
+        if catalog and not overwrite:
+            schema_path = schema_builder.get_schema_path(course_name)
+            if os.path.exists(schema_path) and catalog.course_unchanged(
+                    listing_url, schema_builder.load_schema(schema_path),
+                    DEFAULT_SCRAPING_CONFIG['incremental_ttl_days']):
+                unchanged.append(course_name)
+                continue
+        
+        print(f"  {course_name}")
+        print(f"    Listing URL: {listing_url}")
+        print(f"    Exam URL: {exam_url}")
+        jobs.append({'url': listing_url, 'course_name': course_name, 'exam_url': exam_url})
+    
+    if unchanged:
+        print(f"Skipping {len(unchanged)} courses unchanged since their last scrape (sitemap lastmod)")
+    
+    # Registry updates are staged per course and written once at the end
+    with registry.batch():
+        report = run_course_jobs(jobs, workers, overwrite, registry, resume)
+    report['failed'].extend(skipped)
+    print_course_report(report)
+    
+    return [schema_file for _, schema_file in report['succeeded']]
+
+
+def discover_courses(site_url: str = None, sitemap_urls: List[str] = None, scrape: bool = False,
+                     workers: int = None) -> Dict:
+    """
+    Read the site's sitemaps into the URL catalog and report newly found courses
+    
+    Args:
+        site_url: Root URL of the site, from the scraping configuration if omitted
+        sitemap_urls: Sitemaps to start from, found through robots.txt if omitted
+        scrape: Also scrape every newly found course listing
+        workers: Number of courses scraped at the same time
+        
+    Returns:
+        Discovery statistics with the new listing URLs under 'new_listings'
+    """
+    site_url = site_url or DEFAULT_SCRAPING_CONFIG['sitemap_site_url']
+    catalog = UrlCatalog(DEFAULT_SCRAPING_CONFIG['url_catalog_path'], DEFAULT_SCRAPING_CONFIG['listing_url_pattern'])
+    discovery = SitemapDiscovery(create_scraper(site_url), catalog)
     
-    print(f"\nCompleted rescaping {len(updated_schemas)} out of {len(schemas)} schemas")
-    return updated_schemas
+    stats = discovery.discover(site_url, sitemap_urls)
+    catalog.save()
+    stats['new_listings'] = discovery.new_listing_urls()
+    stats['total_urls'] = len(catalog.urls)
+    stats['total_listings'] = len(catalog.listing_urls())
+    
+    if scrape and stats['new_listings']:
+        jobs = [{'url': url, 'course_name': course_name_from_listing_url(url)} for url in stats['new_listings']]
+        print_course_report(run_course_jobs(jobs, workers))
+    
+    return stats
 
+def configure_fixtures(record_dir: str = None, replay_dir: str = None, replay_latency: float = None):
+    """
+    Switch scraping to recording or replaying HTTP fixtures
+    
+    Both modes bypass the response cache, so every page is recorded and
+    replays exercise the full fetch path. Replays also drop the request
+    delay, the fixtures are served at disk speed plus replay_latency.
+    
+    Args:
+        record_dir: Record every response into this fixture directory
+        replay_dir: Serve responses from this fixture directory instead of the network
+        replay_latency: Seconds waited before every replayed response
+    """
+    if record_dir:
+        DEFAULT_SCRAPING_CONFIG.update(fixture_record_dir=record_dir, cache_enabled=False)
+        logger.info(f"Recording HTTP fixtures to {record_dir}")
+    
+    if replay_dir:
+        DEFAULT_SCRAPING_CONFIG.update(fixture_replay_dir=replay_dir, cache_enabled=False,
+                                       delay_between_requests=0)
+        logger.info(f"Replaying HTTP fixtures from {replay_dir}")
+    
+    if replay_latency is not None:
+        DEFAULT_SCRAPING_CONFIG['replay_latency'] = replay_latency
+
+def print_stage_summary():
+    """Print where the time of the command went, per instrumented stage"""
+    summary = stage_timer.format_summary()
+    if summary:
+        print("\nStage timings (nested stages and worker threads overlap):")
+        print(summary)
 
 def main():
     """Main function to handle command line interface"""
@@ -297,6 +777,12 @@ def main():
         """
     )
     
+    parser.add_argument('--profile', metavar='FILE', help='Write a cProfile/pstats dump of the command, worker threads included, to FILE')
+    add_fixture_arguments(parser)
+    parser.add_argument('--low-memory', action='store_true', help='Free parse trees right after extraction and drop raw HTML')
+    parser.add_argument('--keep-raw-html', action='store_true',
+                        help='With --low-memory, still keep raw HTML truncated and compressed (base64 zlib)')
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Scrape single course command
@@ -305,12 +791,20 @@ def main():
     scrape_parser.add_argument('--name', help='Course name (optional)')
     scrape_parser.add_argument('--output-dir', help='Output directory for schema files')
     scrape_parser.add_argument('--exam-url', help='HubSpot exam URL for Chrome extension mapping (optional)')
+    scrape_parser.add_argument('--concurrency', type=int, help='Number of answer pages fetched in parallel')
+    scrape_parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk response cache')
+    scrape_parser.add_argument('--resume', action='store_true', help='Resume an interrupted scrape from its checkpoint')
+    scrape_parser.add_argument('--overwrite', action='store_true', help='Rebuild the schema from scratch instead of merging new questions')
+    scrape_parser.add_argument('--stream', nargs='?', const='json', choices=['json', 'jsonl'],
+                               help='Write questions to disk as they are scraped (always rebuilds the schema)')
     
     # Scrape batch command
     batch_parser = subparsers.add_parser('scrape-batch', help='Scrape multiple courses from a file')
     batch_parser.add_argument('url_file', help='File containing URLs to scrape (one per line)')
     batch_parser.add_argument('--output-dir', help='Output directory for schema files')
     batch_parser.add_argument('--merge', action='store_true', help='Merge all schemas into one file')
+    batch_parser.add_argument('--workers', type=int, help='Number of courses scraped at the same time')
+    batch_parser.add_argument('--resume', action='store_true', help='Resume interrupted course scrapes from their checkpoints')
     
     # List schemas command
     list_parser = subparsers.add_parser('list', help='List available schema files')
@@ -320,10 +814,61 @@ def main():
     merge_parser = subparsers.add_parser('merge', help='Merge multiple schema files')
     merge_parser.add_argument('schema_files', nargs='+', help='Schema files to merge')
     merge_parser.add_argument('--output', help='Output filename for merged schema')
+    merge_parser.add_argument('--dedup', type=float, nargs='?', const=SCHEMA_CONFIG['dedup_threshold'],
+                              help='Drop near-duplicate questions (optional similarity threshold)')
+    
+    # Deduplicate all schemas command
+    dedup_parser = subparsers.add_parser('dedup', help='Find near-duplicate questions across all schemas')
+    dedup_parser.add_argument('--schema-dirs', nargs='+', help='Directories containing schema files')
+    dedup_parser.add_argument('--threshold', type=float, help='Similarity threshold for near-duplicates')
+    dedup_parser.add_argument('--output', help='Output filename for the deduplicated corpus')
+    
+    # Convert schema format command
+    convert_parser = subparsers.add_parser('convert', help='Convert schema files between JSON and the compact format')
+    convert_parser.add_argument('schema_files', nargs='+', help='Schema files to convert')
+    convert_parser.add_argument('--to', choices=['json', 'compact'], default='compact', help='Target format')
+    
+    # Question store commands
+    store_import_parser = subparsers.add_parser('store-import', help='Import schema files into the SQLite question store')
+    store_import_parser.add_argument('schema_paths', nargs='+', help='Schema files or directories to import')
+    store_import_parser.add_argument('--db', help='Question store database path')
+    
+    store_search_parser = subparsers.add_parser('store-search', help='Full-text search the SQLite question store')
+    store_search_parser.add_argument('query', help='Words to search for')
+    store_search_parser.add_argument('--limit', type=int, default=10, help='Maximum number of results')
+    store_search_parser.add_argument('--db', help='Question store database path')
+    
+    store_export_parser = subparsers.add_parser('store-export', help='Export a stored course as a JSON schema')
+    store_export_parser.add_argument('course_name', help='Schema file path or name of the stored course, or its course name')
+    store_export_parser.add_argument('--output-dir', help='Output directory for the schema file')
+    store_export_parser.add_argument('--db', help='Question store database path')
+    
+    # Build match indexes command
+    index_parser = subparsers.add_parser('build-index', help='Build match index sidecars for existing schemas')
+    index_parser.add_argument('--schema-dir', help='Directory containing schema files')
+    
+    # Benchmark question matching command
+    bench_parser = subparsers.add_parser('bench-match', help='Benchmark question matching against the schemas')
+    bench_parser.add_argument('--schema-dir', help='Directory containing schema files')
+    bench_parser.add_argument('--samples', nargs='+', help='Saved exam HTML files or directories to replay')
+    bench_parser.add_argument('--repeat', type=int, default=5, help='Passes over the replayed questions')
+    bench_parser.add_argument('--schema-sample', type=int, default=100, help="Typo'd schema questions to add to the replay")
+    bench_parser.add_argument('--threshold', type=float, help='Partial match threshold (default from EXTENSION_CONFIG)')
+    bench_parser.add_argument('--case-sensitive', action='store_true', default=None, help='Match case sensitively')
+    
+    # Discover courses command
+    discover_parser = subparsers.add_parser('discover', help='Catalog course and answer URLs from the site sitemaps')
+    discover_parser.add_argument('--site', help='Root URL of the site (default from DEFAULT_SCRAPING_CONFIG)')
+    discover_parser.add_argument('--sitemap', nargs='+', help='Sitemap URLs to start from instead of robots.txt')
+    discover_parser.add_argument('--scrape', action='store_true', help='Scrape newly discovered courses')
+    discover_parser.add_argument('--workers', type=int, help='Number of courses scraped at the same time')
     
     # Rescrape all command
     rescrape_parser = subparsers.add_parser('rescrape-all', help='Rescrape all sites from registry')
     rescrape_parser.add_argument('--confirm', action='store_true', help='Confirm you want to rescrape all sites (this may take a while)')
+    rescrape_parser.add_argument('--workers', type=int, help='Number of courses scraped at the same time')
+    rescrape_parser.add_argument('--resume', action='store_true', help='Resume interrupted course scrapes from their checkpoints')
+    rescrape_parser.add_argument('--overwrite', action='store_true', help='Rebuild every schema from scratch instead of merging new questions')
 
     args = parser.parse_args()
     
@@ -331,9 +876,21 @@ def main():
         parser.print_help()
         return
     
+    configure_fixtures(args.record, args.replay, args.replay_latency)
+    if args.low_memory:
+        DEFAULT_SCRAPING_CONFIG['low_memory'] = True
+    if args.keep_raw_html:
+        DEFAULT_SCRAPING_CONFIG['keep_raw_html'] = True
+    
+    profiler = ThreadProfiler() if args.profile else None
+    if profiler:
+        profiler.enable()
+    
     try:
         if args.command == 'scrape':
-            schema_file = scrape_course(args.url, args.name, args.output_dir, getattr(args, 'exam_url', None))
+            schema_file = scrape_course(args.url, args.name, args.output_dir, getattr(args, 'exam_url', None),
+                                        concurrency=args.concurrency, use_cache=not args.no_cache,
+                                        resume=args.resume, overwrite=args.overwrite, stream=args.stream)
             if schema_file:
                 print(f"Schema saved to: {schema_file}")
             else:
@@ -349,7 +906,7 @@ def main():
                 return
             
             print(f"Found {len(urls)} URLs to process")
-            schema_files = scrape_multiple_courses(urls, args.output_dir)
+            schema_files = scrape_multiple_courses(urls, args.output_dir, args.workers, args.resume)
             
             print(f"Successfully processed {len(schema_files)} courses")
             
@@ -382,16 +939,63 @@ def main():
                     print(f"Schema file not found: {file_path}")
                     return
             
-            merged_file = merge_schemas(args.schema_files, args.output)
+            merged_file = merge_schemas(args.schema_files, args.output, args.dedup)
             print(f"Merged schema saved to: {merged_file}")
 
+        elif args.command == 'dedup':
+            print_dedup_report(deduplicate_schemas(args.schema_dirs, args.output, args.threshold))
+
+        elif args.command == 'convert':
+            schema_builder = SchemaBuilder()
+            for file_path in args.schema_files:
+                print(f"Converted to: {schema_builder.convert_schema(file_path, args.to)}")
+
+        elif args.command == 'store-import':
+            imported = import_schemas_to_store(args.schema_paths, args.db)
+            print(f"Imported {imported} schemas into the question store")
+
+        elif args.command == 'store-search':
+            results = QuestionStore(args.db or SCHEMA_CONFIG['question_store_path']).search(args.query, args.limit)
+            if not results:
+                print("No matching questions found")
+            for result in results:
+                print(f"[{result['course_name']} - {result['schema_file']}] {result['question']}")
+                print(f"    Answer: {result['answer']}")
+
+        elif args.command == 'store-export':
+            schema_file = export_schema_from_store(args.course_name, args.output_dir, args.db)
+            if schema_file:
+                print(f"Schema saved to: {schema_file}")
+            else:
+                print(f"Course not found in the question store: {args.course_name}")
+
+        elif args.command == 'build-index':
+            index_files = build_match_indexes(args.schema_dir)
+            print(f"Built {len(index_files)} match indexes")
+
+        elif args.command == 'bench-match':
+            # Only this command needs the benchmark script
+            from bench_match import run_benchmark as run_match_benchmark, print_report as print_match_report
+            logging.disable(logging.INFO)
+            report = run_match_benchmark(args.schema_dir, args.samples, args.repeat, args.schema_sample,
+                                         args.threshold, args.case_sensitive)
+            print_match_report(report)
+
+        elif args.command == 'discover':
+            stats = discover_courses(args.site, args.sitemap, args.scrape, args.workers)
+            print(f"Read {stats['sitemaps_read']} sitemaps ({stats['sitemaps_unchanged']} unchanged and skipped)")
+            print(f"URLs: {stats['new']} new, {stats['changed']} changed, {stats['unchanged']} unchanged "
+                  f"({stats['total_urls']} cataloged, {stats['total_listings']} course listings)")
+            for url in stats['new_listings']:
+                print(f"  New course: {course_name_from_listing_url(url)} - {url}")
+
         elif args.command == 'rescrape-all':
             if not args.confirm:
                 print("This will rescrape all sites in the registry. This may take a while.")
                 print("Use --confirm to proceed: python main.py rescrape-all --confirm")
                 return
             
-            updated_schemas = rescrape_all_from_registry()
+            updated_schemas = rescrape_all_from_registry(args.workers, args.overwrite, args.resume)
             if updated_schemas:
                 print(f"Successfully updated {len(updated_schemas)} schemas")
             else:
@@ -403,6 +1007,12 @@ def main():
         logger.error(f"Error: {e}")
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to: {args.profile} (inspect with python -m pstats {args.profile})")
+        print_stage_summary()
 
 if __name__ == "__main__":
     main()
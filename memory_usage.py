@@ -0,0 +1,97 @@
+"""
+Process memory sampling for the scraper
+Tracks the peak resident set size while a course is scraped
+"""
+
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss_bytes() -> int:
+    """
+    Get the current resident set size of this process
+
+    Reads /proc where available. Elsewhere the process-wide high-water
+    mark is the best available figure, 0 if not even that is known.
+
+    Returns:
+        Resident set size in bytes
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return _max_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """
+    Get the peak resident set size of this process
+
+    Uses VmHWM from /proc where available, unlike ru_maxrss it starts over
+    when a process is spawned, so a child does not report its parent's peak.
+
+    Returns:
+        Peak resident set size in bytes
+    """
+    try:
+        with open('/proc/self/status', 'rb') as f:
+            for line in f:
+                if line.startswith(b'VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return _max_rss_bytes()
+
+
+def _max_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class PeakMemory:
+    def __init__(self):
+        """Thread-safe high-water mark of the process RSS, sampled at chosen points"""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new measurement from the current RSS"""
+        with self._lock:
+            self.start_bytes = current_rss_bytes()
+            self.peak_bytes = self.start_bytes
+
+    def sample(self) -> int:
+        """
+        Record the current RSS
+
+        Returns:
+            Current RSS in bytes
+        """
+        rss = current_rss_bytes()
+        with self._lock:
+            self.peak_bytes = max(self.peak_bytes, rss)
+        return rss
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_bytes / 1048576
+
+    @property
+    def growth_mb(self) -> float:
+        """Peak above the RSS at the start of the measurement"""
+        return (self.peak_bytes - self.start_bytes) / 1048576
@@ -0,0 +1,77 @@
+"""
+HTML parser backend selection for the web scraper
+"""
+
+import importlib.util
+import logging
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from stage_timer import timed
+
+logger = logging.getLogger(__name__)
+
+# BeautifulSoup tree builders, fastest first, paired with the module they need.
+# html.parser is always installed, so 'auto' never reaches html5lib, which is the
+# slowest backend and ignores parse_only.
+PARSER_BACKENDS = [
+    ('lxml', 'lxml'),
+    ('html.parser', None),
+    ('html5lib', 'html5lib')
+]
+
+# Backends that build the whole tree whatever parse_only says
+NO_PARSE_ONLY_BACKENDS = {'html5lib'}
+
+# Question pages are WordPress posts, answers only ever live inside <article>
+QUESTION_PAGE_STRAINER = SoupStrainer('article')
+
+
+def available_backends() -> list:
+    """
+    List the BeautifulSoup parser backends that can be used in this environment
+
+    Returns:
+        List of backend names, fastest first
+    """
+    return [name for name, module in PARSER_BACKENDS
+            if module is None or importlib.util.find_spec(module) is not None]
+
+
+def resolve_backend(parser: str = 'auto') -> str:
+    """
+    Resolve a configured parser name to an installed backend
+
+    Args:
+        parser: Backend name, or 'auto' to pick lxml when installed and html.parser otherwise
+
+    Returns:
+        Backend name usable by BeautifulSoup
+    """
+    available = available_backends()
+    if parser == 'auto':
+        return available[0]
+    if parser not in available:
+        logger.warning(f"HTML parser '{parser}' is not installed, falling back to {available[0]}")
+        return available[0]
+    return parser
+
+
+@timed('parse')
+def make_soup(content, parser: str = 'html.parser', parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse HTML content with the given backend
+
+    Args:
+        content: Raw HTML bytes or text
+        parser: Resolved backend name
+        parse_only: Optional strainer restricting the tree to matching subtrees,
+                    ignored by html5lib which always builds the whole tree
+
+    Returns:
+        BeautifulSoup object
+    """
+    if parser in NO_PARSE_ONLY_BACKENDS:
+        parse_only = None
+    return BeautifulSoup(content, parser, parse_only=parse_only)
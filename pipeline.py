@@ -0,0 +1,114 @@
+"""
+Streaming scrape pipeline
+Chains listing -> fetch/extract -> clean -> write as generators so Q&A records
+flow through one at a time instead of being collected into a course dictionary
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Iterator, List, Tuple
+from urllib.parse import urlparse
+
+from scraper import WebScraper
+from schema_builder import SchemaBuilder, StreamingSchemaWriter
+from checkpoint import ScrapeCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+def listing_stage(scraper: WebScraper, listing_url: str, course_name: str) -> Tuple[Dict, List[Dict]]:
+    """
+    Scrape the listing page
+
+    Returns:
+        Tuple of (course data without questions, listed questions)
+    """
+    questions = scraper.scrape_questions_listing(listing_url)
+    course_data = {
+        'course_name': course_name,
+        'listing_url': listing_url,
+        'scraped_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'total_questions': len(questions)
+    }
+    return course_data, questions
+
+
+def fetch_stage(scraper: WebScraper, questions: List[Dict], checkpoint: ScrapeCheckpoint = None) -> Iterator[Dict]:
+    """Fetch every answer page and extract its answer, yielding complete Q&A records in listing order"""
+    return scraper.iter_question_records(questions, checkpoint)
+
+
+def clean_stage(schema_builder: SchemaBuilder, records: Iterator[Dict], scraped_date: str) -> Iterator[Dict]:
+    """Turn Q&A records into question schema entries, dropping incomplete ones"""
+    for record in records:
+        question = schema_builder.build_question(record, scraped_date)
+        if question:
+            yield question
+
+
+def write_stage(writer: StreamingSchemaWriter, questions: Iterator[Dict]) -> Iterator[Dict]:
+    """Write each question as soon as it arrives and pass it on to downstream consumers"""
+    for question in questions:
+        writer.write(question)
+        yield question
+
+
+class CourseStream:
+    def __init__(self, scraper: WebScraper, schema_builder: SchemaBuilder, listing_url: str,
+                 course_name: str = None, format: str = 'json', checkpoint: ScrapeCheckpoint = None):
+        """
+        Streaming scrape of a single course
+
+        Iterating the stream runs the pipeline and yields every question
+        schema entry right after it has been written to disk.
+
+        Args:
+            scraper: Configured web scraper
+            schema_builder: Schema builder whose output directory receives the file
+            listing_url: URL of the course listing page
+            course_name: Name of the course (optional)
+            format: 'json' for a regular schema file, 'jsonl' for one question per line
+            checkpoint: Optional checkpoint for resumable scrapes
+        """
+        self.scraper = scraper
+        self.schema_builder = schema_builder
+        self.listing_url = listing_url
+        self.course_name = course_name or urlparse(listing_url).netloc
+        self.format = format
+        self.checkpoint = checkpoint
+        self.total_questions = 0
+        self.count = 0
+
+        filename = schema_builder.get_schema_filename(self.course_name)
+        if format == 'jsonl':
+            filename += 'l'
+        self.filepath = os.path.join(schema_builder.output_dir, filename)
+
+    def __iter__(self) -> Iterator[Dict]:
+        logger.info(f"Starting streaming scrape for course: {self.course_name}")
+
+        course_data, questions = listing_stage(self.scraper, self.listing_url, self.course_name)
+        self.total_questions = len(questions)
+        if not questions:
+            logger.warning("No questions found on the listing page")
+            return
+
+        header = self.schema_builder.build_schema_header(course_data)
+        with StreamingSchemaWriter(self.filepath, header, self.format) as writer:
+            records = fetch_stage(self.scraper, questions, self.checkpoint)
+            cleaned = clean_stage(self.schema_builder, records, course_data['scraped_date'])
+            for question in write_stage(writer, cleaned):
+                self.count += 1
+                yield question
+
+        # The manifest and index need every question, take them from the finished file
+        if self.format == 'json':
+            schema = self.schema_builder.load_schema(self.filepath)
+            self.schema_builder.store_schema(schema, self.filepath)
+            self.schema_builder.update_manifest(self.filepath, schema)
+            if self.schema_builder.write_match_index:
+                self.schema_builder.save_match_index(schema, self.filepath)
+
+        logger.info(f"Completed streaming {self.count} of {self.total_questions} questions for {self.course_name}")
+        self.scraper.log_stats()
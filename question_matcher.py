@@ -0,0 +1,371 @@
+"""
+Question matching shared with the Chrome extension
+Mirrors the normalization and similarity used by extension/content.js and
+builds the precomputed match index that is shipped next to each schema
+"""
+
+import re
+import json
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+NGRAM_SIZE = 3
+
+
+def normalize_text(text: str, case_sensitive: bool = False) -> str:
+    """
+    Normalize question text exactly like normalizeText() in content.js
+
+    Args:
+        text: Raw question text
+        case_sensitive: Keep the original case instead of lowercasing
+
+    Returns:
+        Trimmed, whitespace collapsed, punctuation free, lowercase text
+    """
+    if not text:
+        return ''
+    text = re.sub(r'\s+', ' ', text.strip())
+    # JavaScript \w and \s are ASCII-only inside a character class without the u flag
+    text = re.sub(r'[^\w\s]', '', text, flags=re.ASCII)
+    return text if case_sensitive else text.lower()
+
+
+def levenshtein_distance(str1: str, str2: str) -> int:
+    """
+    Edit distance between two strings
+
+    Uses the bit-parallel algorithm of Myers / Hyyrö with one Python integer
+    as the bit vector, it gives the same distance as the dynamic programming
+    matrix in content.js at a fraction of the cost in Python.
+    """
+    if len(str1) < len(str2):
+        str1, str2 = str2, str1
+    if not str2:
+        return len(str1)
+
+    match_masks = {}
+    for i, char in enumerate(str2):
+        match_masks[char] = match_masks.get(char, 0) | (1 << i)
+
+    full = (1 << len(str2)) - 1
+    last = 1 << (len(str2) - 1)
+    positive, negative, distance = full, 0, len(str2)
+
+    for char in str1:
+        eq = match_masks.get(char, 0)
+        xv = eq | negative
+        xh = ((((eq & positive) + positive) & full) ^ positive) | eq
+        horizontal_positive = (negative | ~(xh | positive)) & full
+        horizontal_negative = positive & xh
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        horizontal_positive = ((horizontal_positive << 1) | 1) & full
+        horizontal_negative = (horizontal_negative << 1) & full
+        positive = (horizontal_negative | ~(xv | horizontal_positive)) & full
+        negative = horizontal_positive & xv
+    return distance
+
+
+def calculate_similarity(str1: str, str2: str) -> float:
+    """
+    Similarity ratio like calculateSimilarity() in content.js
+
+    Returns:
+        1 - edit distance / length of the longer string
+    """
+    longer, shorter = (str1, str2) if len(str1) > len(str2) else (str2, str1)
+    if not longer:
+        return 1.0
+    return (len(longer) - levenshtein_distance(longer, shorter)) / len(longer)
+
+
+def text_hash(text: str) -> str:
+    """
+    32-bit FNV-1a hash of normalized text, as a hex string
+
+    Normalized text is plain ASCII, so hashing character codes gives the same
+    value in Python and JavaScript.
+    """
+    value = 0x811c9dc5
+    for char in text:
+        value ^= ord(char)
+        value = (value * 0x01000193) & 0xffffffff
+    return format(value, '08x')
+
+
+def char_ngrams(text: str, size: int = NGRAM_SIZE) -> Counter:
+    """Character n-grams of a normalized text, padded with spaces, with their number of occurrences"""
+    padded = f" {text} "
+    return Counter(padded[i:i + size] for i in range(max(1, len(padded) - size + 1)))
+
+
+def keyword_similarity(keywords: List[str], text: str) -> Optional[float]:
+    """
+    Keyword match like the keyword step of findMatchingQuestion() in content.js
+
+    Args:
+        keywords: Matching keywords of a schema question
+        text: Normalized question text
+
+    Returns:
+        Share of matching keywords, or None if too few keywords match
+    """
+    words = text.split(' ')
+    matching = [k for k in keywords if any(k in word or word in k for word in words)]
+    if len(matching) >= min(3, len(keywords) * 0.5):
+        return len(matching) / len(keywords)
+    return None
+
+
+def max_edit_distance(length: int, threshold: float) -> int:
+    """
+    Largest edit distance at which calculate_similarity() stays at or above the threshold
+
+    Args:
+        length: Length of the longer of the two texts
+        threshold: Minimum similarity
+
+    Returns:
+        Edit distance, worked out with the same float comparison as the similarity check
+    """
+    if length == 0:
+        return 0
+    distance = max(0, int(length * (1 - threshold)))
+    while distance < length and (length - distance - 1) / length >= threshold:
+        distance += 1
+    while distance > 0 and (length - distance) / length < threshold:
+        distance -= 1
+    return distance
+
+
+def match_question(text: str, normalized: str, keywords: Optional[List[str]], threshold: float):
+    """
+    Exact, partial and keyword checks of one schema question, in the order of content.js
+
+    Args:
+        text: Normalized question seen on the exam page
+        normalized: Normalized schema question
+        keywords: Matching keywords of the schema question
+        threshold: Minimum similarity for a partial match
+
+    Returns:
+        Tuple of (match type, similarity), or None if no check passes
+    """
+    if text == normalized:
+        return 'exact', 1.0
+
+    similarity = calculate_similarity(text, normalized)
+    if similarity >= threshold:
+        return 'partial', similarity
+
+    if keywords:
+        similarity = keyword_similarity(keywords, text)
+        if similarity is not None:
+            return 'keyword', similarity
+
+    return None
+
+
+class ExtensionMatcher:
+    def __init__(self, schemas: List[Dict], threshold: float = 0.8, case_sensitive: bool = False):
+        """
+        Reference matcher doing the same full scan as findMatchingQuestion() in content.js
+
+        Every schema question is tried in order with the exact, partial and
+        keyword checks and the first one passing any of them wins.
+
+        Args:
+            schemas: Loaded schema dictionaries
+            threshold: Minimum similarity for a partial match
+            case_sensitive: Compare question texts without lowercasing
+        """
+        self.threshold = threshold
+        self.case_sensitive = case_sensitive
+        self.entries = [
+            (question, normalize_text(question.get('question', ''), case_sensitive))
+            for schema in schemas
+            for question in schema.get('questions', [])
+        ]
+
+    def lookup(self, question_text: str) -> Optional[Dict]:
+        """
+        Find the schema question matching a question seen on the exam page
+
+        Args:
+            question_text: Raw question text
+
+        Returns:
+            Dictionary with 'qa', 'match_type' and 'similarity', or None if nothing matched
+        """
+        text = normalize_text(question_text, self.case_sensitive)
+
+        for question, normalized in self.entries:
+            match = match_question(text, normalized, question.get('matching_keywords'), self.threshold)
+            if match:
+                return {'qa': question, 'match_type': match[0], 'similarity': match[1]}
+
+        return None
+
+
+def build_match_index(schema: Dict) -> Dict:
+    """
+    Build the match index for a schema
+
+    Positions in every posting list refer to schema['questions'].
+
+    Args:
+        schema: Schema dictionary
+
+    Returns:
+        Index dictionary with normalized texts, an exact-match hash map, a
+        character n-gram inverted index and the keywords by position
+    """
+    normalized = []
+    exact = defaultdict(list)
+    ngrams = defaultdict(list)
+    keywords = {}
+
+    for position, question in enumerate(schema.get('questions', [])):
+        text = normalize_text(question.get('question', ''))
+        normalized.append(text)
+        exact[text_hash(text)].append(position)
+        # A position is listed once per occurrence, so shared n-grams count with multiplicity
+        for gram, count in sorted(char_ngrams(text).items()):
+            ngrams[gram].extend([position] * count)
+        if question.get('matching_keywords'):
+            keywords[str(position)] = question['matching_keywords']
+
+    return {
+        'index_version': INDEX_VERSION,
+        'ngram_size': NGRAM_SIZE,
+        'question_count': len(normalized),
+        'normalized': normalized,
+        'exact': dict(exact),
+        'ngrams': dict(ngrams),
+        'keywords': keywords
+    }
+
+
+class MatchIndex:
+    def __init__(self, index: Dict, questions: List[Dict] = None):
+        """
+        Reference matcher over a precomputed match index
+
+        Args:
+            index: Index dictionary from build_match_index
+            questions: Optional schema questions, returned with matches
+        """
+        if index.get('index_version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported match index version: {index.get('index_version')}")
+        self.index = index
+        self.questions = questions
+        self.normalized = index['normalized']
+
+    @classmethod
+    def from_schema(cls, schema: Dict) -> 'MatchIndex':
+        """Build an in-memory index for a schema"""
+        return cls(build_match_index(schema), schema.get('questions', []))
+
+    @classmethod
+    def load(cls, index_path: str, schema: Dict = None) -> 'MatchIndex':
+        """Load an index sidecar from disk"""
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        return cls(index, schema.get('questions', []) if schema else None)
+
+    def candidates(self, text: str, threshold: float = 0.8) -> Optional[set]:
+        """
+        Find every question that could pass one of the checks of the full scan
+
+        Two texts within edit distance k share at least max(len) - ngram_size * k
+        of their padded n-grams (the q-gram lemma), so questions sharing fewer, or
+        differing in length by more than k, are ruled out without computing the
+        Levenshtein distance. Keyword matches are checked directly, only the few
+        questions with keywords take part.
+
+        Args:
+            text: Normalized question text
+            threshold: Minimum similarity for a partial match
+
+        Returns:
+            Set of question positions, or None if the n-gram filter cannot rule
+            out questions for this text and threshold
+        """
+        if not text or threshold <= 0:
+            return None
+
+        size = self.index['ngram_size']
+        length = len(text)
+
+        # The filter needs a positive bound for every length that can still reach the threshold
+        longest = length
+        while longest + 1 - length <= max_edit_distance(longest + 1, threshold):
+            longest += 1
+        if any(other - size * max_edit_distance(other, threshold) <= 0 for other in range(length, longest + 1)):
+            return None
+
+        overlap = defaultdict(int)
+        for gram, count in char_ngrams(text, size).items():
+            # Postings repeat a position once per occurrence, count at most `count` of them
+            previous, run = None, 0
+            for position in self.index['ngrams'].get(gram, ()):
+                run = run + 1 if position == previous else 0
+                previous = position
+                if run < count:
+                    overlap[position] += 1
+
+        candidates = set(self.index['exact'].get(text_hash(text), ()))
+        for position, shared in overlap.items():
+            other = len(self.normalized[position])
+            distance = max_edit_distance(max(length, other), threshold)
+            if abs(length - other) <= distance and shared >= max(length, other) - size * distance:
+                candidates.add(position)
+
+        for position, keywords in self.index['keywords'].items():
+            if keyword_similarity(keywords, text) is not None:
+                candidates.add(int(position))
+
+        return candidates
+
+    def lookup(self, question_text: str, threshold: float = 0.8) -> Optional[Dict]:
+        """
+        Find the schema question matching a question seen on the exam page
+
+        Returns the same match as the full scan of ExtensionMatcher: the first
+        question in schema order passing the exact, partial or keyword check,
+        only checking the candidates. Every question that can pass is a candidate,
+        so the scan itself only runs when candidates() cannot filter this text.
+
+        Args:
+            question_text: Raw question text
+            threshold: Minimum similarity for a partial match
+
+        Returns:
+            Dictionary with 'position', 'match_type', 'similarity' and, when
+            questions were given, 'qa'; or None if nothing matched
+        """
+        text = normalize_text(question_text)
+
+        candidates = self.candidates(text, threshold)
+        positions = range(len(self.normalized)) if candidates is None else sorted(candidates)
+
+        for position in positions:
+            match = match_question(text, self.normalized[position],
+                                   self.index['keywords'].get(str(position)), threshold)
+            if match:
+                return self._result(position, *match)
+
+        return None
+
+    def _result(self, position: int, match_type: str, similarity: float) -> Dict:
+        result = {'position': position, 'match_type': match_type, 'similarity': similarity}
+        if self.questions is not None:
+            result['qa'] = self.questions[position]
+        return result
@@ -0,0 +1,384 @@
+"""
+SQLite question store
+Persists courses, questions, answers and source URLs in one local database so
+cross-course operations can query instead of reloading every schema file
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from question_matcher import normalize_text, text_hash
+from registry_manager import extract_exam_id_from_url
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+# Schema files are keyed relative to the repository, so files of the same name in
+# extension/schemas and schemas stay separate courses
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Question fields with their own column, everything else is kept in 'extra'
+QUESTION_COLUMNS = ('id', 'question', 'answer', 'source_url', 'scraped_date')
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    schema_file TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    source_url TEXT,
+    exam_id TEXT,
+    exam_url TEXT,
+    schema_version TEXT,
+    created_date TEXT,
+    scraped_date TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_courses_name ON courses(name);
+CREATE INDEX IF NOT EXISTS idx_courses_exam_id ON courses(exam_id);
+
+CREATE TABLE IF NOT EXISTS questions (
+    rowid INTEGER PRIMARY KEY,
+    course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question_id INTEGER,
+    question TEXT NOT NULL,
+    question_hash TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    source_url TEXT,
+    scraped_date TEXT,
+    extra TEXT,
+    UNIQUE (course_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_hash ON questions(question_hash);
+CREATE INDEX IF NOT EXISTS idx_questions_source_url ON questions(source_url);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    question, content='questions', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts(rowid, question) VALUES (new.rowid, new.question);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+    INSERT INTO questions_fts(questions_fts, rowid, question) VALUES ('delete', old.rowid, old.question);
+END;
+CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE ON questions BEGIN
+    INSERT INTO questions_fts(questions_fts, rowid, question) VALUES ('delete', old.rowid, old.question);
+    INSERT INTO questions_fts(rowid, question) VALUES (new.rowid, new.question);
+END;
+"""
+
+
+def schema_key(schema_file: str) -> str:
+    """
+    Key of a schema file in the store
+
+    Args:
+        schema_file: Path of the schema file
+
+    Returns:
+        Path relative to the repository with '/' separators, or the absolute
+        path for files outside of it
+    """
+    path = os.path.abspath(schema_file)
+    try:
+        relative = os.path.relpath(path, REPO_DIR)
+    except ValueError:
+        # Different drive on Windows
+        relative = os.pardir
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        relative = path
+    return relative.replace(os.sep, '/')
+
+
+class QuestionStore:
+    def __init__(self, db_path: str = 'questions.db'):
+        """
+        Open or create the question store
+
+        Every thread gets its own connection. Writes run in IMMEDIATE
+        transactions in WAL mode, so concurrent scrapes queue up for the write
+        lock instead of failing, and readers never see half a course.
+        Courses are keyed by schema file path, several schema files may share
+        a file name or a course name.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        connection = self._connection()
+        connection.executescript(SCHEMA_SQL)
+        connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Autocommit mode, transactions are opened explicitly in _transaction()
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def upsert_schema(self, schema: Dict, schema_file: str, exam_url: str = None, exam_id: str = None) -> int:
+        """
+        Insert or replace a course and all of its questions in one transaction
+
+        Args:
+            schema: Schema dictionary
+            schema_file: Path of the schema file, which identifies the course
+            exam_url: Optional HubSpot exam URL, kept from the previous upsert if not given
+            exam_id: Optional HubSpot exam ID, taken from exam_url if not given
+
+        Returns:
+            Course id
+        """
+        course_info = schema.get('course_info', {})
+        name = course_info.get('name', 'Unknown Course')
+        schema_file = schema_key(schema_file)
+
+        with self._transaction() as connection:
+            connection.execute(
+                """
+                INSERT INTO courses (schema_file, name, source_url, exam_id, exam_url, schema_version,
+                                     created_date, scraped_date, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(schema_file) DO UPDATE SET
+                    name = excluded.name,
+                    source_url = excluded.source_url,
+                    exam_id = COALESCE(excluded.exam_id, courses.exam_id),
+                    exam_url = COALESCE(excluded.exam_url, courses.exam_url),
+                    schema_version = excluded.schema_version,
+                    created_date = excluded.created_date,
+                    scraped_date = excluded.scraped_date,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    schema_file,
+                    name,
+                    course_info.get('source_url'),
+                    exam_id or extract_exam_id_from_url(exam_url),
+                    exam_url,
+                    schema.get('schema_version'),
+                    schema.get('created_date'),
+                    course_info.get('scraped_date'),
+                    datetime.now().isoformat()
+                )
+            )
+            course_id = connection.execute(
+                "SELECT id FROM courses WHERE schema_file = ?", (schema_file,)
+            ).fetchone()['id']
+
+            connection.execute("DELETE FROM questions WHERE course_id = ?", (course_id,))
+            connection.executemany(
+                """
+                INSERT INTO questions (course_id, position, question_id, question, question_hash,
+                                       answer, source_url, scraped_date, extra)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [self._question_row(course_id, position, question)
+                 for position, question in enumerate(schema.get('questions', []))]
+            )
+
+        logger.info(f"Stored {len(schema.get('questions', []))} questions for {name} ({schema_file}) in {self.db_path}")
+        return course_id
+
+    @staticmethod
+    def _question_row(course_id: int, position: int, question: Dict) -> tuple:
+        extra = {key: value for key, value in question.items() if key not in QUESTION_COLUMNS}
+        text = question.get('question', '')
+        return (
+            course_id,
+            position,
+            question.get('id'),
+            text,
+            text_hash(normalize_text(text)),
+            json.dumps(question.get('answer', ''), ensure_ascii=False),
+            question.get('source_url'),
+            question.get('scraped_date'),
+            json.dumps(extra, ensure_ascii=False) if extra else None
+        )
+
+    @staticmethod
+    def _question_dict(row: sqlite3.Row) -> Dict:
+        question = {
+            'id': row['question_id'],
+            'question': row['question'],
+            'answer': json.loads(row['answer']),
+            'source_url': row['source_url']
+        }
+        if row['scraped_date'] is not None:
+            question['scraped_date'] = row['scraped_date']
+        if row['extra']:
+            question.update(json.loads(row['extra']))
+        return question
+
+    def list_courses(self) -> List[Dict]:
+        """
+        List the stored courses
+
+        Returns:
+            Course dictionaries with their question count
+        """
+        rows = self._connection().execute(
+            """
+            SELECT courses.*, COUNT(questions.rowid) AS question_count
+            FROM courses LEFT JOIN questions ON questions.course_id = courses.id
+            GROUP BY courses.id ORDER BY courses.name, courses.schema_file
+            """
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_course_by_exam_id(self, exam_id: str) -> Optional[Dict]:
+        """Find the course registered for an exam ID"""
+        row = self._connection().execute("SELECT * FROM courses WHERE exam_id = ?", (exam_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_course(self, course: str) -> Optional[Dict]:
+        """
+        Find a stored course
+
+        Args:
+            course: Schema file path of the course, or its file name or course
+                name if only one schema file has it
+
+        Returns:
+            Course dictionary, or None if the course is unknown
+
+        Raises:
+            ValueError: If several schema files share the file name or course name
+        """
+        rows = [dict(row) for row in self._connection().execute(
+            "SELECT * FROM courses ORDER BY schema_file"
+        ).fetchall()]
+        key = schema_key(course)
+        for matches in ([row for row in rows if row['schema_file'] in (key, course)],
+                        [row for row in rows if row['schema_file'].rsplit('/', 1)[-1] == course],
+                        [row for row in rows if row['name'] == course]):
+            if len(matches) > 1:
+                schema_files = ', '.join(row['schema_file'] for row in matches)
+                raise ValueError(f"Several stored schema files match {course}, pick one of: {schema_files}")
+            if matches:
+                return matches[0]
+        return None
+
+    def load_schema(self, course: str) -> Optional[Dict]:
+        """
+        Rebuild the schema dictionary of a stored course
+
+        Args:
+            course: Schema file path of the course, or its file name or course
+                name if only one schema file has it
+
+        Returns:
+            Schema dictionary in the JSON schema layout, or None if the course is unknown
+
+        Raises:
+            ValueError: If several schema files share the file name or course name
+        """
+        course = self.get_course(course)
+        if course is None:
+            return None
+
+        connection = self._connection()
+        rows = connection.execute(
+            "SELECT * FROM questions WHERE course_id = ? ORDER BY position", (course['id'],)
+        ).fetchall()
+        return {
+            'schema_version': course['schema_version'] or '1.0',
+            'created_date': course['created_date'],
+            'course_info': {
+                'name': course['name'],
+                'source_url': course['source_url'] or '',
+                'total_questions': len(rows),
+                'scraped_date': course['scraped_date'] or ''
+            },
+            'questions': [self._question_dict(row) for row in rows]
+        }
+
+    def find_exact(self, question_text: str) -> List[Dict]:
+        """
+        Find stored questions with the same normalized text, across all courses
+
+        Args:
+            question_text: Raw question text
+
+        Returns:
+            Question dictionaries with their 'course_name' and 'schema_file'
+        """
+        normalized = normalize_text(question_text)
+        rows = self._connection().execute(
+            """
+            SELECT questions.*, courses.name AS course_name, courses.schema_file
+            FROM questions JOIN courses ON courses.id = questions.course_id
+            WHERE question_hash = ?
+            """,
+            (text_hash(normalized),)
+        ).fetchall()
+        return [
+            dict(self._question_dict(row), course_name=row['course_name'], schema_file=row['schema_file'])
+            for row in rows
+            if normalize_text(row['question']) == normalized
+        ]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Full-text search over question text
+
+        Every word of the query must appear in the question, results are
+        ranked with FTS5's bm25.
+
+        Args:
+            query: Words to search for
+            limit: Maximum number of results
+
+        Returns:
+            Question dictionaries with their 'course_name' and 'schema_file'
+        """
+        # Quote every word so punctuation in the query is never parsed as FTS5 syntax
+        terms = ' '.join('"' + word.replace('"', '""') + '"' for word in query.split())
+        if not terms:
+            return []
+
+        rows = self._connection().execute(
+            """
+            SELECT questions.*, courses.name AS course_name, courses.schema_file
+            FROM questions_fts
+            JOIN questions ON questions.rowid = questions_fts.rowid
+            JOIN courses ON courses.id = questions.course_id
+            WHERE questions_fts MATCH ?
+            ORDER BY bm25(questions_fts)
+            LIMIT ?
+            """,
+            (terms, limit)
+        ).fetchall()
+        return [dict(self._question_dict(row), course_name=row['course_name'], schema_file=row['schema_file'])
+                for row in rows]
+
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
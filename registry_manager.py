@@ -7,28 +7,28 @@ Manages the schema_registry.json file that maps HubSpot exam URLs to schema file
 import json
 import os
 import re
+import tempfile
+import threading
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks on Windows, only the in-process lock applies
+    fcntl = None
+
 REGISTRY_PATH = "extension/schema_registry.json"
 
 def load_registry() -> Dict:
     """Load the current schema registry"""
-    if os.path.exists(REGISTRY_PATH):
-        with open(REGISTRY_PATH, 'r') as f:
-            return json.load(f)
-    else:
-        return {
-            "version": "1.0",
-            "updated": "2025-07-01",
-            "schemas": []
-        }
+    return SchemaRegistry().to_dict()
 
 def save_registry(registry: Dict):
-    """Save the schema registry to file"""
-    os.makedirs(os.path.dirname(REGISTRY_PATH), exist_ok=True)
-    with open(REGISTRY_PATH, 'w') as f:
-        json.dump(registry, f, indent=2)
+    """Save the schema registry to file, atomically and under the registry lock"""
+    with _registry_file_lock(REGISTRY_PATH):
+        _write_registry_file(REGISTRY_PATH, registry)
 
 def extract_exam_id_from_url(exam_url: str) -> Optional[str]:
     """Extract exam ID from HubSpot exam URL"""
@@ -49,6 +49,285 @@ def generate_url_pattern(exam_url: str) -> str:
         parsed = urlparse(exam_url)
         return parsed.netloc
 
+def _escape_pattern(pattern: str) -> str:
+    """Escape a URL pattern for a regex that is valid in both Python and JavaScript"""
+    return re.sub(r'([.*+?^${}()|\[\]\\/])', r'\\\1', pattern)
+
+def build_lookup_tables(entries: List[Dict]) -> Dict:
+    """
+    Build the direct lookup tables stored in the registry file
+    
+    Exams with an ID are resolved through a plain dictionary, the remaining
+    URL patterns are joined into one alternation regex, so resolving an exam
+    URL does not scan the registry entries one by one.
+    
+    Args:
+        entries: Registry entries
+        
+    Returns:
+        Dictionary with 'schema_files_by_exam_id', 'fallback_schema_files' and
+        'fallback_pattern' (None when every entry has an exam ID)
+    """
+    by_exam_id = {}
+    fallback = {}
+    for entry in entries:
+        if entry.get("exam_id"):
+            by_exam_id.setdefault(entry["exam_id"], entry["schema_file"])
+        elif entry.get("exam_url_pattern"):
+            fallback.setdefault(entry["exam_url_pattern"], entry["schema_file"])
+    
+    return {
+        "schema_files_by_exam_id": by_exam_id,
+        "fallback_schema_files": fallback,
+        "fallback_pattern": '|'.join(_escape_pattern(p) for p in fallback) or None
+    }
+
+class RegistryLookup:
+    def __init__(self, entries: List[Dict]):
+        """
+        Resolve exam URLs to registry entries in constant time
+        
+        Args:
+            entries: Registry entries
+        """
+        self._by_exam_id = {}
+        self._by_pattern = {}
+        for entry in entries:
+            if entry.get("exam_id"):
+                self._by_exam_id.setdefault(entry["exam_id"], entry)
+            elif entry.get("exam_url_pattern"):
+                self._by_pattern.setdefault(entry["exam_url_pattern"], entry)
+        
+        pattern = build_lookup_tables(entries)["fallback_pattern"]
+        self._fallback = re.compile(pattern) if pattern else None
+    
+    def resolve(self, url: str) -> Optional[Dict]:
+        """
+        Find the registry entry for an exam page URL
+        
+        Args:
+            url: URL of the exam page
+            
+        Returns:
+            Registry entry, or None if no schema is registered for the URL
+        """
+        exam_id = extract_exam_id_from_url(url)
+        if exam_id in self._by_exam_id:
+            return self._by_exam_id[exam_id]
+        
+        if self._fallback:
+            match = self._fallback.search(url)
+            if match:
+                return self._by_pattern[match.group(0)]
+        return None
+
+def resolve_schema_file(exam_url: str) -> Optional[str]:
+    """Get the schema file registered for an exam page URL"""
+    entry = SchemaRegistry().lookup().resolve(exam_url)
+    return entry["schema_file"] if entry else None
+
+def _empty_registry() -> Dict:
+    return {
+        "version": "1.0",
+        "updated": "2025-07-01",
+        "schemas": []
+    }
+
+def _read_registry_file(path: str) -> Dict:
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return _empty_registry()
+
+def _write_registry_file(path: str, registry: Dict):
+    """Write the registry to a temporary file and rename it over the old one"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # The extension resolves exam URLs through the lookup tables instead of scanning the entries
+    registry["lookup"] = build_lookup_tables(registry.get("schemas", []))
+    
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.registry.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(registry, f, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+@contextmanager
+def _registry_file_lock(path: str):
+    """Hold an exclusive lock on the registry's lock file, shared with other processes"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.lock', 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+class SchemaRegistry:
+    def __init__(self, path: str = REGISTRY_PATH):
+        """
+        Schema registry with entries indexed by exam ID and URL pattern
+        
+        Updates are staged in memory. Each write re-reads the file under an
+        exclusive file lock, replays the staged updates on top of it and
+        replaces the file atomically, so parallel scrapes and other processes
+        never lose each other's updates. Inside batch() the write happens once
+        when the batch ends.
+        
+        Args:
+            path: Path to schema_registry.json
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._pending = []
+        self._batch_depth = 0
+        self._load(_read_registry_file(path))
+    
+    def _load(self, registry: Dict):
+        self.registry = registry
+        self._by_exam_id = {}
+        self._by_pattern = {}
+        for entry in registry.get("schemas", []):
+            self._index(entry)
+    
+    def _index(self, entry: Dict):
+        # Non-HubSpot exams have no ID, they are only found by URL pattern
+        if entry.get("exam_id"):
+            self._by_exam_id[entry["exam_id"]] = entry
+        if entry.get("exam_url_pattern"):
+            self._by_pattern[entry["exam_url_pattern"]] = entry
+    
+    def _unindex(self, entry: Dict):
+        if self._by_exam_id.get(entry.get("exam_id")) is entry:
+            del self._by_exam_id[entry["exam_id"]]
+        if self._by_pattern.get(entry.get("exam_url_pattern")) is entry:
+            del self._by_pattern[entry["exam_url_pattern"]]
+    
+    @property
+    def entries(self) -> List[Dict]:
+        """All registry entries"""
+        return self.registry.get("schemas", [])
+    
+    def to_dict(self) -> Dict:
+        """The registry as stored in schema_registry.json"""
+        return self.registry
+    
+    def lookup(self) -> RegistryLookup:
+        """Build a lookup resolving exam URLs against the current entries"""
+        with self._lock:
+            return RegistryLookup(self.entries)
+    
+    def get(self, exam_id: str = None, url_pattern: str = None) -> Optional[Dict]:
+        """
+        Find an entry by exam ID or URL pattern
+        
+        Args:
+            exam_id: HubSpot exam ID
+            url_pattern: Exam URL pattern
+            
+        Returns:
+            Registry entry, or None if there is none
+        """
+        with self._lock:
+            return self._by_exam_id.get(exam_id) or self._by_pattern.get(url_pattern)
+    
+    def _apply_upsert(self, entry: Dict) -> bool:
+        existing = self.get(entry["exam_id"], entry["exam_url_pattern"])
+        if existing:
+            self._unindex(existing)
+            existing.update(entry)
+            self._index(existing)
+            return False
+        
+        self.registry.setdefault("schemas", []).append(entry)
+        self.registry["updated"] = "2025-07-01"
+        self._index(entry)
+        return True
+    
+    def _apply_remove(self, exam_id: str) -> bool:
+        if exam_id not in self._by_exam_id:
+            return False
+        # Older registries can hold several entries for one exam, remove all of them
+        # and rebuild the indexes so entries they shadowed are found again
+        self.registry["schemas"] = [s for s in self.entries if s.get("exam_id") != exam_id]
+        self._load(self.registry)
+        return True
+    
+    def upsert(self, course_name: str, exam_url: str, schema_filename: str, listing_url: str = None) -> bool:
+        """
+        Add or update the entry for an exam
+        
+        Args:
+            course_name: Name of the course
+            exam_url: HubSpot exam URL
+            schema_filename: Path to schema file relative to extension directory
+            listing_url: Optional listing URL used by rescrapes
+            
+        Returns:
+            True if a new entry was added, False if an existing one was updated
+        """
+        entry = {
+            "name": course_name,
+            "exam_url_pattern": generate_url_pattern(exam_url),
+            "schema_file": schema_filename,
+            "exam_id": extract_exam_id_from_url(exam_url),
+            "listing_url": listing_url,
+            "course_name": course_name,
+            "exam_url": exam_url
+        }
+        with self._lock:
+            self._pending.append(('upsert', dict(entry)))
+            added = self._apply_upsert(entry)
+            self._flush_unless_batched()
+        return added
+    
+    def remove(self, exam_id: str) -> bool:
+        """
+        Remove the entry for an exam ID
+        
+        Returns:
+            True if an entry was removed
+        """
+        with self._lock:
+            self._pending.append(('remove', exam_id))
+            removed = self._apply_remove(exam_id)
+            self._flush_unless_batched()
+        return removed
+    
+    @contextmanager
+    def batch(self):
+        """Stage every update made inside the block and write them once at the end"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                self._flush_unless_batched()
+    
+    def _flush_unless_batched(self):
+        if self._batch_depth == 0 and self._pending:
+            self.flush()
+    
+    def flush(self):
+        """Write the staged updates on top of the current registry file"""
+        with self._lock, _registry_file_lock(self.path):
+            # Another process may have written since this registry was loaded
+            self._load(_read_registry_file(self.path))
+            for operation, argument in self._pending:
+                if operation == 'upsert':
+                    self._apply_upsert(dict(argument))
+                else:
+                    self._apply_remove(argument)
+            _write_registry_file(self.path, self.registry)
+            self._pending = []
+
 def add_schema_to_registry(course_name: str, exam_url: str, schema_filename: str, listing_url: str = None) -> bool:
     """
     Add a schema entry to the registry
@@ -64,61 +343,21 @@ def add_schema_to_registry(course_name: str, exam_url: str, schema_filename: str
     if not exam_url:
         print("Warning: No exam URL provided, schema will not be automatically loaded by extension")
         return False
-        
-    registry = load_registry()
     
     exam_id = extract_exam_id_from_url(exam_url)
-    url_pattern = generate_url_pattern(exam_url)
-    
-    # Check if entry already exists
-    for schema in registry["schemas"]:
-        if schema.get("exam_id") == exam_id or schema.get("exam_url_pattern") == url_pattern:
-            # Update existing entry
-            schema.update({
-                "name": course_name,
-                "exam_url_pattern": url_pattern,
-                "schema_file": schema_filename,
-                "exam_id": exam_id,
-                "listing_url": listing_url,
-                "course_name": course_name,
-                "exam_url": exam_url
-            })
-            print(f"Updated existing registry entry for exam ID: {exam_id}")
-            save_registry(registry)
-            return True
-    
-    # Add new entry
-    new_entry = {
-        "name": course_name,
-        "exam_url_pattern": url_pattern,
-        "schema_file": schema_filename,
-        "exam_id": exam_id,
-        "listing_url": listing_url,
-        "course_name": course_name,
-        "exam_url": exam_url
-    }
-    
-    registry["schemas"].append(new_entry)
-    registry["updated"] = "2025-07-01"
-    
-    save_registry(registry)
-    print(f"Added new registry entry for: {course_name} (exam ID: {exam_id})")
+    if SchemaRegistry().upsert(course_name, exam_url, schema_filename, listing_url):
+        print(f"Added new registry entry for: {course_name} (exam ID: {exam_id})")
+    else:
+        print(f"Updated existing registry entry for exam ID: {exam_id}")
     return True
 
 def list_registry_entries() -> List[Dict]:
     """List all registry entries"""
-    registry = load_registry()
-    return registry.get("schemas", [])
+    return SchemaRegistry().entries
 
 def remove_schema_from_registry(exam_id: str) -> bool:
     """Remove a schema from the registry by exam ID"""
-    registry = load_registry()
-    
-    original_count = len(registry["schemas"])
-    registry["schemas"] = [s for s in registry["schemas"] if s.get("exam_id") != exam_id]
-    
-    if len(registry["schemas"]) < original_count:
-        save_registry(registry)
+    if SchemaRegistry().remove(exam_id):
         print(f"Removed registry entry for exam ID: {exam_id}")
         return True
     else:
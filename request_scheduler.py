@@ -0,0 +1,115 @@
+"""
+Request scheduler used by the web scraper to stay polite towards remote hosts
+"""
+
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict
+from urllib.parse import urlparse
+
+from stage_timer import stage_timer
+
+logger = logging.getLogger(__name__)
+
+
+class RequestScheduler:
+    def __init__(self, delay: float = 1.0, burst: int = 1):
+        """
+        Thread-safe token bucket scheduler keyed by host
+
+        Each host gets a bucket that refills at one token per `delay` seconds.
+        A request only waits for whatever part of the delay has not already
+        elapsed since the previous request to that host went out.
+
+        Args:
+            delay: Minimum average number of seconds between requests to the same host
+            burst: Number of requests allowed back to back before throttling kicks in
+        """
+        self.delay = max(0.0, delay)
+        self.burst = max(1, burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'throttled_requests': 0,
+            'throttled_seconds': 0.0,
+            'fetch_seconds': 0.0
+        }
+
+    def acquire(self, url: str) -> float:
+        """
+        Block until a request to the host of the given URL is allowed
+
+        Args:
+            url: URL that is about to be requested
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        if self.delay <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc
+
+        # Take a token under the lock, sleep outside of it. A negative balance
+        # is a reservation for a future slot, which keeps concurrent workers
+        # correctly spaced without holding the lock while sleeping.
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) / self.delay)
+            tokens -= 1.0
+            self._buckets[host] = (tokens, now)
+
+        wait = -tokens * self.delay if tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+        with self._lock:
+            if wait > 0:
+                self._stats['throttled_requests'] += 1
+                self._stats['throttled_seconds'] += wait
+        if wait > 0:
+            stage_timer.record('throttle', wait)
+
+        return wait
+
+    @contextmanager
+    def request(self, url: str):
+        """
+        Context manager that throttles before a request and times the request itself
+
+        Args:
+            url: URL that is about to be requested
+        """
+        self.acquire(url)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self._stats['requests'] += 1
+                self._stats['fetch_seconds'] += elapsed
+
+    def get_stats(self) -> Dict:
+        """
+        Get a snapshot of the scheduler statistics
+
+        Returns:
+            Dictionary with request count and time spent throttled versus fetching
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def log_stats(self):
+        """Log a one line summary of time spent throttled versus fetching"""
+        stats = self.get_stats()
+        logger.info(
+            f"Scheduler: {stats['requests']} requests, "
+            f"{stats['fetch_seconds']:.2f}s fetching, "
+            f"{stats['throttled_seconds']:.2f}s throttled "
+            f"({stats['throttled_requests']} requests waited, delay={self.delay}s)"
+        )
@@ -0,0 +1,236 @@
+"""
+Persistent on-disk HTTP response cache with conditional revalidation support
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    def __init__(self, cache_dir: str = ".scrape_cache", ttl: float = 0, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Initialize the response cache
+
+        Args:
+            cache_dir: Directory holding cached bodies and their metadata
+            ttl: Seconds a cached response is served without contacting the server.
+                 Older entries are revalidated with a conditional GET, 0 always revalidates.
+            max_bytes: Maximum total size of cached bodies before the least
+                       recently used entries are evicted
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        self._stats = {
+            'cache_hits': 0,
+            'cache_revalidated': 0,
+            'cache_misses': 0,
+            'cache_evictions': 0
+        }
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        """Get the metadata and body paths for a URL"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached response
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            Metadata dictionary with the body under 'content', or None if not cached
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['content'] = f.read()
+        except (OSError, ValueError):
+            self._count('cache_misses')
+            return None
+
+        # Hash collisions are practically impossible, but never serve another URL
+        if entry.get('url') != url:
+            self._count('cache_misses')
+            return None
+
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Check whether a cached entry can be served without revalidation"""
+        return time.time() - entry.get('validated_at', 0) < self.ttl
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict:
+        """
+        Build If-None-Match / If-Modified-Since headers for a cached entry
+
+        Args:
+            entry: Cached entry returned by get()
+
+        Returns:
+            Request headers for a conditional GET
+        """
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, content: bytes, headers: Dict):
+        """
+        Store a response body together with its validators
+
+        Args:
+            url: Requested URL
+            content: Raw response body
+            headers: Response headers
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            previous_size = os.path.getsize(body_path)
+        except OSError:
+            previous_size = 0
+        entry = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'size': len(content),
+            'fetched_at': time.time(),
+            'validated_at': time.time()
+        }
+
+        try:
+            # Write the body before the metadata so a crash never leaves
+            # metadata pointing at a missing or partial body
+            self._write_file(body_path, content)
+            self._write_meta(meta_path, entry)
+        except OSError as e:
+            logger.warning(f"Failed to cache response for {url}: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += len(content) - previous_size
+            over_limit = self._total_bytes > self.max_bytes
+
+        if over_limit:
+            self._evict()
+
+    def _write_meta(self, meta_path: str, meta: Dict):
+        """Write entry metadata so readers never see a partial file"""
+        self._write_file(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _write_file(self, path: str, data: bytes):
+        """
+        Write a file through a temporary file of its own, renamed over the old one
+
+        Course workers share the cache, so two of them can store the same URL at
+        once. Each writes its own temporary file and the last rename wins whole.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def mark_hit(self):
+        """Record that a fresh cached entry was served"""
+        self._count('cache_hits')
+
+    def mark_miss(self):
+        """Record that a stale cached entry was replaced by a full response (HTTP 200)"""
+        self._count('cache_misses')
+
+    def mark_revalidated(self, entry: Dict):
+        """
+        Record that the server confirmed a cached entry is still current (HTTP 304)
+
+        Args:
+            entry: Cached entry returned by get()
+        """
+        self._count('cache_revalidated')
+        meta_path, _ = self._paths(entry['url'])
+        meta = {k: v for k, v in entry.items() if k != 'content'}
+        meta['validated_at'] = time.time()
+        try:
+            self._write_meta(meta_path, meta)
+        except OSError as e:
+            logger.warning(f"Failed to update cache entry for {entry['url']}: {e}")
+
+    def _scan(self):
+        """
+        Scan the cache directory
+
+        Returns:
+            Tuple of (list of (last validated mtime, body path, size), total size in bytes)
+        """
+        entries = []
+        total = 0
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.body'):
+                continue
+            body_path = os.path.join(self.cache_dir, filename)
+            try:
+                size = os.path.getsize(body_path)
+                mtime = os.path.getmtime(body_path[:-len('.body')] + '.json')
+            except OSError:
+                continue
+            total += size
+            entries.append((mtime, body_path, size))
+        return entries, total
+
+    def _evict(self):
+        """Remove least recently validated entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries, total = self._scan()
+
+            for _, body_path, size in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for path in (body_path[:-len('.body')] + '.json', body_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                self._stats['cache_evictions'] += 1
+
+            self._total_bytes = total
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict:
+        """
+        Get a snapshot of the cache statistics
+
+        Returns:
+            Dictionary with hit, revalidation, miss and eviction counts
+        """
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,138 @@
+"""
+Retry policy with exponential backoff, jitter and a per-scrape retry budget
+"""
+
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying, everything else is a permanent failure
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Status codes whose Retry-After header is honoured
+RETRY_AFTER_STATUS_CODES = {429, 503}
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 budget: int = 50):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_retries: Maximum number of retries for a single request
+            backoff_base: Base delay in seconds, doubled on every attempt
+            backoff_max: Upper bound for a single backoff or Retry-After delay
+            budget: Total number of retries allowed for the whole scrape
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._stats = {
+            'retries': 0,
+            'retry_budget_exhausted': 0
+        }
+
+    def is_retryable(self, response: Optional[requests.Response] = None,
+                     error: Optional[Exception] = None) -> bool:
+        """
+        Check whether a failed attempt is transient
+
+        Args:
+            response: Response of the attempt, if one was received
+            error: Exception raised by the attempt, if any
+
+        Returns:
+            True if the request may succeed when retried
+        """
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+
+    def acquire(self, attempt: int) -> bool:
+        """
+        Take a retry from the budget
+
+        Args:
+            attempt: Number of retries already made for this request
+
+        Returns:
+            True if another retry is allowed
+        """
+        if attempt >= self.max_retries:
+            return False
+
+        with self._lock:
+            if self._stats['retries'] >= self.budget:
+                self._stats['retry_budget_exhausted'] += 1
+                logger.warning(f"Retry budget of {self.budget} exhausted for this scrape")
+                return False
+            self._stats['retries'] += 1
+            return True
+
+    def get_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Get how long to wait before the next attempt
+
+        A Retry-After header on 429/503 responses wins, otherwise exponential
+        backoff with full jitter is used.
+
+        Args:
+            attempt: Number of retries already made for this request
+            response: Response of the failed attempt, if one was received
+
+        Returns:
+            Delay in seconds
+        """
+        if response is not None and response.status_code in RETRY_AFTER_STATUS_CODES:
+            retry_after = self.parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a Retry-After header
+
+        Args:
+            value: Header value, either delay seconds or an HTTP date
+
+        Returns:
+            Delay in seconds, or None if missing or invalid
+        """
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def get_stats(self) -> Dict:
+        """
+        Get a snapshot of the retry statistics
+
+        Returns:
+            Dictionary with retry and exhausted budget counts
+        """
+        with self._lock:
+            return dict(self._stats)
@@ -1,20 +1,48 @@
 import json
 import os
 import logging
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta
+
+from question_matcher import build_match_index
+from dedup import find_duplicate_clusters, normalize_answer, redundancy_report, split_clusters_by_answer
+from compact_schema import COMPACT_EXTENSION, CompactSchema, is_compact_schema, write_compact_schema
+from schema_manifest import SchemaManifest
+from question_store import QuestionStore
+from stage_timer import timed
 
 logger = logging.getLogger(__name__)
 
+# Answers recorded for pages that could not be fetched or parsed
+FAILED_ANSWERS = {"Failed to fetch page", "Error extracting answer"}
+
+def is_failed_answer(answer: Any) -> bool:
+    """Check whether an answer records a failed fetch, answers may also be lists of options"""
+    return isinstance(answer, str) and answer in FAILED_ANSWERS
+
+# Format of the scraped_date values written by the scraper
+SCRAPED_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
 class SchemaBuilder:
-    def __init__(self, output_dir: str = "schemas"):
+    def __init__(self, output_dir: str = "schemas", write_match_index: bool = True,
+                 storage_format: str = 'json', store: Optional[QuestionStore] = None):
         """
         Initialize schema builder
         
         Args:
             output_dir: Directory to save schema files
+            write_match_index: Write a precomputed match index next to every saved schema
+            storage_format: 'json' for pretty-printed JSON, 'compact' for the
+                            binary format with a header and offset table
+            store: Optional SQLite question store every saved schema is upserted
+                   into before its file is written
         """
+        if storage_format not in ('json', 'compact'):
+            raise ValueError(f"Unknown schema storage format: {storage_format}")
         self.output_dir = output_dir
+        self.write_match_index = write_match_index
+        self.storage_format = storage_format
+        self.store = store
         os.makedirs(output_dir, exist_ok=True)
     
     def clean_question_text(self, text: str) -> str:
@@ -70,17 +98,17 @@ class SchemaBuilder:
             return ''
         
     
-    def build_schema(self, course_data: Dict) -> Dict:
+    def build_schema_header(self, course_data: Dict) -> Dict:
         """
-        Build a structured schema from scraped course data
+        Build the schema metadata for a course, without any questions
         
         Args:
-            course_data: Raw scraped course data
+            course_data: Raw scraped course data, only the course fields are used
             
         Returns:
-            Structured schema dictionary
+            Schema dictionary with an empty question list
         """
-        schema = {
+        return {
             'schema_version': '1.0',
             'created_date': datetime.now().isoformat(),
             'course_info': {
@@ -91,37 +119,150 @@ class SchemaBuilder:
             },
             'questions': []
         }
+    
+    def build_question(self, qa: Dict, scraped_date: str = '') -> Optional[Dict]:
+        """
+        Build the schema entry for a single scraped Q&A
         
-        for qa in course_data.get('questions', []):
-            try:
-                question_text = self.clean_question_text(qa.get('question', ''))
-                answer_data = qa.get('answer_data', {})
-                answer_text = self.extract_correct_answer(answer_data.get('structured_content', ''))
-                
-                if not question_text or not answer_text:
-                    logger.warning(f"Skipping incomplete Q&A: {question_text[:50]}...")
-                    continue
-                # Handle both single and multiple answers
-                if isinstance(answer_text, list):
-                    processed_answer = answer_text  # Keep as array for multiple answers
-                else:
-                    processed_answer = answer_text.strip()  # Strip whitespace for single answers
+        Args:
+            qa: Complete Q&A dictionary from the scraper
+            scraped_date: Fallback date for records without their own scraped_date
+            
+        Returns:
+            Question schema dictionary, or None if the Q&A is incomplete or invalid
+        """
+        try:
+            question_text = self.clean_question_text(qa.get('question', ''))
+            answer_data = qa.get('answer_data', {})
+            answer_text = self.extract_correct_answer(answer_data.get('structured_content', ''))
+            
+            if not question_text or not answer_text:
+                logger.warning(f"Skipping incomplete Q&A: {question_text[:50]}...")
+                return None
+            # Handle both single and multiple answers
+            if isinstance(answer_text, list):
+                processed_answer = answer_text  # Keep as array for multiple answers
+            else:
+                processed_answer = answer_text.strip()  # Strip whitespace for single answers
 
-                question_schema = {
-                    'id': qa.get('id'),
-                    'question': question_text,
-                    'answer': processed_answer,
-                    'source_url': qa.get('answer_data', {}).get('url', qa.get('question_source_url', ''))  # Use individual page URL
-                }
-                
+            return {
+                'id': qa.get('id'),
+                'question': question_text,
+                'answer': processed_answer,
+                'source_url': qa.get('answer_data', {}).get('url', qa.get('question_source_url', '')),  # Use individual page URL
+                'scraped_date': qa.get('scraped_date', scraped_date)
+            }
+            
+        except Exception as e:
+            logger.error(f"Error processing question {qa.get('id', 'unknown')}: {e}")
+            return None
+    
+    @timed('build_schema')
+    def build_schema(self, course_data: Dict) -> Dict:
+        """
+        Build a structured schema from scraped course data
+        
+        Args:
+            course_data: Raw scraped course data
+            
+        Returns:
+            Structured schema dictionary
+        """
+        schema = self.build_schema_header(course_data)
+        
+        for qa in course_data.get('questions', []):
+            question_schema = self.build_question(qa, course_data.get('scraped_date', ''))
+            if question_schema:
                 schema['questions'].append(question_schema)
-                
-            except Exception as e:
-                logger.error(f"Error processing question {qa.get('id', 'unknown')}: {e}")
-                continue
         
         return schema
     
+    @staticmethod
+    def question_key(question: Dict) -> Tuple[str, str]:
+        """
+        Get the key identifying a schema question
+        
+        Text-only questions all point back to the listing page, so the question
+        text is part of the key alongside the source URL, like ScrapeCheckpoint.record_key().
+        """
+        return (question.get('source_url') or '', question.get('question') or '')
+    
+    def listing_question_key(self, question_data: Dict) -> Tuple[str, str]:
+        """Get the question_key() of the schema question a listing entry turns into"""
+        return (question_data.get('link') or '', self.clean_question_text(question_data.get('question', '')))
+    
+    def get_fresh_question_keys(self, schema: Dict, ttl_days: float) -> set:
+        """
+        Get the keys of questions that do not need to be scraped again
+        
+        Args:
+            schema: Existing schema dictionary
+            ttl_days: Age in days after which a question is considered stale
+            
+        Returns:
+            Set of question_key() tuples with a usable answer scraped within the TTL
+        """
+        cutoff = datetime.now() - timedelta(days=ttl_days)
+        course_date = schema.get('course_info', {}).get('scraped_date', '')
+        fresh = set()
+        
+        for question in schema.get('questions', []):
+            source_url = question.get('source_url')
+            if not source_url or is_failed_answer(question.get('answer')):
+                continue
+            
+            # Schemas written before per-question dates fall back to the course date
+            try:
+                scraped = datetime.strptime(question.get('scraped_date') or course_date, SCRAPED_DATE_FORMAT)
+            except ValueError:
+                continue
+            
+            if scraped >= cutoff:
+                fresh.add(self.question_key(question))
+        
+        return fresh
+    
+    def merge_incremental(self, existing: Dict, update: Dict) -> Dict:
+        """
+        Merge a partial rescrape into an existing schema
+        
+        Questions are matched on question_key(). Re-scraped questions replace the
+        stored ones but keep their id, new questions are appended with new ids,
+        and stored questions missing from the rescrape are kept.
+        
+        Args:
+            existing: Previously saved schema
+            update: Schema built from the questions that were re-scraped
+            
+        Returns:
+            Merged schema dictionary
+        """
+        merged = dict(update)
+        questions = [dict(q) for q in existing.get('questions', [])]
+        index_by_key = {self.question_key(q): i for i, q in enumerate(questions) if q.get('source_url')}
+        next_id = max((q.get('id') or 0 for q in questions), default=0) + 1
+        added = updated = 0
+        
+        for question in update.get('questions', []):
+            position = index_by_key.get(self.question_key(question))
+            if position is None:
+                question = dict(question, id=next_id)
+                next_id += 1
+                index_by_key[self.question_key(question)] = len(questions)
+                questions.append(question)
+                added += 1
+            elif is_failed_answer(question.get('answer')):
+                # Never replace a good stored answer with a failed fetch
+                continue
+            else:
+                questions[position] = dict(question, id=questions[position].get('id'))
+                updated += 1
+        
+        merged['questions'] = questions
+        merged['course_info'] = dict(update.get('course_info', {}), total_questions=len(questions))
+        logger.info(f"Incremental merge: {added} new, {updated} updated, {len(questions)} total questions")
+        return merged
+    
     def extract_keywords(self, text: str) -> List[str]:
         """
         Extract keywords from question text for better matching
@@ -155,40 +296,130 @@ class SchemaBuilder:
         # Return unique keywords, limited to top 10
         return list(set(keywords))[:10]
     
-    def save_schema(self, schema: Dict, filename: str = None) -> str:
+    def get_schema_filename(self, course_name: str) -> str:
         """
-        Save schema to JSON file
+        Build the default schema filename for a course
+        
+        Args:
+            course_name: Name of the course
+            
+        Returns:
+            Schema filename
+        """
+        # Clean filename
+        clean_name = ''.join(c for c in course_name if c.isalnum() or c in (' ', '_', '-')).strip()
+        clean_name = clean_name.replace(' ', '_').lower()
+        return f"{clean_name}_schema.json"
+    
+    def get_checkpoint_path(self, course_name: str) -> str:
+        """
+        Get the path of the scrape checkpoint stored next to a course schema
+        
+        Args:
+            course_name: Name of the course
+            
+        Returns:
+            Path to the JSONL checkpoint file
+        """
+        filename = self.get_schema_filename(course_name)
+        return os.path.join(self.output_dir, filename[:-len('.json')] + '.checkpoint.jsonl')
+    
+    def get_schema_path(self, course_name: str) -> str:
+        """
+        Get the path a course schema is saved to in the configured storage format
+        
+        Args:
+            course_name: Name of the course
+            
+        Returns:
+            Path to the schema file
+        """
+        filename = self.get_schema_filename(course_name)
+        if self.storage_format == 'compact':
+            filename = filename[:-len('.json')] + COMPACT_EXTENSION
+        return os.path.join(self.output_dir, filename)
+    
+    @timed('save_schema')
+    def save_schema(self, schema: Dict, filename: str = None, exam_url: str = None) -> str:
+        """
+        Save schema to a JSON or compact file, depending on the storage format
+        
+        With a question store the schema is stored in the database first and
+        the file is written as an export of it.
         
         Args:
             schema: Schema dictionary
             filename: Optional filename (auto-generated if not provided)
+            exam_url: Optional HubSpot exam URL recorded in the question store
             
         Returns:
             Path to saved file
         """
-        if not filename:
-            course_name = schema.get('course_info', {}).get('name', 'unknown_course')
-            # Clean filename
-            clean_name = ''.join(c for c in course_name if c.isalnum() or c in (' ', '_', '-')).strip()
-            clean_name = clean_name.replace(' ', '_').lower()
-            filename = f"{clean_name}_schema.json"
+        if filename:
+            filepath = os.path.join(self.output_dir, filename)
+        else:
+            filepath = self.get_schema_path(schema.get('course_info', {}).get('name', 'unknown_course'))
         
-        filepath = os.path.join(self.output_dir, filename)
+        self.store_schema(schema, filepath, exam_url)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(schema, f, indent=2, ensure_ascii=False)
+            if filepath.endswith(COMPACT_EXTENSION):
+                write_compact_schema(schema, filepath)
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(schema, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Schema saved to: {filepath}")
+            self.update_manifest(filepath, schema)
+            
+            if self.write_match_index:
+                self.save_match_index(schema, filepath)
+            
             return filepath
             
         except Exception as e:
             logger.error(f"Error saving schema to {filepath}: {e}")
             raise
     
+    def get_match_index_path(self, schema_path: str) -> str:
+        """
+        Get the path of the match index sidecar for a schema file
+        
+        Indexes live in an index/ subdirectory so schema listings never pick them up.
+        
+        Args:
+            schema_path: Path to the schema file
+            
+        Returns:
+            Path to the index file
+        """
+        directory, filename = os.path.split(schema_path)
+        return os.path.join(directory, 'index', os.path.splitext(filename)[0] + '.index.json')
+    
+    @timed('save_match_index')
+    def save_match_index(self, schema: Dict, schema_path: str) -> str:
+        """
+        Build and save the match index sidecar used by the extension for fast lookups
+        
+        Args:
+            schema: Schema dictionary
+            schema_path: Path the schema was saved to
+            
+        Returns:
+            Path to the saved index file
+        """
+        index_path = self.get_match_index_path(schema_path)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(build_match_index(schema), f, separators=(',', ':'))
+        
+        logger.info(f"Match index saved to: {index_path}")
+        return index_path
+    
     def load_schema(self, filepath: str) -> Dict:
         """
-        Load schema from JSON file
+        Load schema from a JSON or compact file
         
         Args:
             filepath: Path to schema file
@@ -197,19 +428,111 @@ class SchemaBuilder:
             Schema dictionary
         """
         try:
+            if is_compact_schema(filepath):
+                with CompactSchema(filepath) as compact:
+                    return compact.to_dict()
             with open(filepath, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
             logger.error(f"Error loading schema from {filepath}: {e}")
             raise
     
-    def merge_schemas(self, schema_files: List[str], output_filename: str = "merged_schema.json") -> str:
+    def load_schema_metadata(self, filepath: str) -> Dict:
+        """
+        Load the metadata shown by schema listings
+        
+        Compact schemas only have their header read, JSON schemas are parsed in full.
+        
+        Args:
+            filepath: Path to schema file
+            
+        Returns:
+            Dictionary with course name, question count and created date
+        """
+        if is_compact_schema(filepath):
+            with CompactSchema(filepath) as compact:
+                return self.get_schema_metadata(compact.metadata, compact.question_count)
+        
+        schema = self.load_schema(filepath)
+        return self.get_schema_metadata(schema, len(schema.get('questions', [])))
+    
+    @staticmethod
+    def get_schema_metadata(schema: Dict, question_count: int) -> Dict:
+        """Build the listing metadata of a schema"""
+        return {
+            'course_name': schema.get('course_info', {}).get('name', 'Unknown'),
+            'question_count': question_count,
+            'created_date': schema.get('created_date', 'Unknown')
+        }
+    
+    def store_schema(self, schema: Dict, filepath: str, exam_url: str = None):
+        """
+        Upsert a schema into the question store, if one is configured
+        
+        Args:
+            schema: Schema dictionary
+            filepath: Path of the schema file, which identifies the course in the store
+            exam_url: Optional HubSpot exam URL of the course
+        """
+        if self.store is not None:
+            self.store.upsert_schema(schema, filepath, exam_url)
+    
+    def update_manifest(self, filepath: str, schema: Dict):
+        """
+        Record a freshly written schema in its directory's metadata manifest
+        
+        Args:
+            filepath: Path the schema was written to
+            schema: Schema dictionary that was written
+        """
+        try:
+            SchemaManifest(os.path.dirname(filepath) or '.').update(
+                filepath, self.get_schema_metadata(schema, len(schema.get('questions', [])))
+            )
+        except OSError as e:
+            # The manifest is only a cache, listings re-read files it does not know
+            logger.warning(f"Could not update schema manifest for {filepath}: {e}")
+    
+    def convert_schema(self, filepath: str, storage_format: str) -> str:
+        """
+        Convert a schema file between the JSON and compact formats
+        
+        The converted file is written next to the original with the matching extension.
+        
+        Args:
+            filepath: Path to the schema file
+            storage_format: 'json' or 'compact'
+            
+        Returns:
+            Path to the converted file
+        """
+        schema = self.load_schema(filepath)
+        extension = COMPACT_EXTENSION if storage_format == 'compact' else '.json'
+        output_path = os.path.splitext(filepath)[0] + extension
+        if os.path.abspath(output_path) == os.path.abspath(filepath):
+            raise ValueError(f"{filepath} is already a {storage_format} schema")
+        
+        if storage_format == 'compact':
+            write_compact_schema(schema, output_path)
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(schema, f, indent=2, ensure_ascii=False)
+        
+        self.update_manifest(output_path, schema)
+        logger.info(f"Converted {filepath} to {output_path}")
+        return output_path
+    
+    def merge_schemas(self, schema_files: List[str], output_filename: str = "merged_schema.json",
+                      dedup_threshold: Optional[float] = None) -> str:
         """
         Merge multiple schema files into one
         
         Args:
             schema_files: List of schema file paths
             output_filename: Output filename for merged schema
+            dedup_threshold: When set, drop near-duplicate questions whose
+                             shingle similarity reaches this value and add a
+                             redundancy report to the merged schema
             
         Returns:
             Path to merged schema file
@@ -222,6 +545,7 @@ class SchemaBuilder:
             'total_questions': 0
         }
         
+        loaded_files = []
         for filepath in schema_files:
             try:
                 schema = self.load_schema(filepath)
@@ -231,15 +555,161 @@ class SchemaBuilder:
                 
                 merged_schema['courses'].append(course_info)
                 merged_schema['total_questions'] += len(schema.get('questions', []))
+                loaded_files.append(filepath)
                 
             except Exception as e:
                 logger.error(f"Error processing {filepath} for merge: {e}")
                 continue
         
+        if dedup_threshold is not None:
+            self.deduplicate_merged_schema(merged_schema, loaded_files, dedup_threshold)
+        
         output_path = os.path.join(self.output_dir, output_filename)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(merged_schema, f, indent=2, ensure_ascii=False)
+        self.update_manifest(output_path, merged_schema)
         
         logger.info(f"Merged schema saved to: {output_path}")
         return output_path
+    
+    def deduplicate_merged_schema(self, merged_schema: Dict, schema_files: List[str], threshold: float):
+        """
+        Remove near-duplicate questions across the courses of a merged schema
+        
+        Near-duplicate questions only replace each other when their answers
+        agree, so every distinct answer in a cluster is kept. Every group of
+        duplicates with the same answer keeps its first question, failed
+        fetches are dropped in favor of an answered duplicate.
+        
+        Args:
+            merged_schema: Merged schema, modified in place
+            schema_files: Schema file each course was loaded from
+            threshold: Minimum shingle similarity for a duplicate
+        """
+        corpus = [question for course in merged_schema['courses'] for question in course['questions']]
+        text_clusters = find_duplicate_clusters([question.get('question', '') for question in corpus], threshold)
+        answer_keys = [
+            None if is_failed_answer(question.get('answer')) else normalize_answer(question.get('answer'))
+            for question in corpus
+        ]
+        clusters = split_clusters_by_answer(text_clusters, answer_keys)
+        conflicting = sum(
+            1 for members in text_clusters
+            if len({answer_keys[p] for p in members if answer_keys[p] is not None}) > 1
+        )
+        
+        dropped = set()
+        for members in clusters:
+            answered = [p for p in members if answer_keys[p] is not None]
+            keep = answered[0] if answered else members[0]
+            dropped.update(p for p in members if p != keep)
+        kept = set(range(len(corpus))) - dropped
+        
+        report = redundancy_report(
+            [(filepath, len(course['questions'])) for filepath, course in zip(schema_files, merged_schema['courses'])],
+            clusters,
+            kept
+        )
+        
+        position = 0
+        for course in merged_schema['courses']:
+            questions = course['questions']
+            course['questions'] = [q for i, q in enumerate(questions, position) if i in kept]
+            position += len(questions)
+        
+        merged_schema['total_questions'] = len(kept)
+        merged_schema['deduplication'] = {
+            'threshold': threshold,
+            'questions_before': len(corpus),
+            'duplicates_removed': len(dropped),
+            'duplicate_clusters': len(clusters),
+            'conflicting_clusters': conflicting,
+            'redundant_files': [entry['schema_file'] for entry in report if entry['redundant']],
+            'files': report
+        }
+        
+        logger.info(f"Removed {len(dropped)} near-duplicate questions in {len(clusters)} clusters, "
+                    f"kept the differing answers of {conflicting} clusters")
+
+
+class StreamingSchemaWriter:
+    def __init__(self, filepath: str, header: Dict, format: str = 'json'):
+        """
+        Write a schema one question at a time instead of holding it in memory
+        
+        In 'json' mode the output is an ordinary schema file, written to a
+        temporary file and renamed into place on close so readers never see a
+        partial schema. In 'jsonl' mode the header is the first line and every
+        question is its own line, readable while the scrape is still running.
+        
+        Args:
+            filepath: Destination path
+            header: Schema metadata from SchemaBuilder.build_schema_header
+            format: 'json' or 'jsonl'
+        """
+        if format not in ('json', 'jsonl'):
+            raise ValueError(f"Unsupported streaming format: {format}")
+        
+        self.filepath = filepath
+        self.format = format
+        self.count = 0
+        self._tmp_path = filepath + '.tmp' if format == 'json' else filepath
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        
+        header = {k: v for k, v in header.items() if k != 'questions'}
+        if format == 'json':
+            # Re-open the object so questions can be appended as they arrive
+            self._file.write(json.dumps(header, indent=2, ensure_ascii=False)[:-2])
+            self._file.write(',\n  "questions": [')
+        else:
+            self._file.write(json.dumps(header, ensure_ascii=False) + '\n')
+        self._file.flush()
+    
+    def write(self, question: Dict):
+        """
+        Append a question to the schema
+        
+        Args:
+            question: Question schema dictionary
+        """
+        if self.format == 'json':
+            prefix = ',\n    ' if self.count else '\n    '
+            self._file.write(prefix + json.dumps(question, ensure_ascii=False))
+        else:
+            self._file.write(json.dumps(question, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.count += 1
+    
+    def close(self) -> str:
+        """
+        Finish the schema file
+        
+        Returns:
+            Path to the written file
+        """
+        if self.format == 'json':
+            self._file.write('\n  ]\n}' if self.count else ']\n}')
+        self._file.close()
+        
+        if self._tmp_path != self.filepath:
+            os.replace(self._tmp_path, self.filepath)
+        
+        logger.info(f"Streamed {self.count} questions to: {self.filepath}")
+        return self.filepath
+    
+    def abort(self):
+        """Discard a partially written JSON schema"""
+        self._file.close()
+        if self._tmp_path != self.filepath and os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,143 @@
+"""
+Cached metadata manifest for a schema directory
+Keeps the listing metadata of every schema keyed by filename, together with the file's
+mtime and size, so listings only parse schema files that changed since they were recorded
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, List
+
+from compact_schema import COMPACT_EXTENSION
+
+logger = logging.getLogger(__name__)
+
+# Dotfile so schema listings and the extension never mistake it for a schema
+MANIFEST_FILENAME = '.schema_manifest.json'
+MANIFEST_VERSION = 1
+
+# Course workers save schemas concurrently, manifest updates are read-modify-write
+_manifest_lock = threading.Lock()
+
+
+def is_schema_filename(filename: str) -> bool:
+    """Check whether a directory entry is a schema file, skipping dotfiles such as the manifest"""
+    return not filename.startswith('.') and filename.endswith(('.json', COMPACT_EXTENSION))
+
+
+class SchemaManifest:
+    def __init__(self, schema_dir: str):
+        """
+        Initialize the manifest of a schema directory
+
+        Args:
+            schema_dir: Directory containing schema files
+        """
+        self.schema_dir = schema_dir
+        self.path = os.path.join(schema_dir, MANIFEST_FILENAME)
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Load the manifest entries
+
+        Returns:
+            Dictionary of {'mtime_ns', 'size', 'metadata'} entries keyed by filename
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"Ignoring corrupt schema manifest {self.path}")
+            return {}
+
+        if manifest.get('manifest_version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('files', {})
+
+    def _save(self, entries: Dict[str, Dict]):
+        fd, temp_path = tempfile.mkstemp(dir=self.schema_dir, prefix='.', suffix='.manifest.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'manifest_version': MANIFEST_VERSION, 'files': entries}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _stat_entry(filepath: str, metadata: Dict) -> Dict:
+        stat = os.stat(filepath)
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'metadata': metadata}
+
+    def update(self, filepath: str, metadata: Dict):
+        """
+        Record the metadata of a schema file that was just written
+
+        Args:
+            filepath: Path to the schema file, inside this manifest's directory
+            metadata: Listing metadata of the schema
+        """
+        with _manifest_lock:
+            entries = self.load()
+            entries[os.path.basename(filepath)] = self._stat_entry(filepath, metadata)
+            self._save(entries)
+
+    def refresh(self, load_metadata: Callable[[str], Dict]) -> List[Dict]:
+        """
+        Get the metadata of every schema file, re-reading only changed files
+
+        Files whose mtime or size differ from the manifest are passed to
+        load_metadata, deleted files are dropped, and the manifest is only
+        rewritten when something changed.
+
+        Args:
+            load_metadata: Function reading the listing metadata of a schema file
+
+        Returns:
+            List of metadata dictionaries with 'filename', 'filepath' and 'file_size' added
+        """
+        with _manifest_lock:
+            entries = self.load()
+            refreshed = {}
+            changed = False
+
+            for filename in sorted(os.listdir(self.schema_dir)):
+                if not is_schema_filename(filename):
+                    continue
+
+                filepath = os.path.join(self.schema_dir, filename)
+                stat = os.stat(filepath)
+                entry = entries.get(filename)
+                if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                    refreshed[filename] = entry
+                    continue
+
+                try:
+                    refreshed[filename] = self._stat_entry(filepath, load_metadata(filepath))
+                except Exception as e:
+                    logger.error(f"Error reading schema file {filepath}: {e}")
+                    continue
+                changed = True
+
+            if changed or set(refreshed) != set(entries):
+                try:
+                    self._save(refreshed)
+                except OSError as e:
+                    # A read-only schema directory can still be listed
+                    logger.warning(f"Could not update schema manifest {self.path}: {e}")
+
+        schemas = []
+        for filename, entry in refreshed.items():
+            metadata = dict(entry['metadata'])
+            metadata.update({
+                'filename': filename,
+                'filepath': os.path.join(self.schema_dir, filename),
+                'file_size': entry['size']
+            })
+            schemas.append(metadata)
+        return schemas
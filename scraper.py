@@ -1,11 +1,25 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import time
+import zlib
+import base64
 import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 import trafilatura
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional
+
+from request_scheduler import RequestScheduler
+from response_cache import ResponseCache
+from retry_policy import RetryPolicy
+from http_session import ScraperSession
+from checkpoint import ScrapeCheckpoint
+from parsing import NO_PARSE_ONLY_BACKENDS, QUESTION_PAGE_STRAINER, make_soup, resolve_backend
+from stage_timer import stage, timed
+from memory_usage import PeakMemory
+from listing_extractor import STRATEGY_SELECTORS, find_content_area, select_question_elements
 
 
 # todo list
@@ -18,58 +32,191 @@ from typing import List, Dict, Optional
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Characters of page HTML kept with a scraped answer
+RAW_HTML_LIMIT = 10000
+
+
+def compress_raw_html(content: bytes, limit: int = RAW_HTML_LIMIT) -> str:
+    """
+    Keep the first `limit` characters of a downloaded page, zlib-compressed
+
+    Returns:
+        Base64 text, so the answer content stays JSON-serializable
+    """
+    # A UTF-8 character takes at most 4 bytes, the rest of the page is never decoded
+    html = content[:limit * 4].decode('utf-8', errors='replace')[:limit]
+    return base64.b64encode(zlib.compress(html.encode('utf-8'))).decode('ascii')
+
+
+def decompress_raw_html(data: str) -> str:
+    """Restore HTML stored by compress_raw_html"""
+    return zlib.decompress(base64.b64decode(data)).decode('utf-8')
+
+
 class WebScraper:
-    def __init__(self, base_url: str, delay: float = 1.0):
+    def __init__(self, base_url: str, delay: float = 1.0, concurrency: int = 1,
+                 scheduler: RequestScheduler = None, cache: ResponseCache = None,
+                 parser: str = 'html.parser', restricted_parse: bool = True,
+                 timeout: float = 30, retry_policy: RetryPolicy = None,
+                 session: requests.Session = None, low_memory: bool = False,
+                 keep_raw_html: bool = False):
         """
         Initialize the web scraper
         
         Args:
             base_url: Base URL for the website
-            delay: Delay between requests to be respectful
+            delay: Delay between requests to the same host to be respectful
+            concurrency: Number of answer pages fetched in parallel
+            scheduler: Optional request scheduler shared with other scrapers
+            cache: Optional on-disk response cache used for conditional revalidation
+            parser: HTML parser backend, 'auto' picks lxml when installed and html.parser otherwise
+            restricted_parse: Only build the <article> subtree of question pages
+            timeout: Request timeout in seconds
+            retry_policy: Optional retry policy for transient failures, no retries if omitted
+            session: Optional HTTP session, a ScraperSession with one pooled
+                     connection per worker is created if omitted
+            low_memory: Decompose every parse tree as soon as its data is
+                        extracted and leave raw HTML out of answer content
+            keep_raw_html: In low memory mode, still keep raw HTML with answer
+                           content, truncated, compressed and base64-encoded
+                           under 'raw_html_zlib' (see decompress_raw_html)
         """
         self.base_url = base_url
         self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.concurrency = max(1, concurrency)
+        self.scheduler = scheduler or RequestScheduler(delay)
+        self.cache = cache
+        self.parser = resolve_backend(parser)
+        self.restricted_parse = restricted_parse
+        if restricted_parse and self.parser in NO_PARSE_ONLY_BACKENDS:
+            logger.warning(f"{self.parser} ignores the restricted <article> parse, whole question pages are parsed")
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=0)
+        self.session = session or ScraperSession(pool_maxsize=max(10, self.concurrency))
+        self.low_memory = low_memory
+        self.keep_raw_html = keep_raw_html
+        self.peak_memory = PeakMemory()
     
-    def get_page_content(self, url: str) -> Optional[BeautifulSoup]:
+    def fetch_page(self, url: str) -> bytes:
         """
-        Fetch and parse HTML content from a URL
+        Download the raw body of a URL, going through the response cache if enabled
+        
+        Fresh cache entries are served without a request. Stale entries are
+        revalidated with a conditional GET and reused on a 304 response.
+        Connection errors, timeouts and 429/5xx responses are retried
+        according to the retry policy.
         
         Args:
             url: URL to fetch
             
         Returns:
-            BeautifulSoup object or None if failed
+            Raw response body
+            
+        Raises:
+            requests.RequestException: If the request fails
         """
-        try:
+        entry = self.cache.get(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            logger.info(f"Cache hit: {url}")
+            self.cache.mark_hit()
+            return entry['content']
+        
+        headers = self.cache.conditional_headers(entry) if self.cache else {}
+        
+        attempt = 0
+        while True:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            response = None
+            error = None
+            
+            # The scheduler only waits for whatever part of the per-host delay
+            # has not already elapsed since the last request went out
+            try:
+                with self.scheduler.request(url), stage('network'):
+                    response = self.session.get(url, timeout=self.timeout, headers=headers)
+            except requests.RequestException as e:
+                error = e
             
-            # Add delay to be respectful
-            time.sleep(self.delay)
+            if not self.retry_policy.is_retryable(response, error) or not self.retry_policy.acquire(attempt):
+                break
             
-            return BeautifulSoup(response.content, 'html.parser')
+            delay = self.retry_policy.get_delay(attempt, response)
+            reason = error or f"HTTP {response.status_code}"
+            logger.warning(f"Retrying {url} in {delay:.1f}s after {reason} "
+                           f"(attempt {attempt + 1}/{self.retry_policy.max_retries})")
+            with stage('retry_backoff'):
+                time.sleep(delay)
+            attempt += 1
+        
+        if error is not None:
+            raise error
+        
+        if response.status_code == 304 and entry:
+            self.cache.mark_revalidated(entry)
+            return entry['content']
+        
+        response.raise_for_status()
+        
+        if self.cache:
+            # A missing entry was already counted as a miss by get()
+            if entry:
+                self.cache.mark_miss()
+            self.cache.store(url, response.content, response.headers)
+        
+        return response.content
+    
+    @timed('get_page_content')
+    def get_page_content(self, url: str, parse_only: SoupStrainer = None) -> Optional[BeautifulSoup]:
+        """
+        Fetch and parse HTML content from a URL
+        
+        Args:
+            url: URL to fetch
+            parse_only: Optional strainer limiting the parse to matching subtrees
+            
+        Returns:
+            BeautifulSoup object or None if failed
+        """
+        try:
+            return make_soup(self.fetch_page(url), self.parser, parse_only)
         except requests.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
-    def get_website_text_content(self, url: str) -> str:
+    def get_stats(self) -> Dict:
+        """
+        Get request statistics for this scraper
+        
+        Returns:
+            Dictionary with request counts, time spent throttled versus fetching,
+            retry counters, connection reuse counters, response cache counters
+            and the peak RSS sampled while scraping
+        """
+        stats = self.scheduler.get_stats()
+        stats.update(self.retry_policy.get_stats())
+        if isinstance(self.session, ScraperSession):
+            stats.update(self.session.get_stats())
+        if self.cache:
+            stats.update(self.cache.get_stats())
+        stats['peak_rss_bytes'] = self.peak_memory.peak_bytes
+        return stats
+    
+    def get_website_text_content(self, url: str, content: bytes = None) -> str:
         """
         Extract main text content using trafilatura
         
         Args:
             url: URL to extract content from
+            content: Already downloaded page body, fetched through the session if omitted
             
         Returns:
             Extracted text content
         """
         try:
-            downloaded = trafilatura.fetch_url(url)
-            text = trafilatura.extract(downloaded)
+            if content is None:
+                content = self.fetch_page(url)
+            with stage('trafilatura'):
+                text = trafilatura.extract(content, url=url)
             return text or ""
         except Exception as e:
             logger.error(f"Error extracting text from {url}: {e}")
@@ -92,10 +239,7 @@ class WebScraper:
         questions = []
         
         # First, try to find the main content area
-        content_area = (soup.find('div', class_='entry-content') or 
-                       soup.find('main') or 
-                       soup.find('article') or 
-                       soup.find('div', {'id': 'content'}))
+        content_area = find_content_area(soup)
         
         if content_area:
             logger.info("Found main content area")
@@ -103,81 +247,17 @@ class WebScraper:
             logger.warning("No main content area found, using entire page")
             content_area = soup
         
-        # Look for questions in various formats
-        # First priority: list items with links to individual question pages
-        question_elements = []
+        # One walk over the content area sorts the candidates into buckets, in
+        # priority order: <li> elements linking to individual question pages,
+        # question-like text lines, then the question/heading/qa/faq selectors
+        strategy, question_elements = select_question_elements(content_area, listing_url)
         
-        # Look for <li> elements with <a> tags pointing to individual question pages
-        if content_area:
-            li_elements = content_area.find_all('li')
-            
-            # Find <li> elements that contain question links
-            for li in li_elements:
-                a_tag = li.find('a')
-                if (a_tag and 
-                    a_tag.get('href', '').startswith('https://www.gcertificationcourse.com/') and
-                    a_tag.get('href', '') != listing_url):  # Exclude self-referencing links
-                    question_elements.append(li)
-            
-            # If no question links found, fallback to text parsing
-            if not question_elements:
-                full_text = content_area.get_text()
-                lines = full_text.split('\n')
-                
-                for line in lines:
-                    line = line.strip()
-                    # Look for lines that are likely questions
-                    if (line and '?' in line and len(line) > 20 and len(line) < 500 and
-                        (line.startswith('What') or line.startswith('Which') or 
-                         line.startswith('How') or line.startswith('Why') or 
-                         line.startswith('True or false') or line.startswith('Fill in the blank') or
-                         line.startswith('Imagine') or line.startswith('When') or
-                         line.startswith('Where') or line.startswith('Who'))):
-                        
-                        # Create a pseudo-element for this question
-                        question_elements.append({
-                            'text': line,
-                            'is_text_question': True
-                        })
-        
-        if question_elements:
-            if any(hasattr(elem, 'find') for elem in question_elements):
-                logger.info(f"Found {len(question_elements)} question links with individual URLs")
-            else:
-                logger.info(f"Found {len(question_elements)} question list items")
-        else:
-            # Try other selectors
-            question_selectors = [
-                'div[class*="question"]',
-                'p:contains("?")',
-                'h1:contains("?")',
-                'h2:contains("?")',
-                'h3:contains("?")',
-                'h4:contains("?")',
-                'strong:contains("?")',
-                'div[class*="qa"]',
-                'div[class*="faq"]'
-            ]
-            
-            for selector in question_selectors:
-                try:
-                    if ':contains(' in selector and hasattr(content_area, 'find_all'):
-                        # Handle pseudo-selector manually
-                        tag = selector.split(':')[0]
-                        elements = content_area.find_all(tag)
-                        for elem in elements:
-                            if '?' in elem.get_text():
-                                question_elements.append(elem)
-                    elif hasattr(content_area, 'select'):
-                        elements = content_area.select(selector)
-                        question_elements.extend(elements)
-                    
-                    if question_elements:
-                        logger.info(f"Found {len(question_elements)} elements with selector: {selector}")
-                        break
-                except Exception as e:
-                    logger.error(f"Error with selector {selector}: {e}")
-                    continue
+        if strategy == 'question_links':
+            logger.info(f"Found {len(question_elements)} question links with individual URLs")
+        elif strategy == 'text_lines':
+            logger.info(f"Found {len(question_elements)} question list items")
+        elif strategy:
+            logger.info(f"Found {len(question_elements)} elements with selector: {STRATEGY_SELECTORS[strategy]}")
         
         # Process found questions - each <li> contains an <a> tag with the question and its URL
         for i, element in enumerate(question_elements):
@@ -219,6 +299,9 @@ class WebScraper:
                 logger.error(f"Error processing question element: {e}")
                 continue
         
+        if self.low_memory:
+            soup.decompose()
+        
         logger.info(f"Scraped {len(questions)} questions from listing page")
         return questions
     
@@ -233,12 +316,18 @@ class WebScraper:
         Returns:
             Dictionary with answer content
         """
-        soup = self.get_page_content(answer_url)
-        if not soup:
+        # Download the page once and share the raw bytes between the
+        # BeautifulSoup parse and the trafilatura extraction
+        try:
+            content = self.fetch_page(answer_url)
+        except requests.RequestException as e:
+            logger.error(f"Error fetching {answer_url}: {e}")
             return {'error': 'Failed to fetch page'}
         
+        soup = make_soup(content, self.parser)
+        
         # Extract text content using trafilatura for better readability
-        text_content = self.get_website_text_content(answer_url)
+        text_content = self.get_website_text_content(answer_url, content)
         
         # Find the main content area
         content_area = (soup.find('div', class_='entry-content') or 
@@ -323,21 +412,38 @@ class WebScraper:
                         'is_correct': bool(is_correct)
                     })
         
-        return {
+        answer_content = {
             'url': answer_url,
             'text_content': text_content,
             'structured_content': answer_text,
-            'options': options,
-            'raw_html': str(soup) if len(str(soup)) < 10000 else str(soup)[:10000] + "..."
+            'options': options
         }
+        
+        if not self.low_memory:
+            html = str(soup)
+            answer_content['raw_html'] = html if len(html) < RAW_HTML_LIMIT else html[:RAW_HTML_LIMIT] + "..."
+        else:
+            # The downloaded bytes are truncated directly, the tree is never serialized
+            if self.keep_raw_html:
+                answer_content['raw_html_zlib'] = compress_raw_html(content)
+            soup.decompose()
+        
+        return answer_content
     
-    def scrape_full_course(self, listing_url: str, course_name: str = None) -> Dict:
+    def scrape_full_course(self, listing_url: str, course_name: str = None,
+                           checkpoint: ScrapeCheckpoint = None,
+                           skip_question: Callable[[Dict], bool] = None) -> Dict:
         """
         Scrape a complete course with questions and answers
         
         Args:
             listing_url: URL of the course listing page
             course_name: Name of the course (optional)
+            checkpoint: Optional checkpoint, completed questions in it are not
+                        fetched again and new ones are appended as they finish
+            skip_question: Optional check of listing entries that are already known
+                           and should not be fetched, they are left out of the
+                           returned questions
             
         Returns:
             Complete course data dictionary
@@ -346,6 +452,7 @@ class WebScraper:
             course_name = urlparse(listing_url).netloc
         
         logger.info(f"Starting scrape for course: {course_name}")
+        self.peak_memory.reset()
         
         # Scrape questions from listing page
         questions = self.scrape_questions_listing(listing_url)
@@ -359,44 +466,155 @@ class WebScraper:
             'questions': []
         }
         
-        # Extract answers from individual question pages
-        for i, question_data in enumerate(questions, 1):
-            logger.info(f"Processing question {i}/{len(questions)}: {question_data['question'][:50]}...")
-            
-            # Get the individual question page
-            question_url = question_data['link']
-            question_soup = self.get_page_content(question_url)
+        course_data['questions'] = list(self.iter_question_records(questions, checkpoint, skip_question))
+        
+        logger.info(f"Completed scraping {len(questions)} questions for {course_name}")
+        self.log_stats()
+        return course_data
+    
+    def iter_question_records(self, questions: List[Dict], checkpoint: ScrapeCheckpoint = None,
+                              skip_question: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """
+        Fetch and extract the answer page of every listed question, one record at a time
+        
+        Records are yielded in listing order as soon as they are ready, so
+        callers can write or validate them while later pages are still being
+        fetched. At most a few pages per worker are held in memory.
+        
+        Args:
+            questions: Question dictionaries from scrape_questions_listing
+            checkpoint: Optional checkpoint, completed questions in it are not
+                        fetched again and new ones are appended as they finish
+            skip_question: Optional check of listing entries that are already known
+                           and should not be fetched, they are not yielded
             
-            if question_soup:
-                # Extract answer from the individual question page
-                answer_data = self._extract_answer_from_page(question_soup, question_data, question_url)
-            else:
-                logger.warning(f"Failed to fetch individual question page: {question_url}")
-                answer_data = {
-                    'url': question_url,
-                    'text_content': "Failed to fetch page",
-                    'structured_content': "Failed to fetch page",
-                    'options': [],
-                    'extraction_method': 'fetch_error'
-                }
+        Yields:
+            Complete Q&A dictionaries
+        """
+        # Questions already completed by an interrupted run are reused as-is,
+        # only renumbered to their position in the current listing
+        completed = checkpoint.load() if checkpoint else {}
+        work = []
+        skipped = 0
+        resumed = 0
+        for i, question_data in enumerate(questions, 1):
+            if skip_question and skip_question(question_data):
+                skipped += 1
+                continue
+            record = completed.get((question_data['link'], question_data['question']))
+            if record:
+                resumed += 1
+            work.append((i, dict(record, id=i) if record else None))
+        
+        if skipped:
+            logger.info(f"Skipping {skipped} questions that are already up to date")
+        if resumed:
+            logger.info(f"Resuming from checkpoint: skipping {resumed} completed questions")
+        
+        def scrape_pending(index: int) -> Dict:
+            record = self._scrape_question(index, questions[index - 1], len(questions))
+            # Failed fetches are left out of the checkpoint so a resume retries them
+            if checkpoint and record['answer_data'].get('extraction_method') != 'fetch_error':
+                checkpoint.append(record)
+            return record
+        
+        if self.concurrency <= 1 or len(work) - resumed <= 1:
+            for index, record in work:
+                yield record or scrape_pending(index)
+            return
+        
+        # Pages are fetched by a bounded worker pool with a bounded look-ahead
+        # window, but yielded in listing order so question ids stay stable
+        logger.info(f"Fetching answer pages with {self.concurrency} workers")
+        window = deque()
+        work = iter(work)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                while len(window) < self.concurrency * 2:
+                    item = next(work, None)
+                    if item is None:
+                        break
+                    index, record = item
+                    window.append(record if record else executor.submit(scrape_pending, index))
+                
+                if not window:
+                    break
+                
+                head = window.popleft()
+                yield head.result() if isinstance(head, Future) else head
+    
+    def log_stats(self):
+        """Log request, connection, retry, cache and peak memory statistics for this scraper"""
+        self.scheduler.log_stats()
+        if isinstance(self.session, ScraperSession):
+            connection_stats = self.session.get_stats()
+            logger.info(
+                f"Connections: {connection_stats['connections_opened']} opened, "
+                f"{connection_stats['connections_reused']} reused, "
+                f"{connection_stats['bytes_downloaded']} bytes downloaded"
+            )
+        retry_stats = self.retry_policy.get_stats()
+        if retry_stats['retries']:
+            logger.info(f"Retries: {retry_stats['retries']} "
+                        f"(budget exhausted {retry_stats['retry_budget_exhausted']} times)")
+        if self.cache:
+            cache_stats = self.cache.get_stats()
+            logger.info(
+                f"Cache: {cache_stats['cache_hits']} hits, "
+                f"{cache_stats['cache_revalidated']} revalidated (304), "
+                f"{cache_stats['cache_misses']} misses"
+            )
+        logger.info(f"Peak memory: {self.peak_memory.peak_mb:.1f} MB RSS "
+                    f"(+{self.peak_memory.growth_mb:.1f} MB during the scrape"
+                    f"{', low memory mode' if self.low_memory else ''})")
+    
+    def _scrape_question(self, index: int, question_data: Dict, total: int) -> Dict:
+        """
+        Fetch a single question page and combine it with its listing data
+        
+        Args:
+            index: 1-based position of the question in the listing
+            question_data: Question data from the listing page
+            total: Total number of questions in the listing
             
-            # Combine question and answer data
-            complete_qa = {
-                'id': i,
-                'question': question_data['question'],
-                'question_source_url': question_data['link'],
-                'answer_data': answer_data,
-                'scraped_from_listing': question_data['scraped_from']
+        Returns:
+            Complete Q&A dictionary
+        """
+        logger.info(f"Processing question {index}/{total}: {question_data['question'][:50]}...")
+        
+        # Get the individual question page
+        question_url = question_data['link']
+        # Answers only live inside <article>, so skip building the rest of the page
+        parse_only = QUESTION_PAGE_STRAINER if self.restricted_parse else None
+        question_soup = self.get_page_content(question_url, parse_only)
+        
+        if question_soup:
+            # Extract answer from the individual question page
+            answer_data = self._extract_answer_from_page(question_soup, question_data, question_url)
+            self.peak_memory.sample()
+            if self.low_memory:
+                question_soup.decompose()
+        else:
+            logger.warning(f"Failed to fetch individual question page: {question_url}")
+            answer_data = {
+                'url': question_url,
+                'text_content': "Failed to fetch page",
+                'structured_content': "Failed to fetch page",
+                'options': [],
+                'extraction_method': 'fetch_error'
             }
-            
-            course_data['questions'].append(complete_qa)
-            
-            # Add delay between requests to be respectful
-            time.sleep(self.delay)
         
-        logger.info(f"Completed scraping {len(questions)} questions for {course_name}")
-        return course_data
+        # Combine question and answer data
+        return {
+            'id': index,
+            'question': question_data['question'],
+            'question_source_url': question_data['link'],
+            'answer_data': answer_data,
+            'scraped_from_listing': question_data['scraped_from'],
+            'scraped_date': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
     
+    @timed('extract_answer')
     def _extract_answer_from_page(self, soup, question_data: Dict, url: str) -> Dict:
         """
         Extract answer for a specific question from the page soup
@@ -0,0 +1,412 @@
+"""
+Sitemap-driven discovery of course listings and answer pages
+Streams the site's sitemap indexes into a local URL catalog with lastmod timestamps, so
+rescrapes can skip unchanged pages and new courses show up without guessing their URLs
+"""
+
+import io
+import os
+import re
+import gzip
+import json
+import logging
+import tempfile
+import threading
+from datetime import datetime, timedelta, time as day_time
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import ParseError, iterparse
+
+import requests
+
+from schema_builder import SCRAPED_DATE_FORMAT, is_failed_answer
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 1
+
+# Tried in order when robots.txt does not list any sitemap
+# (Yoast / Rank Math, generic, WordPress core)
+DEFAULT_SITEMAP_PATHS = ('/sitemap_index.xml', '/sitemap.xml', '/wp-sitemap.xml')
+
+# Course listing pages on gcertificationcourse.com, e.g. /hubspot-growth-driven-design-answers/
+DEFAULT_LISTING_PATTERN = r'-answers/?$'
+
+# Sitemap elements, some sites leave out the namespace declaration
+SITEMAP_NAMESPACES = ('http://www.sitemaps.org/schemas/sitemap/0.9', '')
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _split_tag(tag: str) -> Tuple[str, str]:
+    """Split an ElementTree tag into its XML namespace, empty if none, and local name"""
+    if tag.startswith('{'):
+        namespace, name = tag[1:].split('}', 1)
+        return namespace, name
+    return '', tag
+
+
+def iter_sitemap(content: bytes) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Stream the entries of a sitemap or sitemap index
+
+    Elements are cleared as soon as they are read, so memory stays flat no
+    matter how many URLs the sitemap lists. Gzipped sitemaps are inflated
+    on the fly.
+
+    Args:
+        content: Raw sitemap body
+
+    Yields:
+        Tuples of ('sitemap' or 'url', loc, lastmod or None)
+    """
+    stream = io.BytesIO(content)
+    if content[:2] == b'\x1f\x8b':
+        stream = gzip.GzipFile(fileobj=stream)
+
+    root = None
+    depth = 0
+    loc = lastmod = None
+    for event, element in iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if root is None:
+                root = element
+            continue
+        depth -= 1
+
+        namespace, name = _split_tag(element.tag)
+        # Only the sitemaps.org children of an entry count, extensions such as
+        # <image:loc> inside an <image:image> use the same local names
+        if namespace not in SITEMAP_NAMESPACES:
+            continue
+        if depth == 2 and name == 'loc':
+            loc = (element.text or '').strip()
+        elif depth == 2 and name == 'lastmod':
+            lastmod = (element.text or '').strip() or None
+        elif depth == 1 and name in ('url', 'sitemap'):
+            if loc:
+                yield name, loc, lastmod
+            loc = lastmod = None
+            # Drop the finished entry from the root too, or the emptied elements pile up
+            root.clear()
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a W3C datetime lastmod as naive local time, comparable to scraped dates
+
+    A date without a time counts as the end of that day, so a page changed
+    later on the day it was scraped is not mistaken for unchanged.
+
+    Returns:
+        Local datetime, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        if len(value) == 10:
+            return datetime.combine(datetime.strptime(value, '%Y-%m-%d').date(), day_time.max)
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def slug_words(url: str) -> set:
+    """Words of the last path segment of a URL, without the trailing 'answers'"""
+    slug = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1].lower()
+    return set(_WORD_RE.findall(slug)) - {'answers'}
+
+
+def course_name_from_listing_url(url: str) -> str:
+    """Readable course name for a discovered listing page, e.g. 'Hubspot Growth Driven Design'"""
+    slug = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+    slug = re.sub(r'-answers$', '', slug)
+    return ' '.join(word.capitalize() for word in slug.split('-') if word)
+
+
+class UrlCatalog:
+    def __init__(self, path: str = 'url_catalog.json', listing_pattern: str = DEFAULT_LISTING_PATTERN):
+        """
+        Local catalog of the URLs listed in a site's sitemaps
+
+        Args:
+            path: JSON file holding the catalog
+            listing_pattern: Regular expression matching course listing URLs
+        """
+        self.path = path
+        self.listing_re = re.compile(listing_pattern)
+        self._lock = threading.Lock()
+        self.sitemaps, self.urls = self._load()
+
+    def _load(self) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                catalog = json.load(f)
+        except FileNotFoundError:
+            return {}, {}
+        except ValueError:
+            logger.warning(f"Ignoring corrupt URL catalog {self.path}")
+            return {}, {}
+
+        if catalog.get('catalog_version') != CATALOG_VERSION:
+            return {}, {}
+        return catalog.get('sitemaps', {}), catalog.get('urls', {})
+
+    def save(self):
+        """Write the catalog atomically"""
+        with self._lock:
+            data = {
+                'catalog_version': CATALOG_VERSION,
+                'updated': datetime.now().isoformat(),
+                'sitemaps': self.sitemaps,
+                'urls': self.urls
+            }
+            directory = os.path.dirname(self.path) or '.'
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.catalog.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+
+    def is_listing_url(self, url: str) -> bool:
+        return bool(self.listing_re.search(urlparse(url).path))
+
+    def sitemap_unchanged(self, loc: str, lastmod: Optional[str]) -> bool:
+        """Check whether a child sitemap was already read at this lastmod"""
+        entry = self.sitemaps.get(loc)
+        return bool(lastmod and entry and entry.get('lastmod') == lastmod)
+
+    def record_sitemap(self, loc: str, lastmod: Optional[str]):
+        """Record a fully read sitemap, its URLs are current as of now"""
+        with self._lock:
+            self.sitemaps[loc] = {'lastmod': lastmod, 'checked_at': datetime.now().strftime(SCRAPED_DATE_FORMAT)}
+
+    def confirm_sitemap(self, loc: str):
+        """Record that a child sitemap skipped as unchanged is still current"""
+        with self._lock:
+            self.sitemaps[loc]['checked_at'] = datetime.now().strftime(SCRAPED_DATE_FORMAT)
+
+    def record_url(self, loc: str, lastmod: Optional[str], sitemap: str) -> str:
+        """
+        Add or update a URL from a sitemap
+
+        Returns:
+            'new', 'changed' or 'unchanged'
+        """
+        with self._lock:
+            entry = self.urls.get(loc)
+            if entry is None:
+                self.urls[loc] = {
+                    'lastmod': lastmod,
+                    'sitemap': sitemap,
+                    'listing': self.is_listing_url(loc),
+                    'first_seen': datetime.now().strftime(SCRAPED_DATE_FORMAT)
+                }
+                return 'new'
+            unchanged = entry.get('lastmod') == lastmod
+            entry.update(lastmod=lastmod, sitemap=sitemap)
+            return 'unchanged' if unchanged else 'changed'
+
+    def listing_urls(self) -> List[str]:
+        """All cataloged course listing URLs"""
+        return sorted(url for url, entry in self.urls.items() if entry.get('listing'))
+
+    def lastmod(self, url: str) -> Optional[datetime]:
+        entry = self.urls.get(url)
+        return parse_lastmod(entry.get('lastmod')) if entry else None
+
+    def checked_at(self, url: str) -> Optional[datetime]:
+        """When the sitemap listing a URL was last read or confirmed unchanged"""
+        entry = self.urls.get(url)
+        sitemap = self.sitemaps.get(entry.get('sitemap')) if entry else None
+        try:
+            return datetime.strptime(sitemap['checked_at'], SCRAPED_DATE_FORMAT)
+        except (TypeError, KeyError, ValueError):
+            return None
+
+    def unchanged_since(self, url: str, scraped_date: str, max_age_days: float) -> bool:
+        """
+        Check whether a page has not been modified since it was scraped
+
+        The catalog only vouches for a page when the sitemap listing it was read
+        after the scrape and no more than max_age_days ago, an older catalog can
+        miss later modifications.
+
+        Args:
+            url: Page URL
+            scraped_date: When the page was scraped, in the schema date format
+            max_age_days: Maximum age of the sitemap read
+
+        Returns:
+            True only if the catalog knows the page's lastmod and it is not newer
+        """
+        lastmod = self.lastmod(url)
+        checked_at = self.checked_at(url)
+        if lastmod is None or checked_at is None:
+            return False
+        try:
+            scraped_at = datetime.strptime(scraped_date, SCRAPED_DATE_FORMAT)
+        except (TypeError, ValueError):
+            return False
+        return (lastmod <= scraped_at <= checked_at
+                and datetime.now() - checked_at <= timedelta(days=max_age_days))
+
+    def unchanged_question_urls(self, schema: Dict, max_age_days: float) -> set:
+        """
+        Source URLs of a schema's answered questions whose pages did not change since they were scraped
+
+        Args:
+            schema: Existing schema dictionary
+            max_age_days: Maximum age of the sitemap reads vouching for the pages
+
+        Returns:
+            Set of source URLs that can be skipped by a rescrape
+        """
+        course_date = schema.get('course_info', {}).get('scraped_date', '')
+        return {
+            question['source_url']
+            for question in schema.get('questions', [])
+            if question.get('source_url') and not is_failed_answer(question.get('answer'))
+            and self.unchanged_since(question['source_url'], question.get('scraped_date') or course_date,
+                                     max_age_days)
+        }
+
+    def course_unchanged(self, listing_url: str, schema: Dict, max_age_days: float) -> bool:
+        """Check whether neither a course's listing page nor any of its question pages changed since its scrape"""
+        course_date = schema.get('course_info', {}).get('scraped_date', '')
+        if not self.unchanged_since(listing_url, course_date, max_age_days):
+            return False
+        sources = {question.get('source_url') for question in schema.get('questions', [])}
+        return sources <= self.unchanged_question_urls(schema, max_age_days)
+
+    def find_listing_url(self, course_name: str, min_score: float = 0.6) -> Optional[str]:
+        """
+        Find the cataloged listing page of a course by name
+
+        Args:
+            course_name: Course name, e.g. from the schema registry
+            min_score: Minimum word overlap between name and URL slug
+
+        Returns:
+            Best matching listing URL, or None
+        """
+        name_words = set(_WORD_RE.findall(course_name.lower()))
+        best_url, best_score = None, 0.0
+        for url in self.listing_urls():
+            words = slug_words(url)
+            if not words or not name_words:
+                continue
+            score = len(words & name_words) / len(words | name_words)
+            if score > best_score:
+                best_url, best_score = url, score
+        return best_url if best_score >= min_score else None
+
+
+class SitemapDiscovery:
+    def __init__(self, scraper, catalog: UrlCatalog):
+        """
+        Crawl a site's sitemaps into a URL catalog
+
+        Args:
+            scraper: WebScraper whose fetch_page is used, so sitemaps go through
+                     the same scheduler, cache, retries and fixtures as pages
+            catalog: URL catalog to update
+        """
+        self.scraper = scraper
+        self.catalog = catalog
+        self.stats = {'sitemaps_read': 0, 'sitemaps_unchanged': 0, 'new': 0, 'changed': 0, 'unchanged': 0}
+        self.new_urls = []
+
+    def find_sitemaps(self, site_url: str) -> List[str]:
+        """Sitemaps announced in the site's robots.txt"""
+        try:
+            robots = self.scraper.fetch_page(urljoin(site_url, '/robots.txt')).decode('utf-8', errors='replace')
+        except requests.RequestException as e:
+            logger.info(f"No robots.txt for {site_url}: {e}")
+            return []
+        return [line.split(':', 1)[1].strip() for line in robots.splitlines()
+                if line.lower().startswith('sitemap:')]
+
+    def discover(self, site_url: str, sitemap_urls: List[str] = None) -> Dict:
+        """
+        Read every sitemap reachable from the site's sitemap indexes
+
+        Starts from the given sitemaps, the ones in robots.txt, or else the
+        first common default location that exists. Child sitemaps listed with
+        the same lastmod as on the previous run are not fetched again, and
+        only sitemaps on the site's own host are followed.
+
+        Args:
+            site_url: Root URL of the site
+            sitemap_urls: Sitemaps to start from, found through robots.txt if omitted
+
+        Returns:
+            Statistics with sitemaps read and skipped, and new, changed and unchanged URLs
+        """
+        host = urlparse(site_url).netloc
+        seen = set()
+        roots = sitemap_urls or self.find_sitemaps(site_url)
+
+        if roots:
+            for root in roots:
+                self._crawl(root, host, seen)
+        else:
+            for path in DEFAULT_SITEMAP_PATHS:
+                if self._crawl(urljoin(site_url, path), host, seen):
+                    break
+
+        logger.info(f"Sitemap discovery for {site_url}: {self.stats['sitemaps_read']} sitemaps read, "
+                    f"{self.stats['sitemaps_unchanged']} unchanged, {self.stats['new']} new URLs, "
+                    f"{self.stats['changed']} changed, {self.stats['unchanged']} unchanged")
+        return dict(self.stats)
+
+    def _crawl(self, root: str, host: str, seen: set) -> bool:
+        """Read a sitemap and the child sitemaps it leads to, returns whether the root could be read"""
+        pending = [(root, None)]
+        root_read = False
+
+        while pending:
+            sitemap_url, lastmod = pending.pop(0)
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+
+            logger.info(f"Reading sitemap: {sitemap_url}")
+            try:
+                content = self.scraper.fetch_page(sitemap_url)
+                for kind, loc, entry_lastmod in iter_sitemap(content):
+                    if kind == 'sitemap':
+                        if urlparse(loc).netloc != host:
+                            continue
+                        if self.catalog.sitemap_unchanged(loc, entry_lastmod):
+                            self.catalog.confirm_sitemap(loc)
+                            self.stats['sitemaps_unchanged'] += 1
+                            continue
+                        pending.append((loc, entry_lastmod))
+                    else:
+                        status = self.catalog.record_url(loc, entry_lastmod, sitemap_url)
+                        self.stats[status] += 1
+                        if status == 'new':
+                            self.new_urls.append(loc)
+            except (requests.RequestException, ParseError, OSError, EOFError) as e:
+                # URLs read before the error are kept, the sitemap is read again next run
+                logger.warning(f"Could not read sitemap {sitemap_url}: {e}")
+                continue
+
+            # Only recorded once fully read, so a failed sitemap is never skipped as unchanged
+            self.catalog.record_sitemap(sitemap_url, lastmod)
+            self.stats['sitemaps_read'] += 1
+            root_read = root_read or sitemap_url == root
+
+        return root_read
+
+    def new_listing_urls(self) -> List[str]:
+        """Course listing URLs first seen by this discovery run"""
+        return [url for url in self.new_urls if self.catalog.is_listing_url(url)]
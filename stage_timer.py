@@ -0,0 +1,102 @@
+"""
+Per-stage timing for the scrape hot path
+Records how often each stage ran and how long it took, so a slow scrape can be
+broken down into network, throttling, parsing, extraction and writing time
+"""
+
+import time
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    def __init__(self):
+        """Thread-safe duration and call counters per named stage"""
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def record(self, name: str, seconds: float, cpu_seconds: float = 0.0):
+        """
+        Add one run of a stage
+
+        Args:
+            name: Stage name
+            seconds: Duration of the run
+            cpu_seconds: CPU time the running thread spent in the stage
+        """
+        with self._lock:
+            count, total, longest, cpu = self._stages.get(name, (0, 0.0, 0.0, 0.0))
+            self._stages[name] = (count + 1, total + seconds, max(longest, seconds), cpu + cpu_seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager timing the enclosed block as one run of a stage"""
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, time.thread_time() - cpu_start)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of a function as one run of a stage"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Get a snapshot of the stage timings
+
+        Returns:
+            Dictionary keyed by stage with 'count', 'total_seconds', 'max_seconds' and 'cpu_seconds'
+        """
+        with self._lock:
+            return {
+                name: {'count': count, 'total_seconds': total, 'max_seconds': longest, 'cpu_seconds': cpu}
+                for name, (count, total, longest, cpu) in self._stages.items()
+            }
+
+    def reset(self):
+        """Forget every recorded stage"""
+        with self._lock:
+            self._stages = {}
+
+    def format_summary(self) -> str:
+        """
+        Format the stage timings as a table, slowest stage first
+
+        Stages nest (get_page_content includes network and parse) and worker
+        threads add up, so totals can exceed the wall clock time.
+
+        Returns:
+            Table text, empty if nothing was recorded
+        """
+        stats = self.get_stats()
+        if not stats:
+            return ''
+
+        lines = [
+            f"{'stage':<20}{'count':>8}{'total s':>11}{'cpu s':>9}{'mean ms':>11}{'max ms':>11}",
+            '-' * 70
+        ]
+        for name, stage in sorted(stats.items(), key=lambda item: item[1]['total_seconds'], reverse=True):
+            mean = stage['total_seconds'] / stage['count'] * 1000
+            lines.append(f"{name:<20}{stage['count']:>8}{stage['total_seconds']:>11.2f}{stage['cpu_seconds']:>9.2f}"
+                         f"{mean:>11.1f}{stage['max_seconds'] * 1000:>11.1f}")
+        return '\n'.join(lines)
+
+
+# Process-wide timer used by the instrumented stages
+stage_timer = StageTimer()
+stage = stage_timer.stage
+timed = stage_timer.timed
@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 
 import sys
+import argparse
 sys.path.append('.')
 
 from scraper import WebScraper
+from http_session import ScraperSession
+from http_fixtures import add_fixture_arguments
+
+# Record the pages once, then replay them offline and without request delays
+parser = argparse.ArgumentParser(description='Check answer extraction for a single question page')
+add_fixture_arguments(parser)
+args = parser.parse_args()
 
 # Test a single question to verify the answer extraction
-scraper = WebScraper("https://www.gcertificationcourse.com", delay=0.5)
+scraper = WebScraper("https://www.gcertificationcourse.com", delay=0 if args.replay else 0.5,
+                     session=ScraperSession(record_dir=args.record, replay_dir=args.replay,
+                                             replay_latency=args.replay_latency or 0.0))
 
 # Test the specific question from the user's example
 test_url = "https://www.gcertificationcourse.com/which-of-the-following-is-not-a-good-way-to-speed-up-the-process/"
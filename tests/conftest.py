@@ -0,0 +1,83 @@
+"""
+Local stand-in for the answer site, shared by the scrape tests
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class LocalSite:
+    def __init__(self, base_url: str):
+        """
+        Pages served by a local HTTP server, with every request recorded
+
+        Values of `pages` are response bodies, or callables taking the request
+        headers and returning (status, headers, body).
+        """
+        self.base_url = base_url
+        self.pages = {}
+        self.delays = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def add_course(self, count: int, slug: str = 'course') -> str:
+        """Serve a listing page linking `count` answer pages, returns the listing URL"""
+        links = ''.join(f'<li><a href="{self.url(f"/{slug}-question-{i}/")}">Which answer is number {i}?</a></li>'
+                        for i in range(1, count + 1))
+        self.pages[f'/{slug}-answers/'] = f'<html><div class="entry-content"><ul>{links}</ul></div></html>'.encode()
+        for i in range(1, count + 1):
+            self.pages[f'/{slug}-question-{i}/'] = (f'<html><article><h1>Which answer is number {i}?</h1><ul>'
+                                                     f'<li>Wrong</li><li><strong>Answer {i}</strong></li>'
+                                                     f'</ul></article></html>').encode()
+        return self.url(f'/{slug}-answers/')
+
+    def fetched(self, path: str) -> int:
+        """Number of requests made for a path"""
+        with self._lock:
+            return sum(1 for requested, _ in self.requests if requested == path)
+
+    def _record(self, path: str, headers):
+        with self._lock:
+            self.requests.append((path, dict(headers)))
+
+
+@pytest.fixture
+def site():
+    local_site = None
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            local_site._record(self.path, self.headers)
+            time.sleep(local_site.delays.get(self.path, 0))
+            page = local_site.pages.get(self.path)
+            if callable(page):
+                status, headers, body = page(self.headers)
+            elif page is None:
+                status, headers, body = 404, {}, b''
+            else:
+                status, headers, body = 200, {}, page
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    local_site = LocalSite(f"http://127.0.0.1:{server.server_port}")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield local_site
+    server.shutdown()
+    server.server_close()
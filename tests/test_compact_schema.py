@@ -0,0 +1,25 @@
+"""
+Compact .qsc schemas hold the same questions and answers as the JSON schema
+"""
+
+import json
+
+from compact_schema import CompactSchema, is_compact_schema, write_compact_schema
+
+SCHEMA = 'extension/schemas/inbound_schema.json'
+
+
+def test_compact_schema_round_trip(tmp_path):
+    with open(SCHEMA, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    path = str(tmp_path / 'inbound_schema.qsc')
+
+    write_compact_schema(schema, path)
+
+    assert is_compact_schema(path)
+    with CompactSchema(path) as compact:
+        assert len(compact) == len(schema['questions'])
+        assert compact.metadata['course_info'] == schema['course_info']
+        last = len(compact) - 1
+        assert compact.question(last) == schema['questions'][last]
+        assert compact.to_dict() == schema
@@ -0,0 +1,21 @@
+"""
+Answer pages fetched concurrently still come back in listing order
+"""
+
+from scraper import WebScraper
+
+
+def test_concurrent_results_keep_listing_order(site):
+    listing_url = site.add_course(8)
+    # Earlier pages answer slower, so they finish after the later ones
+    for i in range(1, 9):
+        site.delays[f'/course-question-{i}/'] = (9 - i) * 0.02
+
+    scraper = WebScraper(site.base_url, delay=0, concurrency=4)
+    course = scraper.scrape_full_course(listing_url, 'Course')
+
+    assert [record['id'] for record in course['questions']] == list(range(1, 9))
+    assert [record['question'] for record in course['questions']] == [
+        f'Which answer is number {i}?' for i in range(1, 9)]
+    assert [record['answer_data']['structured_content'] for record in course['questions']] == [
+        f'Answer {i}' for i in range(1, 9)]
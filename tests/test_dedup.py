@@ -0,0 +1,37 @@
+"""
+Deduplication of merged schemas must never drop a differing answer
+"""
+
+import json
+
+from schema_builder import SchemaBuilder
+
+
+def write_schema(path, name, questions):
+    schema = {'course_info': {'name': name}, 'questions': [
+        dict(question, id=position) for position, question in enumerate(questions, 1)
+    ]}
+    path.write_text(json.dumps(schema), encoding='utf-8')
+    return str(path)
+
+
+def test_near_duplicates_with_different_answers_are_kept(tmp_path):
+    first = write_schema(tmp_path / 'first_schema.json', 'First', [
+        {'question': 'Select the true statement.', 'answer': 'Workflows can enroll contacts'},
+        {'question': 'Which of these is an ad creative best practice?', 'answer': ['Use video', 'Keep it short']},
+    ])
+    second = write_schema(tmp_path / 'second_schema.json', 'Second', [
+        {'question': 'Select the true statement(s).', 'answer': 'Lists can be static or active'},
+        {'question': 'Which of these is an ad creative best practice?', 'answer': ['keep it short', 'Use video.']},
+        {'question': 'Select the true statement', 'answer': 'Failed to fetch page'},
+    ])
+
+    builder = SchemaBuilder(output_dir=str(tmp_path), write_match_index=False)
+    merged_file = builder.merge_schemas([first, second], 'merged.json', dedup_threshold=0.8)
+    with open(merged_file, 'r', encoding='utf-8') as f:
+        merged = json.load(f)
+
+    answers = [question['answer'] for course in merged['courses'] for question in course['questions']]
+    assert answers == ['Workflows can enroll contacts', ['Use video', 'Keep it short'], 'Lists can be static or active']
+    assert merged['deduplication']['conflicting_clusters'] == 1
+    assert merged['deduplication']['redundant_files'] == []
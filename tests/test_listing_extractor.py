@@ -0,0 +1,28 @@
+"""
+Question links are recognised whatever form the listing URL was given in
+"""
+
+import pytest
+
+from listing_extractor import find_content_area, select_question_elements
+from parsing import make_soup
+
+LISTING = """<html><div class="entry-content"><ul>
+<li><a href="https://www.gcertificationcourse.com/hubspot-gdd-answers/">Back to the course</a></li>
+<li><a href="https://www.gcertificationcourse.com/q1/">Which question is first?</a></li>
+<li><a href="https://www.gcertificationcourse.com/q2/">Which question is second?</a></li>
+<li><a href="https://example.com/elsewhere/">Which site is this?</a></li>
+</ul></div></html>"""
+
+
+@pytest.mark.parametrize('listing_url', [
+    'https://www.gcertificationcourse.com/hubspot-gdd-answers/',
+    'https://gcertificationcourse.com/hubspot-gdd-answers/',
+    'http://www.gcertificationcourse.com/hubspot-gdd-answers',
+])
+def test_question_links_on_the_listing_site(listing_url):
+    content_area = find_content_area(make_soup(LISTING, 'html.parser'))
+    strategy, elements = select_question_elements(content_area, listing_url)
+
+    assert strategy == 'question_links'
+    assert [li.get_text() for li in elements] == ['Which question is first?', 'Which question is second?']
@@ -0,0 +1,54 @@
+"""
+The match index must return the same question as the full scan of content.js
+"""
+
+import random
+
+import pytest
+
+from bench_match import ASSETS_DIR, SAMPLE_FILES, load_exam_questions, load_schemas, sample_schema_questions
+from question_matcher import ExtensionMatcher, MatchIndex
+
+SCHEMA_DIR = 'extension/schemas'
+
+
+def typo_questions(schemas, count: int, seed: int = 0):
+    """Schema questions with up to a dozen random substitutions, deletions and insertions"""
+    rng = random.Random(seed)
+    texts = [q['question'] for schema in schemas for q in schema['questions'] if q.get('question')]
+    questions = []
+    for text in rng.sample(texts, count):
+        for _ in range(rng.randint(1, 12)):
+            position = rng.randrange(len(text))
+            edit = rng.choice(('substitute', 'delete', 'insert'))
+            if edit == 'substitute':
+                text = text[:position] + rng.choice('aeixz ') + text[position + 1:]
+            elif edit == 'delete' and len(text) > 1:
+                text = text[:position] + text[position + 1:]
+            else:
+                text = text[:position] + rng.choice('aeixz ') + text[position:]
+        questions.append(text)
+    return questions
+
+
+@pytest.fixture(scope='module')
+def schemas():
+    return load_schemas(SCHEMA_DIR)
+
+
+@pytest.mark.parametrize('threshold', [0.8, 0.94])
+def test_index_matches_full_scan(schemas, threshold):
+    questions = (load_exam_questions(SAMPLE_FILES + [ASSETS_DIR]) + sample_schema_questions(schemas, 20)
+                 + typo_questions(schemas, 20) + ['', 'ok', 'True or false?', 'Select the true statement(s).'])
+    scan = ExtensionMatcher(schemas, threshold)
+    indexes = [MatchIndex.from_schema(schema) for schema in schemas]
+
+    for question in questions:
+        expected = scan.lookup(question)
+        match = next(filter(None, (index.lookup(question, threshold) for index in indexes)), None)
+        if expected is None:
+            assert match is None, question
+        else:
+            assert match is not None, question
+            assert (match['qa'], match['match_type'], match['similarity']) == \
+                (expected['qa'], expected['match_type'], expected['similarity']), question
@@ -0,0 +1,62 @@
+"""
+Courses in the question store are keyed by schema file path, not by file or course name
+"""
+
+import pytest
+
+import main
+from question_store import STORE_VERSION, QuestionStore
+
+GDD_NAME = 'HubSpot Growth Driven Design Certification'
+
+
+def schema(name, count):
+    return {'course_info': {'name': name}, 'questions': [
+        {'id': position, 'question': f'Question {position}?', 'answer': f'Answer {position}'}
+        for position in range(1, count + 1)
+    ]}
+
+
+def test_schema_files_sharing_a_course_name(tmp_path):
+    store = QuestionStore(str(tmp_path / 'questions.db'))
+    store.upsert_schema(schema('Shared', 5), 'extension/schemas/first.json')
+    store.upsert_schema(schema('Shared', 20), 'extension/schemas/second.json', exam_id='9108789')
+    store.upsert_schema(schema('Shared', 7), 'extension/schemas/first.json')
+
+    courses = {course['schema_file']: course for course in store.list_courses()}
+    assert {path: course['question_count'] for path, course in courses.items()} == {
+        'extension/schemas/first.json': 7, 'extension/schemas/second.json': 20}
+    assert courses['extension/schemas/second.json']['exam_id'] == '9108789'
+    assert len(store.load_schema('second.json')['questions']) == 20
+    with pytest.raises(ValueError):
+        store.load_schema('Shared')
+    assert STORE_VERSION == 1
+
+
+def test_schema_files_sharing_a_file_name(tmp_path):
+    store = QuestionStore(str(tmp_path / 'questions.db'))
+    store.upsert_schema(schema('Extension', 5), 'extension/schemas/gdd.json')
+    store.upsert_schema(schema('Scraped', 20), 'schemas/gdd.json')
+
+    assert len(store.load_schema('extension/schemas/gdd.json')['questions']) == 5
+    assert len(store.load_schema('schemas/gdd.json')['questions']) == 20
+    with pytest.raises(ValueError):
+        store.load_schema('gdd.json')
+
+
+def test_store_import_keeps_every_schema_file(tmp_path):
+    db_path = str(tmp_path / 'questions.db')
+    main.import_schemas_to_store(['extension/schemas'], db_path)
+
+    courses = [course for course in QuestionStore(db_path).list_courses() if course['name'] == GDD_NAME]
+    assert sorted(course['question_count'] for course in courses) == [5, 20, 69]
+    assert {course['exam_id'] for course in courses if course['question_count'] == 69} == {'9108789'}
+
+
+def test_store_import_keeps_identically_named_files_apart(tmp_path):
+    db_path = str(tmp_path / 'questions.db')
+    main.import_schemas_to_store(['extension/schemas', 'schemas'], db_path)
+
+    courses = {course['schema_file']: course for course in QuestionStore(db_path).list_courses()}
+    assert 'extension/schemas/hubspot_academy_gdd_exam.json' in courses
+    assert 'schemas/hubspot_academy_gdd_exam.json' in courses
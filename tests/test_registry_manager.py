@@ -0,0 +1,24 @@
+"""
+Removing an exam from the schema registry
+"""
+
+import json
+
+from registry_manager import SchemaRegistry
+
+
+def test_remove_drops_every_entry_of_the_exam(tmp_path):
+    path = tmp_path / 'schema_registry.json'
+    path.write_text(json.dumps({'schemas': [
+        {'exam_id': '111', 'exam_url_pattern': 'a', 'schema_file': 'schemas/old.json'},
+        {'exam_id': '222', 'exam_url_pattern': 'b', 'schema_file': 'schemas/other.json'},
+        {'exam_id': '111', 'exam_url_pattern': 'c', 'schema_file': 'schemas/new.json'}
+    ]}))
+
+    registry = SchemaRegistry(str(path))
+    assert registry.remove('111')
+    assert not registry.remove('111')
+
+    assert [entry['exam_id'] for entry in registry.entries] == ['222']
+    assert registry.get('111', 'a') is None
+    assert [entry['exam_id'] for entry in json.loads(path.read_text())['schemas']] == ['222']
@@ -0,0 +1,56 @@
+"""
+Per-host token bucket of the request scheduler
+"""
+
+import pytest
+
+import request_scheduler
+from request_scheduler import RequestScheduler
+
+
+class FakeClock:
+    """Stands in for the time module, sleeping only moves the clock forward"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(request_scheduler, 'time', fake)
+    return fake
+
+
+def test_requests_to_one_host_are_spaced(clock):
+    scheduler = RequestScheduler(delay=2.0)
+
+    waits = [scheduler.acquire('https://www.example.com/page') for _ in range(3)]
+
+    assert waits == [0.0, 2.0, 2.0]
+    assert clock.now == 1004.0
+
+
+def test_hosts_have_their_own_bucket(clock):
+    scheduler = RequestScheduler(delay=2.0)
+
+    assert scheduler.acquire('https://a.example.com/') == 0.0
+    assert scheduler.acquire('https://b.example.com/') == 0.0
+    assert scheduler.acquire('https://a.example.com/other') == 2.0
+
+
+def test_burst_then_refill(clock):
+    scheduler = RequestScheduler(delay=1.0, burst=3)
+
+    assert [scheduler.acquire('https://www.example.com/') for _ in range(4)] == [0.0, 0.0, 0.0, 1.0]
+
+    # Idle time refills the bucket, but never past the burst size
+    clock.now += 10
+    assert [scheduler.acquire('https://www.example.com/') for _ in range(4)] == [0.0, 0.0, 0.0, 1.0]
+    assert scheduler.get_stats()['throttled_requests'] == 2
@@ -0,0 +1,33 @@
+"""
+Conditional revalidation through the response cache
+"""
+
+import os
+
+from response_cache import ResponseCache
+from scraper import WebScraper
+
+BODY = b'<html><article><p>Cached answer</p></article></html>'
+
+
+def test_not_modified_serves_the_cached_body(site, tmp_path):
+    def page(headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, b''
+        return 200, {'ETag': '"v1"'}, BODY
+    site.pages['/question/'] = page
+
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=0)
+    scraper = WebScraper(site.base_url, delay=0, cache=cache)
+    url = site.url('/question/')
+
+    assert scraper.fetch_page(url) == BODY
+    fetched_at = cache.get(url)['fetched_at']
+    assert scraper.fetch_page(url) == BODY
+
+    assert [headers.get('If-None-Match') for _, headers in site.requests] == [None, '"v1"']
+    assert cache.get_stats() == {'cache_hits': 0, 'cache_revalidated': 1, 'cache_misses': 1, 'cache_evictions': 0}
+    entry = cache.get(url)
+    assert entry['fetched_at'] == fetched_at
+    assert entry['validated_at'] >= fetched_at
+    assert not [name for name in os.listdir(cache.cache_dir) if name.endswith('.tmp')]
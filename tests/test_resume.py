@@ -0,0 +1,40 @@
+"""
+Resuming an interrupted batch scrape from its checkpoint
+"""
+
+import json
+
+import pytest
+
+import main
+from config import DEFAULT_SCRAPING_CONFIG, SCHEMA_CONFIG
+from scraper import WebScraper
+
+
+@pytest.fixture
+def scrape_config(monkeypatch):
+    monkeypatch.setitem(DEFAULT_SCRAPING_CONFIG, 'delay_between_requests', 0)
+    monkeypatch.setitem(DEFAULT_SCRAPING_CONFIG, 'cache_enabled', False)
+    monkeypatch.setitem(DEFAULT_SCRAPING_CONFIG, 'url_catalog_enabled', False)
+    monkeypatch.setitem(SCHEMA_CONFIG, 'question_store_enabled', False)
+
+
+def test_resume_skips_completed_questions(site, tmp_path, monkeypatch, scrape_config):
+    listing_url = site.add_course(6)
+    extract = WebScraper._extract_answer_from_page
+
+    def crash_on_fourth(self, soup, question_data, url):
+        if url.endswith('/course-question-4/'):
+            raise RuntimeError("interrupted")
+        return extract(self, soup, question_data, url)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(WebScraper, '_extract_answer_from_page', crash_on_fourth)
+        assert main.scrape_multiple_courses([listing_url], str(tmp_path)) == []
+
+    schema_files = main.scrape_multiple_courses([listing_url], str(tmp_path), resume=True)
+
+    assert [site.fetched(f'/course-question-{i}/') for i in range(1, 7)] == [1, 1, 1, 2, 1, 1]
+    with open(schema_files[0], 'r', encoding='utf-8') as f:
+        answers = [question['answer'] for question in json.load(f)['questions']]
+    assert answers == [f'Answer {i}' for i in range(1, 7)]
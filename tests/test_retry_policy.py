@@ -0,0 +1,72 @@
+"""
+Retries of transient fetch failures
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import scraper as scraper_module
+from retry_policy import RetryPolicy
+from scraper import WebScraper
+
+BODY = b'<html><article><p>Answer</p></article></html>'
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waited = []
+    monkeypatch.setattr(scraper_module, 'time', SimpleNamespace(sleep=waited.append))
+    return waited
+
+
+def failing_then_ok(*failures):
+    responses = list(failures)
+
+    def page(headers):
+        return responses.pop(0) if responses else (200, {}, BODY)
+    return page
+
+
+def test_transient_errors_are_retried(site, sleeps):
+    site.pages['/flaky/'] = failing_then_ok((503, {}, b''), (500, {}, b''), (429, {}, b''))
+    policy = RetryPolicy(max_retries=3, backoff_base=0.5, budget=10)
+    scraper = WebScraper(site.base_url, delay=0, retry_policy=policy)
+
+    assert scraper.fetch_page(site.url('/flaky/')) == BODY
+    assert site.fetched('/flaky/') == 4
+    assert len(sleeps) == 3 and all(0 <= delay <= 0.5 * 2 ** attempt for attempt, delay in enumerate(sleeps))
+    assert policy.get_stats() == {'retries': 3, 'retry_budget_exhausted': 0}
+
+
+def test_retry_after_is_honoured(site, sleeps):
+    site.pages['/limited/'] = failing_then_ok((429, {'Retry-After': '7'}, b''), (503, {'Retry-After': '120'}, b''))
+    scraper = WebScraper(site.base_url, delay=0, retry_policy=RetryPolicy(backoff_max=60.0))
+
+    assert scraper.fetch_page(site.url('/limited/')) == BODY
+    # Retry-After wins over the backoff, capped at backoff_max
+    assert sleeps == [7.0, 60.0]
+
+
+def test_client_errors_are_not_retried(site, sleeps):
+    scraper = WebScraper(site.base_url, delay=0, retry_policy=RetryPolicy())
+
+    with pytest.raises(requests.HTTPError):
+        scraper.fetch_page(site.url('/missing/'))
+    assert site.fetched('/missing/') == 1 and sleeps == []
+
+
+def test_retries_stop_when_the_budget_runs_out(site, sleeps):
+    site.pages['/down/'] = lambda headers: (503, {}, b'')
+    policy = RetryPolicy(max_retries=5, backoff_base=0.1, budget=3)
+    scraper = WebScraper(site.base_url, delay=0, retry_policy=policy)
+
+    with pytest.raises(requests.HTTPError):
+        scraper.fetch_page(site.url('/down/'))
+    with pytest.raises(requests.HTTPError):
+        scraper.fetch_page(site.url('/down/'))
+
+    # The budget is shared by the whole scrape: three retries, then one attempt per page
+    assert site.fetched('/down/') == 5
+    assert policy.get_stats() == {'retries': 3, 'retry_budget_exhausted': 2}
@@ -0,0 +1,75 @@
+"""
+Incremental scrape merging on schemas whose answers include lists of options
+"""
+
+import json
+from datetime import datetime
+
+from schema_builder import SCRAPED_DATE_FORMAT, SchemaBuilder, is_failed_answer
+
+LIST_ANSWER_SCHEMA = 'extension/schemas/inbound_schema.json'
+
+
+def load_list_answer_schema():
+    with open(LIST_ANSWER_SCHEMA, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    assert any(isinstance(question['answer'], list) for question in schema['questions'])
+    return schema
+
+
+def test_is_failed_answer_accepts_list_answers():
+    assert is_failed_answer("Failed to fetch page")
+    assert not is_failed_answer(["Option A", "Option B"])
+    assert not is_failed_answer(None)
+
+
+def test_fresh_question_keys_with_list_answers(tmp_path):
+    schema = load_list_answer_schema()
+    schema['course_info']['scraped_date'] = datetime.now().strftime(SCRAPED_DATE_FORMAT)
+
+    fresh = SchemaBuilder(output_dir=str(tmp_path)).get_fresh_question_keys(schema, ttl_days=30)
+
+    assert fresh == {(question['source_url'], question['question'])
+                     for question in schema['questions'] if question.get('source_url')}
+
+
+def test_merge_incremental_with_list_answers(tmp_path):
+    existing = load_list_answer_schema()
+    list_question = next(q for q in existing['questions'] if isinstance(q['answer'], list))
+    text_question = next(q for q in existing['questions'] if isinstance(q['answer'], str))
+    update = {
+        'course_info': dict(existing['course_info']),
+        'questions': [
+            dict(list_question, answer=["Updated option"]),
+            dict(text_question, answer="Failed to fetch page")
+        ]
+    }
+
+    merged = SchemaBuilder(output_dir=str(tmp_path)).merge_incremental(existing, update)
+
+    by_url = {q['source_url']: q for q in merged['questions']}
+    assert len(merged['questions']) == len(existing['questions'])
+    assert by_url[list_question['source_url']]['answer'] == ["Updated option"]
+    assert by_url[list_question['source_url']]['id'] == list_question['id']
+    assert by_url[text_question['source_url']]['answer'] == text_question['answer']
+
+
+def test_text_only_questions_sharing_the_listing_url(tmp_path):
+    listing_url = 'https://www.gcertificationcourse.com/hubspot-gdd-answers/'
+    today = datetime.now().strftime(SCRAPED_DATE_FORMAT)
+    existing = {'course_info': {'scraped_date': today}, 'questions': [
+        {'id': 1, 'question': 'Which question is first?', 'answer': 'First', 'source_url': listing_url},
+        {'id': 2, 'question': 'Which question is second?', 'answer': 'Second', 'source_url': listing_url}
+    ]}
+    update = {'course_info': {'scraped_date': today}, 'questions': [
+        {'id': 1, 'question': 'Which question is first?', 'answer': 'First, updated', 'source_url': listing_url},
+        {'id': 3, 'question': 'Which question is third?', 'answer': 'Third', 'source_url': listing_url}
+    ]}
+    builder = SchemaBuilder(output_dir=str(tmp_path))
+
+    merged = builder.merge_incremental(existing, update)
+
+    assert [(q['id'], q['answer']) for q in merged['questions']] == [(1, 'First, updated'), (2, 'Second'), (3, 'Third')]
+    assert len(builder.get_fresh_question_keys(existing, ttl_days=30)) == 2
+    assert builder.listing_question_key({'link': listing_url, 'question': ' Which  question is second?'}) in \
+        builder.get_fresh_question_keys(existing, ttl_days=30)
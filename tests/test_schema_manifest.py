@@ -0,0 +1,42 @@
+"""
+The schema manifest only re-reads schema files whose mtime or size changed
+"""
+
+import json
+import os
+
+from schema_manifest import SchemaManifest
+
+
+def write_schema(path, name, mtime_ns=None):
+    path.write_text(json.dumps({'course_info': {'name': name}, 'questions': []}))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_manifest_refreshes_changed_files(tmp_path):
+    first, second = tmp_path / 'first.json', tmp_path / 'second.json'
+    write_schema(first, 'First', 1_000_000_000_000_000_000)
+    write_schema(second, 'Second', 1_000_000_000_000_000_000)
+    loaded = []
+
+    def load_metadata(filepath):
+        loaded.append(os.path.basename(filepath))
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return {'course_name': json.load(f)['course_info']['name']}
+
+    manifest = SchemaManifest(str(tmp_path))
+    assert [s['course_name'] for s in manifest.refresh(load_metadata)] == ['First', 'Second']
+    assert [s['course_name'] for s in manifest.refresh(load_metadata)] == ['First', 'Second']
+    assert loaded == ['first.json', 'second.json']
+
+    # Same size, newer mtime
+    write_schema(first, 'Fir5t', 2_000_000_000_000_000_000)
+    # Same mtime, different size
+    write_schema(second, 'Second course', 1_000_000_000_000_000_000)
+    loaded.clear()
+
+    assert [s['course_name'] for s in manifest.refresh(load_metadata)] == ['Fir5t', 'Second course']
+    assert loaded == ['first.json', 'second.json']
+    assert [s['course_name'] for s in SchemaManifest(str(tmp_path)).refresh(load_metadata)] == ['Fir5t', 'Second course']
+    assert len(loaded) == 2
@@ -0,0 +1,15 @@
+"""
+Raw HTML kept in low memory mode
+"""
+
+import json
+
+from scraper import compress_raw_html, decompress_raw_html
+
+
+def test_compressed_raw_html_is_json_and_limited_in_characters():
+    html = '<article>' + 'é' * 50 + '</article>'
+    stored = compress_raw_html(html.encode('utf-8'), limit=20)
+
+    assert json.loads(json.dumps({'raw_html_zlib': stored}))['raw_html_zlib'] == stored
+    assert decompress_raw_html(stored) == html[:20]
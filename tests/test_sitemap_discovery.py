@@ -0,0 +1,70 @@
+"""
+Sitemap entries are read from the sitemaps.org elements only, and the catalog
+only vouches for pages through sitemaps read since their scrape
+"""
+
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+
+from schema_builder import SCRAPED_DATE_FORMAT
+from sitemap_discovery import UrlCatalog, iter_sitemap
+
+IMAGE_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url>
+    <loc>https://www.gcertificationcourse.com/hubspot-gdd-answers/</loc>
+    <lastmod>2024-01-01T00:00:00+00:00</lastmod>
+    <image:image>
+      <image:loc>https://www.gcertificationcourse.com/wp-content/uploads/gdd.png</image:loc>
+    </image:image>
+  </url>
+  <url>
+    <image:image><image:loc>https://www.gcertificationcourse.com/wp-content/uploads/orphan.png</image:loc></image:image>
+  </url>
+</urlset>"""
+
+PLAIN_INDEX = b"""<sitemapindex><sitemap><loc>https://example.com/post-sitemap.xml</loc></sitemap></sitemapindex>"""
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_image_locations_are_ignored(compress):
+    content = gzip.compress(IMAGE_SITEMAP) if compress else IMAGE_SITEMAP
+
+    assert list(iter_sitemap(content)) == [
+        ('url', 'https://www.gcertificationcourse.com/hubspot-gdd-answers/', '2024-01-01T00:00:00+00:00')
+    ]
+
+
+def test_sitemap_without_namespace():
+    assert list(iter_sitemap(PLAIN_INDEX)) == [('sitemap', 'https://example.com/post-sitemap.xml', None)]
+
+
+PAGE_URL = 'https://www.gcertificationcourse.com/which-answer-is-first/'
+SITEMAP_URL = 'https://www.gcertificationcourse.com/post-sitemap.xml'
+
+
+def cataloged_page(tmp_path, lastmod, checked_at):
+    catalog = UrlCatalog(str(tmp_path / 'url_catalog.json'))
+    catalog.record_url(PAGE_URL, lastmod.strftime('%Y-%m-%dT%H:%M:%S'), SITEMAP_URL)
+    catalog.record_sitemap(SITEMAP_URL, None)
+    catalog.sitemaps[SITEMAP_URL]['checked_at'] = checked_at.strftime(SCRAPED_DATE_FORMAT)
+    return catalog
+
+
+@pytest.mark.parametrize('checked_days_ago, unchanged', [
+    (15, False),  # sitemap read before the scrape, later edits would be missed
+    (4, False),   # read after the scrape, but longer ago than the TTL
+    (1, True)
+])
+def test_catalog_vouches_only_for_recent_sitemap_reads(tmp_path, checked_days_ago, unchanged):
+    now = datetime.now()
+    scraped_date = (now - timedelta(days=10)).strftime(SCRAPED_DATE_FORMAT)
+    catalog = cataloged_page(tmp_path, now - timedelta(days=20), now - timedelta(days=checked_days_ago))
+    schema = {'course_info': {'scraped_date': scraped_date},
+              'questions': [{'question': 'Which answer is first?', 'answer': 'First', 'source_url': PAGE_URL}]}
+
+    assert catalog.unchanged_since(PAGE_URL, scraped_date, max_age_days=3) is unchanged
+    assert (catalog.unchanged_question_urls(schema, max_age_days=3) == {PAGE_URL}) is unchanged
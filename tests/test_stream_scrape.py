@@ -0,0 +1,67 @@
+"""
+Streaming scrapes of courses whose answers are lists of options
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import main
+from config import DEFAULT_SCRAPING_CONFIG, SCHEMA_CONFIG
+from registry_manager import SchemaRegistry
+
+QUESTION = "Which of the following are parts of the inbound methodology?"
+
+
+def listing_page(base_url: str) -> bytes:
+    return (f'<html><body><div class="entry-content"><ul>'
+            f'<li><a href="{base_url}/question-0/">{QUESTION}</a></li>'
+            f'</ul></div></body></html>').encode('utf-8')
+
+
+ANSWER_PAGE = (f'<html><body><article><h1>{QUESTION}</h1><ul>'
+               f'<li><strong>Attract</strong></li><li>Convert</li><li><strong>Delight</strong></li>'
+               f'</ul></article></body></html>').encode('utf-8')
+
+
+@pytest.fixture
+def course_site():
+    pages = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = pages.get(self.path)
+            self.send_response(200 if body else 404)
+            self.send_header('Content-Length', str(len(body or b'')))
+            self.end_headers()
+            self.wfile.write(body or b'')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    pages['/inbound-answers/'] = listing_page(base_url)
+    pages['/question-0/'] = ANSWER_PAGE
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_scrape_with_list_answers(course_site, tmp_path, monkeypatch):
+    monkeypatch.setitem(DEFAULT_SCRAPING_CONFIG, 'delay_between_requests', 0)
+    monkeypatch.setitem(DEFAULT_SCRAPING_CONFIG, 'url_catalog_enabled', False)
+    monkeypatch.setitem(SCHEMA_CONFIG, 'question_store_enabled', False)
+    registry = SchemaRegistry(str(tmp_path / 'schema_registry.json'))
+
+    schema_file = main.scrape_course(f"{course_site}/inbound-answers/", "Inbound", output_dir=str(tmp_path),
+                                     use_cache=False, stream='json', registry=registry)
+
+    with open(schema_file, 'r', encoding='utf-8') as f:
+        questions = json.load(f)['questions']
+    assert [question['answer'] for question in questions] == [["Attract", "Delight"]]
@@ -0,0 +1,25 @@
+"""
+--profile covers the worker threads of a command
+"""
+
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+from thread_profiler import ThreadProfiler
+
+
+def busy_worker(count):
+    return sum(i * i for i in range(count))
+
+
+def test_worker_threads_are_in_the_dump(tmp_path):
+    path = str(tmp_path / 'profile.out')
+    profiler = ThreadProfiler()
+    profiler.enable()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(busy_worker, [10000] * 4))
+    profiler.disable()
+    profiler.dump_stats(path)
+
+    calls = {func[2]: stat[1] for func, stat in pstats.Stats(path).stats.items()}
+    assert calls.get('busy_worker') == 4
@@ -0,0 +1,61 @@
+"""
+cProfile across every thread of a command
+cProfile.Profile only sees the thread that enabled it, so worker threads of the
+course pool and the answer page pool get a profiler of their own, merged into
+one pstats dump at the end
+"""
+
+import sys
+import pstats
+import logging
+import cProfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadProfiler:
+    def __init__(self):
+        """Profile the calling thread and every thread started while enabled"""
+        self._lock = threading.Lock()
+        self._main = cProfile.Profile()
+        self._workers = []
+
+    def enable(self):
+        """Start profiling this thread and hook threads started from now on"""
+        threading.setprofile(self._start_thread)
+        self._main.enable()
+
+    def _start_thread(self, frame, event, arg):
+        # Runs on the first profiling event of a new thread, the thread's own
+        # profiler then replaces this hook
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ profiles through sys.monitoring, where the main
+            # profiler already covers every thread and a second one is refused
+            sys.setprofile(None)
+            return
+        with self._lock:
+            self._workers.append(profiler)
+
+    def disable(self):
+        """Stop profiling, threads still running keep their profiler until they finish"""
+        self._main.disable()
+        threading.setprofile(None)
+
+    def dump_stats(self, path: str):
+        """
+        Write the merged statistics of every profiled thread
+
+        Args:
+            path: pstats dump file
+        """
+        stats = pstats.Stats(self._main)
+        with self._lock:
+            workers = list(self._workers)
+        for profiler in workers:
+            stats.add(profiler)
+        stats.dump_stats(path)
+        logger.debug(f"Profiled {len(workers) + 1} thread(s) into {path}")